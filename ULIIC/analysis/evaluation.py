@@ -16,7 +16,8 @@ def assign_labels(
     """
     Assign labels to the neurons based on highest average spiking activity.
 
-    :param spikes: Binary tensor of shape ``(n_samples, time, n_neurons)`` of a single layer's spiking activity.
+    :param spikes: Binary tensor (or ``PackedSpikes``) of shape ``(n_samples, time, n_neurons)`` of a single layer's
+                   spiking activity.
     :param labels: Vector of shape ``(n_samples,)`` with data labels corresponding to spiking activity.
     :param n_labels: The number of target labels in the data.
     :param rates: If passed, these represent spike rates from a previous ``assign_labels()`` call.
@@ -28,7 +29,7 @@ def assign_labels(
     if rates is None:
         rates = torch.zeros_like(torch.Tensor(n_neurons, n_labels))
 
-    # Sum over time dimension (spike ordering doesn't matter).
+    # Sum over time dimension (spike ordering doesn't matter). ``PackedSpikes`` are counted without unpacking.
     spikes = spikes.sum(1)
 
     for i in range(n_labels):
@@ -95,14 +96,15 @@ def all_activity(
     """
     Classify data with the label with highest average spiking activity over all neurons.
 
-    :param spikes: Binary tensor of shape ``(n_samples, time, n_neurons)`` of a layer's spiking activity.
+    :param spikes: Binary tensor (or ``PackedSpikes``) of shape ``(n_samples, time, n_neurons)`` of a layer's spiking
+                   activity.
     :param assignments: A vector of shape ``(n_neurons,)`` of neuron label assignments.
     :param n_labels: The number of target labels in the data.
     :return: Predictions tensor of shape ``(n_samples,)`` resulting from the "all activity" classification scheme.
     """
     n_samples = spikes.size(0)
 
-    # Sum over time dimension (spike ordering doesn't matter).
+    # Sum over time dimension (spike ordering doesn't matter). ``PackedSpikes`` are counted without unpacking.
     spikes = spikes.sum(1)
 
     rates = torch.zeros(n_samples, n_labels)
@@ -132,7 +134,8 @@ def proportion_weighting(
     Classify data with the label with highest average spiking activity over all neurons, weighted by class-wise
     proportion.
 
-    :param spikes: Binary tensor of shape ``(n_samples, time, n_neurons)`` of a single layer's spiking activity.
+    :param spikes: Binary tensor (or ``PackedSpikes``) of shape ``(n_samples, time, n_neurons)`` of a single layer's
+                   spiking activity.
     :param assignments: A vector of shape ``(n_neurons,)`` of neuron label assignments.
     :param proportions: A matrix of shape ``(n_neurons, n_labels)`` giving the per-class proportions of neuron spiking
                         activity.
@@ -142,7 +145,7 @@ def proportion_weighting(
     """
     n_samples = spikes.size(0)
 
-    # Sum over time dimension (spike ordering doesn't matter).
+    # Sum over time dimension (spike ordering doesn't matter). ``PackedSpikes`` are counted without unpacking.
     spikes = spikes.sum(1)
 
     rates = torch.zeros(n_samples, n_labels)
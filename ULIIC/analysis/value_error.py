@@ -8,24 +8,30 @@ Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
 
 """
 
+
 import torch
-import numpy as np
 
 
 def spike_timing_error(
     spikes: torch.Tensor,
     spikes_b: torch.Tensor,
     time: int = 500,
+    dim: int = 0,
 ):
     """
     Calculate spikes error for any group(s) of neurons.
 
-    :param spikes: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
-    :param spikes_b: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
-    :param time: Total time for a encoding.
+    The ``k``-th spike of every neuron in ``spikes_b`` is paired with its ``k``-th spike in ``spikes``, for as many
+    spikes as both trains have, and the mean timing difference of the pairs is normalized by ``time``. Spike ranks are
+    obtained with a cumulative sum along the time dimension, so all neurons, samples and runs are scored at once.
+    Neurons that do not spike in one of the trains score ``nan``.
 
+    :param spikes: Spiking data of shape ``[time, n_1, ..., n_k]``, where ``[n_1, ..., n_k]`` is the shape of the
+                   recorded layer, including batch (and run) dimensions.
+    :param spikes_b: Spiking data of the same shape as ``spikes``.
+    :param time: Total time for a encoding.
+    :param dim: Time dimension of the spiking data.
+    :return: Tensor of shape ``[n_1, ..., n_k]`` of spike timing errors.
     """
 
     if spikes.shape != spikes_b.shape:
@@ -33,30 +39,21 @@ def spike_timing_error(
         print(spikes.shape, spikes_b.shape)
         return 0.0
 
-    tensor_shape = spikes.shape
-    spike_time = np.zeros(tensor_shape[2], dtype=int)
-    spike_b_time = np.zeros(spikes_b.shape[2], dtype=int)
-
-    spike_trace = []
-    spike_b_trace = []
-    for n in range(tensor_shape[2]):
-        spike_trace.append([])
-        spike_b_trace.append([])
-
-    error_sum = np.zeros(tensor_shape[2], dtype=float)
-    ster_result = np.zeros(tensor_shape[2], dtype=float)
-
-    for n in range(tensor_shape[2]):
-        for t in range(tensor_shape[0]):
-            if spikes[t][0][n] == 1:
-                spike_time[n] += 1
-                spike_trace[n].append(t)
-            if spikes_b[t][0][n] == 1:
-                spike_b_time[n] += 1
-                spike_b_trace[n].append(t)
-        for k in range(min(spike_time[n], spike_b_time[n])):
-            error_sum[n] += spike_b_trace[n][k] - spike_trace[n][k]
-        ster_result[n] = error_sum[n] / min(spike_time[n], spike_b_time[n])
+    spikes = (spikes != 0).movedim(dim, 0)
+    spikes_b = (spikes_b != 0).movedim(dim, 0)
+
+    steps = torch.arange(spikes.shape[0], dtype=torch.float64, device=spikes.device)
+    steps = steps.view(-1, *([1] * (spikes.dim() - 1)))
+
+    # Rank of every spike in its train, and number of spikes paired in both trains.
+    rank = spikes.cumsum(0)
+    rank_b = spikes_b.cumsum(0)
+    paired = torch.min(rank[-1], rank_b[-1])
+
+    error_sum = (steps * (spikes_b & (rank_b <= paired))).sum(0) - (
+        steps * (spikes & (rank <= paired))
+    ).sum(0)
+    ster_result = error_sum / paired
 
     return ster_result / time
 
@@ -65,35 +62,25 @@ def nrmsd_error(
     voltages: torch.Tensor,
     voltages_b: torch.Tensor,
     time: int = 500,
+    dim: int = 0,
 ):
     """
     Calculate spikes error for any group(s) of neurons.
 
-    :param voltages: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
-    :param voltages_b: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
+    :param voltages: Voltage data of shape ``[time, n_1, ..., n_k]``, where ``[n_1, ..., n_k]`` is the shape of the
+                   recorded layer, including batch (and run) dimensions.
+    :param voltages_b: Voltage data of the same shape as ``voltages``.
     :param time: Total time for a encoding.
-
+    :param dim: Time dimension of the voltage data.
+    :return: Tensor of shape ``[n_1, ..., n_k]`` of root-mean-square voltage differences.
     """
     if voltages.shape != voltages_b.shape:
         print("spikes shapes don't match!")
         print(voltages.shape, voltages_b.shape)
         return 0.0
 
-    error_sum = np.zeros(voltages.shape[2], dtype=float)
-    nrmsd_result = np.zeros(voltages.shape[2], dtype=float)
-
-    for n in range(voltages.shape[2]):
-        for t in range(voltages.shape[0]):
-            minv = 0.0
-            maxv = 0.0
-            error_sum[n] += (voltages[t][0][n]-voltages_b[t][0][n]) ** 2
-            if voltages[t][0][n] > maxv:
-                maxv = voltages[t][0][n]
-            if voltages[t][0][n] < minv:
-                minv = voltages[t][0][n]
-        nrmsd_result[n] = (error_sum[n] / time) ** 0.5
+    error_sum = (voltages.double() - voltages_b.double()).pow(2).sum(dim)
+    nrmsd_result = (error_sum / time) ** 0.5
 
     return nrmsd_result
 
@@ -105,11 +92,9 @@ def weights_error(
     """
     Calculate weights error for any group(s) of neurons connections.
 
-    :param weights: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
-    :param weights_b: Mapping from layer names to spiking data. Spike data has shape ``[time, n_1, ..., n_k]``, where
-                   ``[n_1, ..., n_k]`` is the shape of the recorded layer.
-
+    :param weights: Weights of shape ``[..., n_source, n_target]``; leading dimensions index separate runs.
+    :param weights_b: Weights of the same shape as ``weights``.
+    :return: Root-mean-square difference over the last two dimensions, of shape ``[...]``.
     """
 
     if weights.shape != weights_b.shape:
@@ -117,11 +102,6 @@ def weights_error(
         print(weights.shape, weights_b.shape)
         return 0.0
 
-    error_sum = 0.0
-
-    for i in range(weights.shape[0]):
-        for j in range(weights.shape[1]):
-            error_sum += (weights[i][j] - weights_b[i][j]) ** 2
-
-    weights_error_result = (error_sum / (weights.shape[0] * weights.shape[1])) ** 0.5
+    error = (weights.double() - weights_b.double()).pow(2)
+    weights_error_result = error.mean((-2, -1)) ** 0.5
     return weights_error_result
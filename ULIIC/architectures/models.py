@@ -18,7 +18,7 @@ from torch.nn.modules.utils import _pair
 from ULIIC.learning.learning_rules import PostPre, ExpWeightSTDP, MSTDPET
 from ULIIC.network.networks import Network
 from ULIIC.network.neurons import Input, RealInput, LIFNeurons, DiehlAndCookNeurons
-from ULIIC.network.synapese import Connection, LocalConnection
+from ULIIC.network.synapese import AllButSelfConnection, Connection, LocalConnection
 
 
 class TwoLayerNetwork(Network):
@@ -120,6 +120,8 @@ class DiehlAndCook2015(Network):
         tc_theta_decay: float = 1e7,
         input_shape: Optional[Iterable[int]] = None,
         neederror: bool = True,
+        batch_update: Optional[str] = None,
+        fused_inhibition: bool = True,
     ) -> None:
         # language=rst
         """
@@ -138,6 +140,14 @@ class DiehlAndCook2015(Network):
         :param theta_plus: On-spike increment of ``DiehlAndCookNeurons`` membrane threshold potential.
         :param tc_theta_decay: Time constant of ``DiehlAndCookNeurons`` threshold potential decay.
         :param input_shape: The dimensionality of the input layer.
+        :param neederror: Whether need error.
+        :param batch_update: Semantics of weight and adaptive threshold updates when samples are run in parallel
+            along the batch dimension: ``"sequential"``, ``"mean"`` or ``"sum"`` (see ``LearningRule``). By default,
+            weight updates are averaged and threshold updates summed over the batch. ``"sequential"`` approximates
+            presenting the samples one at a time with the shared weights and thresholds frozen during the run, and keeps
+            per-sample weight updates of shape ``[batch_size, n_input, n_neurons]``.
+        :param fused_inhibition: Whether to compute the all-but-self inhibition from the inhibitory to the excitatory
+            layer in O(n) with an ``AllButSelfConnection`` instead of a dense ``Connection``.
         """
         super().__init__(dt=dt)
 
@@ -148,6 +158,7 @@ class DiehlAndCook2015(Network):
         self.inh = inh
         self.dt = dt
         self.neederror = neederror
+        self.batch_update = batch_update
 
         # Layers
         input_layer = Input(
@@ -166,6 +177,7 @@ class DiehlAndCook2015(Network):
             tc_trace=20.0,
             theta_plus=theta_plus,
             tc_theta_decay=tc_theta_decay,
+            batch_update="sum" if batch_update is None else batch_update,
         )
         inh_layer = LIFNeurons(
             n=self.n_neurons,
@@ -193,18 +205,24 @@ class DiehlAndCook2015(Network):
             wmin=wmin,
             wmax=wmax,
             norm=norm,
+            batch_update=batch_update,
         )
         w = self.exc * torch.diag(torch.ones(self.n_neurons))
         exc_inh_conn = Connection(
             source=exc_layer, target=inh_layer, w=w, wmin=0, wmax=self.exc
         )
-        w = -self.inh * (
-            torch.ones(self.n_neurons, self.n_neurons)
-            - torch.diag(torch.ones(self.n_neurons))
-        )
-        inh_exc_conn = Connection(
-            source=inh_layer, target=exc_layer, w=w, wmin=-self.inh, wmax=0
-        )
+        if fused_inhibition:
+            inh_exc_conn = AllButSelfConnection(
+                source=inh_layer, target=exc_layer, w=-self.inh, wmin=-self.inh, wmax=0
+            )
+        else:
+            w = -self.inh * (
+                torch.ones(self.n_neurons, self.n_neurons)
+                - torch.diag(torch.ones(self.n_neurons))
+            )
+            inh_exc_conn = Connection(
+                source=inh_layer, target=exc_layer, w=w, wmin=-self.inh, wmax=0
+            )
 
         # Add to network
         self.add_layer(input_layer, name="X")
@@ -237,6 +255,7 @@ class DiehlAndCook2015v2(Network):
         theta_plus: float = 0.05,
         tc_theta_decay: float = 1e7,
         input_shape: Optional[Iterable[int]] = None,
+        fused_inhibition: bool = True,
     ) -> None:
         # language=rst
         """
@@ -254,6 +273,8 @@ class DiehlAndCook2015v2(Network):
         :param theta_plus: On-spike increment of ``DiehlAndCookNeurons`` membrane threshold potential.
         :param tc_theta_decay: Time constant of ``DiehlAndCookNeurons`` threshold potential decay.
         :param input_shape: The dimensionality of the input layer.
+        :param fused_inhibition: Whether to apply the recurrent all-but-self inhibition inside the output layer
+            (``lateral_inhibition`` of ``DiehlAndCookNeurons``) instead of with a dense recurrent ``Connection``.
         """
         super().__init__(dt=dt)
 
@@ -279,6 +300,7 @@ class DiehlAndCook2015v2(Network):
             tc_trace=20.0,
             theta_plus=theta_plus,
             tc_theta_decay=tc_theta_decay,
+            lateral_inhibition=self.inh if fused_inhibition else None,
         )
         self.add_layer(output_layer, name="Y")
 
@@ -296,18 +318,19 @@ class DiehlAndCook2015v2(Network):
         )
         self.add_connection(input_connection, source="X", target="Y")
 
-        w = -self.inh * (
-            torch.ones(self.n_neurons, self.n_neurons)
-            - torch.diag(torch.ones(self.n_neurons))
-        )
-        recurrent_connection = Connection(
-            source=self.layers["Y"],
-            target=self.layers["Y"],
-            w=w,
-            wmin=-self.inh,
-            wmax=0,
-        )
-        self.add_connection(recurrent_connection, source="Y", target="Y")
+        if not fused_inhibition:
+            w = -self.inh * (
+                torch.ones(self.n_neurons, self.n_neurons)
+                - torch.diag(torch.ones(self.n_neurons))
+            )
+            recurrent_connection = Connection(
+                source=self.layers["Y"],
+                target=self.layers["Y"],
+                w=w,
+                wmin=-self.inh,
+                wmax=0,
+            )
+            self.add_connection(recurrent_connection, source="Y", target="Y")
 
 
 class IncreasingInhibitionNetwork(Network):
@@ -131,7 +131,7 @@ def reshape_locally_connected_weights(
     """
     Get the weights from a locally connected layer and reshape them to be two-dimensional and square.
 
-    :param w: Weights from a locally connected layer.
+    :param w: Weights from a locally connected layer, as a dense matrix (see ``LocalConnection.to_dense``).
     :param n_filters: No. of neuron filters.
     :param kernel_size: Side length(s) of convolutional kernel.
     :param conv_size: Side length(s) of convolution population.
@@ -223,4 +223,19 @@ def reshape_conv2d_weights(weights: torch.Tensor) -> torch.Tensor:
                             + (l % sqrt2) * width * sqrt1,
                         ] = fltr
 
-    return reshaped
\ No newline at end of file
+    return reshaped
+
+
+def all_but_self(s: Tensor, w: Union[float, Tensor]) -> Tensor:
+    # language=rst
+    """
+    Input of lateral connections of equal weight between all pairs of distinct neurons, i.e. ``s @ (w * (1 - I))``,
+    computed in O(n) from the spike count of every sample instead of an n x n matrix product.
+
+    :param s: Spikes of shape ``[batch_size, n_1, ..., n_k]``.
+    :param w: Weight of the lateral connections, negative for inhibition.
+    :return: Lateral input of the shape of ``s``.
+    """
+    s = s.float()
+    count = s.view(s.size(0), -1).sum(1).view(-1, *([1] * (s.dim() - 1)))
+    return w * (count - s)
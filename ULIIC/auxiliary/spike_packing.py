@@ -0,0 +1,242 @@
+"""
+Author: Jiajun Wu, HUST, China
+Main Library: Pytorch
+Description: It is a library with spiking neural network. We would like to implement this NN in hardware.
+File Information: This file includes the bit-packed spike storage format and its reductions.
+Log: 2020/1/20 Build firstly
+Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
+
+"""
+
+from typing import Iterable, Optional, Union
+
+import torch
+
+
+# Bit weights of the 8 spikes packed into a byte (little bit order, spike ``8 * j + k`` is bit ``k`` of byte ``j``).
+BIT_WEIGHTS = torch.tensor([1, 2, 4, 8, 16, 32, 64, 128], dtype=torch.uint8)
+
+
+class PackedSpikes:
+    # language=rst
+    """
+    Spike tensor stored with 1 bit per spike.
+
+    The last dimension (neurons) is packed into ``ceil(n / 8)`` bytes in little bit order, so ``data`` has shape
+    ``[*shape[:-1], ceil(shape[-1] / 8)]`` and is compatible with ``numpy.unpackbits(..., bitorder="little")``. Leading
+    dimensions (time, batch, samples) can be indexed, assigned and transposed without unpacking, and spike counts are
+    computed directly on the bytes.
+    """
+
+    def __init__(
+        self,
+        data: torch.Tensor,
+        shape: Iterable[int],
+        dtype: torch.dtype = torch.uint8,
+    ) -> None:
+        # language=rst
+        """
+        Constructs a ``PackedSpikes`` object.
+
+        :param data: Packed ``uint8`` tensor of shape ``[*shape[:-1], ceil(shape[-1] / 8)]``.
+        :param shape: Shape of the unpacked spikes.
+        :param dtype: Type of the unpacked spikes.
+        """
+        self.data = data
+        self.shape = torch.Size(shape)
+        self.dtype = dtype
+
+        assert self.data.dtype == torch.uint8, "Packed spikes must be stored as uint8"
+        assert self.data.shape[:-1] == self.shape[:-1] and self.data.shape[-1] == (
+            self.shape[-1] + 7
+        ) // 8, "Packed data of shape %s does not match spikes of shape %s" % (
+            tuple(self.data.shape),
+            tuple(self.shape),
+        )
+
+    @property
+    def device(self) -> torch.device:
+        return self.data.device
+
+    def size(self, dim: Optional[int] = None) -> Union[torch.Size, int]:
+        # language=rst
+        """
+        Returns the shape of the unpacked spikes, or its size along ``dim``.
+        """
+        if dim is None:
+            return self.shape
+
+        return self.shape[dim]
+
+    def dim(self) -> int:
+        return len(self.shape)
+
+    def numel(self) -> int:
+        return self.shape.numel()
+
+    def to(self, *args, **kwargs) -> "PackedSpikes":
+        # language=rst
+        """
+        Moves the packed data to another device; the storage type is kept.
+        """
+        return PackedSpikes(self.data.to(*args, **kwargs), self.shape, self.dtype)
+
+    def clone(self) -> "PackedSpikes":
+        return PackedSpikes(self.data.clone(), self.shape, self.dtype)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index) -> "PackedSpikes":
+        # language=rst
+        """
+        Indexes the leading (unpacked) dimensions. The neuron dimension can not be indexed.
+        """
+        data = self.data[index]
+        assert data.dim() >= 1 and data.shape[-1] == self.data.shape[-1], (
+            "Only the leading dimensions of packed spikes can be indexed"
+        )
+        return PackedSpikes(data, data.shape[:-1] + self.shape[-1:], self.dtype)
+
+    def __setitem__(self, index, value: Union["PackedSpikes", torch.Tensor]) -> None:
+        # language=rst
+        """
+        Assigns spikes along the leading dimensions; unpacked tensors are packed first.
+        """
+        if not isinstance(value, PackedSpikes):
+            value = pack_spikes(value)
+
+        self.data[index] = value.data
+
+    def transpose(self, dim0: int, dim1: int) -> "PackedSpikes":
+        # language=rst
+        """
+        Swaps two leading dimensions without unpacking.
+        """
+        n = len(self.shape)
+        dim0, dim1 = dim0 % n, dim1 % n
+        assert dim0 != n - 1 and dim1 != n - 1, "The neuron dimension of packed spikes can not be transposed"
+
+        shape = list(self.shape)
+        shape[dim0], shape[dim1] = shape[dim1], shape[dim0]
+        return PackedSpikes(self.data.transpose(dim0, dim1), shape, self.dtype)
+
+    def unpack(self) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the spikes as a regular tensor.
+        """
+        return unpack_spikes(self)
+
+    def sum(self, dim: Optional[int] = None) -> torch.Tensor:
+        # language=rst
+        """
+        Spike counts along a dimension (all spikes if ``dim`` is ``None``), computed on the packed bytes.
+        """
+        return spike_count(self, dim=dim)
+
+
+def popcount(data: torch.Tensor) -> torch.Tensor:
+    # language=rst
+    """
+    Number of set bits of every byte, computed with ``uint8`` shifts and masks.
+
+    :param data: ``uint8`` tensor.
+    :return: ``uint8`` tensor of bit counts.
+    """
+    data = data - ((data >> 1) & 0x55)
+    data = (data & 0x33) + ((data >> 2) & 0x33)
+    return (data + (data >> 4)) & 0x0F
+
+
+def pack_spikes(spikes: torch.Tensor) -> PackedSpikes:
+    # language=rst
+    """
+    Packs a spike tensor with 1 bit per spike. Any non-zero value is a spike.
+
+    :param spikes: Tensor of shape ``[n_1, ..., n_k]``.
+    :return: ``PackedSpikes`` of shape ``[n_1, ..., n_k]``.
+    """
+    if isinstance(spikes, PackedSpikes):
+        return spikes
+
+    assert spikes.dim() > 0, "Spikes must have at least one dimension"
+
+    shape = spikes.shape
+    n = shape[-1]
+    n_bytes = (n + 7) // 8
+
+    bits = (spikes != 0).to(torch.uint8)
+    if n_bytes * 8 != n:
+        bits = torch.nn.functional.pad(bits, (0, n_bytes * 8 - n))
+
+    bits = bits.view(*shape[:-1], n_bytes, 8) * BIT_WEIGHTS.to(spikes.device)
+    data = bits.sum(-1, dtype=torch.uint8)
+
+    return PackedSpikes(data, shape, spikes.dtype)
+
+
+def unpack_spikes(packed: Union[PackedSpikes, torch.Tensor]) -> torch.Tensor:
+    # language=rst
+    """
+    Unpacks spikes stored with 1 bit per spike. Regular tensors are returned as they are.
+
+    :param packed: ``PackedSpikes`` of shape ``[n_1, ..., n_k]``.
+    :return: Tensor of shape ``[n_1, ..., n_k]`` in the type of the packed spikes.
+    """
+    if not isinstance(packed, PackedSpikes):
+        return packed
+
+    shifts = torch.arange(8, dtype=torch.uint8, device=packed.device)
+    bits = (packed.data.unsqueeze(-1) >> shifts) & 1
+    bits = bits.flatten(-2)[..., : packed.shape[-1]]
+
+    return bits.to(packed.dtype)
+
+
+def spike_count(
+    spikes: Union[PackedSpikes, torch.Tensor],
+    dim: Optional[int] = None,
+    window: Optional[int] = None,
+) -> torch.Tensor:
+    # language=rst
+    """
+    Counts spikes along a dimension, optionally in consecutive windows. Packed spikes are counted on their bytes: the
+    neuron dimension with a byte-wise popcount, every other dimension one bit plane at a time, so no unpacked tensor
+    is created.
+
+    :param spikes: ``PackedSpikes`` or tensor of shape ``[n_1, ..., n_k]``.
+    :param dim: Dimension to count along; all spikes are counted if ``None``.
+    :param window: If not ``None``, count separately in windows of this many entries along ``dim``, which must
+                   divide its size.
+    :return: ``int64`` tensor of counts, with ``dim`` removed (or of size ``n_dim / window`` with ``window``).
+    """
+    if not isinstance(spikes, PackedSpikes):
+        spikes = (spikes != 0).long()
+        if dim is None:
+            return spikes.sum()
+
+        if window is not None:
+            spikes = spikes.unflatten(dim, (-1, window))
+            return spikes.sum(dim % (spikes.dim() - 1) + 1)
+
+        return spikes.sum(dim)
+
+    data = spikes.data
+    if dim is None:
+        return popcount(data).sum(dtype=torch.int64)
+
+    n = len(spikes.shape)
+    dim = dim % n
+    assert window is None or dim != n - 1, "Windows are only supported along leading dimensions"
+
+    if window is not None:
+        data = data.unflatten(dim, (-1, window))
+        dim += 1
+
+    if dim == data.dim() - 1:
+        # Along the neuron dimension: popcount of every byte.
+        return popcount(data).sum(-1, dtype=torch.int64)
+
+    counts = torch.stack([((data >> k) & 1).sum(dim, dtype=torch.int64) for k in range(8)], -1)
+    return counts.flatten(-2)[..., : spikes.shape[-1]]
@@ -10,25 +10,52 @@ Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
 
 import torch
 import math
+import hashlib
 import numpy as np
 
+from collections import OrderedDict
+
+from ULIIC.computing.fixed_cordic import fixed_cordic_exp
+
+# Memoized decay factors, see ``decay_factor``; the least recently used are dropped beyond ``decay_cache_size``.
+decay_cache = OrderedDict()
+decay_cache_size = 256
+
+# Memoized exp tables, see ``exp_table``, of at most ``table_size`` entries.
+table_cache = {}
+table_size = 2 ** 24
+
 
 def error_exp(x, error=True, bits_width=16, mode=0, cordic_mode=3):
     """
 
     :param x: The value to be computed.
-    :param error: Whether we need the error
+    :param error: Whether we need the error, or a boolean tensor (broadcastable to ``x``) selecting the elements
+                  computed with the error, such as ``paired_error_mask`` for paired simulations.
     :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 8.
-    :param mode: Average mode or Worst mode, default is average.
+    :param mode: Average mode, Worst mode, tiny offset or bit-accurate mode (0, 1, 2, 3), default is average.
+                 The bit-accurate mode runs the fixed-point CORDIC emulation, which has no control (0) variant.
     :param cordic_mode: cordic_mode, 0-control, 1-conventional, 2-angle recoding, 3-pipeline.
 
     """
 
+    if isinstance(error, torch.Tensor):  # element-wise selection
+        exp_result = torch.where(
+            error,
+            error_exp(x, error=True, bits_width=bits_width, mode=mode, cordic_mode=cordic_mode),
+            torch.exp(x),
+        )
+        return exp_result
+
     exp_result = 0.0
     if error == False:  # accurate result
         exp_result = torch.exp(x)
         return exp_result
 
+    if mode == 3:  # bit-accurate
+        exp_result = fixed_cordic_exp(x, bits_width=bits_width, cordic_mode=cordic_mode)
+        return exp_result
+
     if mode == 0 and error:   # average
         if bits_width == 8:
             if cordic_mode == 0:
@@ -112,6 +139,149 @@ def error_exp(x, error=True, bits_width=16, mode=0, cordic_mode=3):
     return exp_result
 
 
+def decay_factor(dt, tc, error=True, bits_width=16, mode=0, cordic_mode=3):
+    """
+    Decay factor ``exp(-dt / tc)`` under the error model, memoized on ``(dt, tc, error, bits_width, mode, cordic_mode)``.
+
+    Time constants are keyed by value (with shape, dtype and device for tensors), so a new factor is only computed
+    when ``dt`` or the parameters change. Every call returns a copy of the memoized factor, which can be assigned to
+    buffers and modified in place.
+
+    :param dt: Simulation time step.
+    :param tc: Time constant(s) of the decay.
+    :param error: Whether we need the error
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    :param mode: Error mode of ``error_exp``.
+    :param cordic_mode: cordic_mode, 0-control, 1-conventional, 2-angle recoding, 3-pipeline.
+    """
+    if isinstance(tc, torch.Tensor):
+        digest = hashlib.sha1(tc.detach().cpu().contiguous().numpy().tobytes()).hexdigest()
+        tc_key = (tuple(tc.shape), tc.dtype, tc.device, digest)
+    else:
+        tc_key = tc
+
+    key = (float(dt), tc_key, bool(error), bits_width, mode, cordic_mode)
+    factor = decay_cache.get(key, None)
+    if factor is None:
+        factor = error_exp(
+            -dt / tc, error=error, bits_width=bits_width, mode=mode, cordic_mode=cordic_mode
+        )
+        decay_cache[key] = factor
+        if len(decay_cache) > decay_cache_size:
+            decay_cache.popitem(last=False)
+    else:
+        decay_cache.move_to_end(key)
+
+    return factor.clone()
+
+
+def paired_error_mask(batch_size, dim, error=True, device=None):
+    """
+    Error selection of a paired batch, whose first half is simulated exactly and whose second half under the error
+    model (if ``error``).
+
+    :param batch_size: Size of the paired batch (twice the number of samples).
+    :param dim: Number of dimensions of the tensors the mask is broadcast against, batch dimension included.
+    :param error: Whether the second half needs the error.
+    :param device: Device of the mask.
+    :return: Boolean tensor of shape ``[batch_size, 1, ..., 1]``.
+    """
+    mask = torch.arange(batch_size, device=device) >= batch_size // 2
+    if not error:
+        mask.zero_()
+
+    return mask.view(batch_size, *([1] * (dim - 1)))
+
+
+def clear_decay_cache():
+    """
+    Drops all memoized decay factors.
+    """
+    decay_cache.clear()
+
+
+def exp_table(lo, hi, bits_width=16, cordic_mode=3, device=None):
+    """
+    Table of the bit-accurate ``error_exp`` over ``[lo, hi]``, memoized on the range, CORDIC configuration and device.
+
+    The fixed-point exp unit quantizes its argument to ``bits_width - 1`` fractional bits, so one entry per
+    quantization step covers every result it can produce in the range.
+
+    :param lo: Lower bound of the tabulated arguments.
+    :param hi: Upper bound of the tabulated arguments.
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    :param cordic_mode: cordic_mode, 1-conventional, 2-angle recoding, 3-pipeline.
+    :param device: Device of the table.
+    :return: Quantized argument of the first entry and ``float64`` tensor of entries.
+    """
+    device = torch.device(device or "cpu")
+    key = (float(lo), float(hi), bits_width, cordic_mode, device)
+    table = table_cache.get(key, None)
+    if table is None:
+        start, stop = table_bounds(lo, hi, bits_width)
+        assert stop - start < table_size, "The range [%s, %s] is too large for an exp table" % (lo, hi)
+
+        grid = torch.arange(start, stop + 1, dtype=torch.float64, device=device) / 2 ** (bits_width - 1)
+        table = (start, fixed_cordic_exp(grid, bits_width=bits_width, cordic_mode=cordic_mode))
+        table_cache[key] = table
+
+    return table
+
+
+def table_bounds(lo, hi, bits_width=16):
+    """
+    Quantized arguments of the first and of the last entry of an ``exp_table`` over ``[lo, hi]``.
+
+    :param lo: Lower bound of the tabulated arguments.
+    :param hi: Upper bound of the tabulated arguments.
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    """
+    return math.floor(lo * 2 ** (bits_width - 1)), math.ceil(hi * 2 ** (bits_width - 1))
+
+
+def table_exp(x, lo, hi, error=True, bits_width=16, mode=0, cordic_mode=3):
+    """
+    ``error_exp`` with the bit-accurate mode looked up in an ``exp_table`` over ``[lo, hi]``.
+
+    Results are the same as those of ``error_exp``: arguments are quantized like in the fixed-point exp unit, and
+    arguments outside ``[lo, hi]``, exact results and the other error modes (which are cheap) are computed by
+    ``error_exp``, as is everything if the table would have more than ``table_size`` entries (e.g. at 24 or 32 bits).
+
+    :param x: The values to be computed.
+    :param lo: Lower bound of the tabulated arguments.
+    :param hi: Upper bound of the tabulated arguments.
+    :param error: Whether we need the error, or a boolean tensor selecting the elements computed with the error.
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    :param mode: Error mode of ``error_exp``.
+    :param cordic_mode: cordic_mode, 0-control, 1-conventional, 2-angle recoding, 3-pipeline.
+    """
+    start, stop = table_bounds(lo, hi, bits_width)
+    if mode != 3 or error is False or stop - start >= table_size:
+        return error_exp(x, error=error, bits_width=bits_width, mode=mode, cordic_mode=cordic_mode)
+
+    if isinstance(error, torch.Tensor):  # element-wise selection
+        return torch.where(
+            error,
+            table_exp(x, lo, hi, error=True, bits_width=bits_width, mode=mode, cordic_mode=cordic_mode),
+            torch.exp(x),
+        )
+
+    start, values = exp_table(lo, hi, bits_width=bits_width, cordic_mode=cordic_mode, device=x.device)
+
+    index = torch.round(x.double() * 2 ** (bits_width - 1)).long() - start
+    inside = (index >= 0) & (index < values.numel())
+    exp_result = values[index.clamp(0, values.numel() - 1)].to(x.dtype)
+
+    if not inside.all():
+        exp_result = torch.where(
+            inside,
+            exp_result,
+            fixed_cordic_exp(x, bits_width=bits_width, cordic_mode=cordic_mode),
+        )
+
+    return exp_result
+
+
 def conventional_cordic_exp(z: torch.Tensor, error=True, bits_width=16):
     # y = 0
     # x = scale
@@ -184,25 +354,30 @@ def conventional_cordic_exp(z: torch.Tensor, error=True, bits_width=16):
 
 
 def pipeline_cordic_exp(z: torch.Tensor, error=True, bits_width=16):
-    # y = 0
-    # x = scale
-    y = torch.zeros(z.shape)
-    x = torch.zeros(z.shape)
-    list_recode = torch.zeros(32)
+    """
+    Pipeline CORDIC with angle recoding, evaluated on whole tensors.
 
-    if bits_width == 8:
-        x += 1
-    if bits_width == 16:
-        x += 1
-    if bits_width == 24:
-        x += 1
-    if bits_width == 32:
-        x += 1
+    Every element follows the scalar algorithm: while ``|z| > 2^-(bits_width-1)`` (at most ``bits_width``
+    iterations) the rotation ``i`` whose angle is closest to ``|z|`` is selected (candidates ``bits_width-1`` down to
+    ``1``, ties keep the larger ``i``), applied in the direction of ``sign(z)`` and compensated by its scale factor.
+    Elements are processed in parallel with masks, so the result has the same bits as the scalar version for
+    inputs of any shape.
 
+    :param z: The values to be computed.
+    :param error: Whether we need the error
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    """
     if error == False:
         exp_result = torch.exp(z)
         return exp_result
 
+    z = z.float().clone()
+
+    # y = 0
+    # x = scale
+    y = torch.zeros_like(z)
+    x = torch.ones_like(z)
+
     list_thetai = [0.549306144334055, 0.255412811882995, 0.125657214140453, 0.0625815714770030,
                    0.0312601784906670, 0.0156262717520522, 0.00781265895154042, 0.00390626986839683,
                    0.00195312748353255, 0.000976562810441036, 0.000488281288805113, 0.000244140629850639,
@@ -221,68 +396,40 @@ def pipeline_cordic_exp(z: torch.Tensor, error=True, bits_width=16):
                   1.00000000000000, 1.00000000000000, 1.00000000000000, 1.00000000000000,
                   1.00000000000000, 1.00000000000000, 1.00000000000000, 1.00000000000000]
 
+    thetai = torch.tensor(list_thetai[:bits_width], device=z.device)
+    scale = torch.tensor(list_scale[:bits_width], device=z.device)
+    shift = torch.tensor(
+        [math.pow(2, -(j + 1)) for j in range(bits_width)], device=z.device
+    )
+
+    # Recoding candidates sorted by increasing angle. The closest angle is one of the two neighbours of |z| in this
+    # list; on equal distances the smaller angle (larger i) is kept, as in the scalar scan.
+    candidates = torch.arange(bits_width - 1, 0, -1, device=z.device)
+    thetai_candidates = thetai[candidates]
+    n_candidates = candidates.numel()
+
     for i in range(bits_width):
         z_temp = z.sign() * z
-        for m in range(z.shape[0]):
-            for n in range(z.shape[1]):
-                if z_temp[m][n] > math.pow(2, -(bits_width - 1)):
-                    for j in range(bits_width):
-                        if z_temp[m][n] > list_thetai[j]:
-                            list_recode[j] = z_temp[m][n] - list_thetai[j]
-                        else:
-                            list_recode[j] = list_thetai[j] - z_temp[m][n]
-
-                    rmin = list_recode[bits_width - 1]
-                    irecode = bits_width - 1
-
-                    for k in range(bits_width - 2):
-                        l = bits_width - (k + 2)
-                        if list_recode[l] < rmin:
-                            rmin = list_recode[l]
-                            irecode = l
-                        else:
-                            pass
-
-                    signz = z.sign()
-                    x[m][n] += y[m][n] * signz[m][n] * math.pow(2, -(irecode + 1))
-                    y[m][n] += (x[m][n] - y[m][n] * signz[m][n] * math.pow(2, -(irecode + 1))) * \
-                               signz[m][n] * math.pow(2, -(irecode + 1))
-                    z[m][n] -= signz[m][n] * list_thetai[irecode]
-                    x[m][n] = x[m][n] * list_scale[irecode]
-                    y[m][n] = y[m][n] * list_scale[irecode]
-                    # print("z>0", z, i)
-                else:
-                    break
-
-    # for i in range(bits_width):
-    #     z_temp = z.sign() * z
-    #     if z_temp > math.pow(2, -(bits_width - 1)):
-    #         for j in range(bits_width):
-    #             if z_temp > list_thetai[j]:
-    #                 list_recode[j] = z_temp - list_thetai[j]
-    #             else:
-    #                 list_recode[j] = list_thetai[j] - z_temp
-    #
-    #         rmin = list_recode[bits_width - 1]
-    #         irecode = bits_width - 1
-    #
-    #         for k in range(bits_width - 2):
-    #             l = bits_width - (k + 2)
-    #             if list_recode[l] < rmin:
-    #                 rmin = list_recode[l]
-    #                 irecode = l
-    #             else:
-    #                 pass
-    #
-    #         signz = z.sign()
-    #         x += y * signz * math.pow(2, -(irecode + 1))
-    #         y += (x - y * signz * math.pow(2, -(irecode + 1))) * signz * math.pow(2, -(irecode + 1))
-    #         z -= signz * list_thetai[irecode]
-    #         x = x * list_scale[irecode]
-    #         y = y * list_scale[irecode]
-    #         # print("z>0", z, i)
-    #     else:
-    #         break
+        active = z_temp > math.pow(2, -(bits_width - 1))
+        if not active.any():
+            break
+
+        upper = torch.searchsorted(thetai_candidates, z_temp.contiguous())
+        lower = (upper - 1).clamp(min=0)
+        upper = upper.clamp(max=n_candidates - 1)
+        recode_lower = (z_temp - thetai_candidates[lower]).abs()
+        recode_upper = (z_temp - thetai_candidates[upper]).abs()
+        irecode = candidates[torch.where(recode_lower <= recode_upper, lower, upper)]
+
+        signz = z.sign()
+        step = shift[irecode]
+        x_new = x + y * signz * step
+        y_new = y + (x_new - y * signz * step) * signz * step
+        z_new = z - signz * thetai[irecode]
+
+        x = torch.where(active, x_new * scale[irecode], x)
+        y = torch.where(active, y_new * scale[irecode], y)
+        z = torch.where(active, z_new, z)
 
     exp_result = x + y
     return exp_result
@@ -0,0 +1,207 @@
+"""
+Author: Jiajun Wu, HUST, China
+Main Library: Pytorch
+Description: It is a library with spiking neural network. We would like to implement this NN in hardware.
+File Information: This file includes the bit-accurate fixed-point emulation of the hyperbolic CORDIC exp.
+Log: 2020/1/20 Build firstly
+Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
+
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, Union
+
+import torch
+
+
+class CordicTable:
+    # language=rst
+    """
+    Lookup tables of a fixed-point CORDIC exp unit.
+
+    Values are held as integers with ``bits_width - 1`` fractional bits, so ``v`` is represented by
+    ``round(v * 2^(bits_width - 1))`` (the conventional unit starts from ``x = 1.2109375`` at 8 bits, i.e. ``155 / 2^7``).
+    The tables are built once per ``(bits_width, cordic_mode)`` by ``cordic_table`` and moved to each device only once.
+    """
+
+    def __init__(self, bits_width: int = 16, cordic_mode: int = 3) -> None:
+        # language=rst
+        """
+        Precomputes the rotation angles, shifts, scale factors and recoding choices.
+
+        :param bits_width: The CORDIC width, 8, 16, 24, 32.
+        :param cordic_mode: cordic_mode, 1-conventional, 2-angle recoding, 3-pipeline.
+        """
+        assert bits_width in (8, 16, 24, 32), "Unsupported CORDIC width: %s" % bits_width
+        if cordic_mode not in (1, 2, 3):
+            raise NotImplementedError(
+                "Fixed-point emulation is available for conventional (1), angle recoding (2) and pipeline (3) CORDIC "
+                "only."
+            )
+
+        self.bits_width = bits_width
+        self.cordic_mode = cordic_mode
+        self.frac_bits = bits_width - 1
+
+        one = 1 << self.frac_bits
+        self.ln2 = int(round(math.log(2) * one))  # Range reduction constant.
+
+        tables = {}
+        if cordic_mode == 1:
+            # Conventional CORDIC: every rotation is applied, rotations 4 and 13 are repeated for convergence and the
+            # constant gain is pre-compensated in the initial value of x.
+            shifts = []
+            for i in range(bits_width):
+                if i == 3 or i == 12:
+                    shifts.append(i + 1)
+                shifts.append(i + 1)
+
+            gain = 1.0
+            for s in shifts:
+                gain *= math.sqrt(1.0 - math.pow(2, -2 * s))
+
+            self.x0 = int(round(one / gain))
+            tables["shift"] = shifts
+            tables["thetai"] = [int(round(math.atanh(math.pow(2, -s)) * one)) for s in shifts]
+        else:
+            # Angle recoding: x starts at one and rotation ``j`` (shift ``j + 1``) is compensated by its scale factor,
+            # in every pipeline stage (3) or once in a final multiplication by the product of the scale factors of the
+            # applied rotations (2).
+            self.x0 = one
+            shifts = [j + 1 for j in range(bits_width)]
+            thetai = [int(round(math.atanh(math.pow(2, -s)) * one)) for s in shifts]
+            tables["shift"] = shifts
+            tables["thetai"] = thetai
+            tables["scale"] = [
+                int(round(one / math.sqrt(1.0 - math.pow(2, -2 * s)))) for s in shifts
+            ]
+
+            # Recoding candidates ``bits_width - 1`` down to ``1`` sorted by increasing angle. The rotation closest to
+            # ``|z|`` is found by counting the neighbour midpoints below ``|z|`` (compared as ``2|z|`` against sums to
+            # stay in integers); equal distances and equal quantized angles keep the larger ``j``.
+            candidates = list(range(bits_width - 1, 0, -1))
+            ascending = [thetai[j] for j in candidates]
+            tables["midpoints"] = [
+                ascending[p] + ascending[p + 1] for p in range(len(ascending) - 1)
+            ]
+            tables["choice"] = [candidates[ascending.index(t)] for t in ascending]
+
+            # Rotations stop once ``|z| <= 2^-(bits_width - 1)``.
+            self.threshold = int(math.pow(2, -(bits_width - 1)) * one)
+
+        self.tables = {
+            key: torch.tensor(value, dtype=torch.int64) for key, value in tables.items()
+        }
+        self.devices = {}
+
+    def to(self, device: Union[str, torch.device]) -> Dict[str, torch.Tensor]:
+        # language=rst
+        """
+        Returns the lookup tables on a device, copying them there on first use.
+
+        :param device: Device of the values to be computed.
+        :return: Dictionary of ``int64`` lookup tables.
+        """
+        device = torch.device(device)
+        tables = self.devices.get(device, None)
+        if tables is None:
+            tables = {key: value.to(device) for key, value in self.tables.items()}
+            self.devices[device] = tables
+
+        return tables
+
+
+@lru_cache(maxsize=None)
+def cordic_table(bits_width: int = 16, cordic_mode: int = 3) -> CordicTable:
+    # language=rst
+    """
+    Returns the (cached) lookup tables of a CORDIC configuration.
+
+    :param bits_width: The CORDIC width, 8, 16, 24, 32.
+    :param cordic_mode: cordic_mode, 1-conventional, 2-angle recoding, 3-pipeline.
+    """
+    return CordicTable(bits_width=bits_width, cordic_mode=cordic_mode)
+
+
+def fixed_cordic_exp(
+    x: Union[float, torch.Tensor], bits_width: int = 16, cordic_mode: int = 3
+) -> torch.Tensor:
+    # language=rst
+    """
+    Bit-accurate fixed-point emulation of the CORDIC exp unit.
+
+    The argument is quantized (round to nearest) to ``bits_width - 1`` fractional bits and reduced to
+    ``x = k * ln2 + r`` with ``|r| <= ln2 / 2``. The CORDIC core computes ``exp(r) = cosh(r) + sinh(r)`` on integer
+    registers, with arithmetic right shifts truncating every ``2^-i`` multiplication and the scale multiplications of
+    the pipeline mode (or the accumulation and final application of the scale factor of the angle recoding mode), and
+    ``2^k`` is applied as a final shift. All elements are rotated in parallel on ``int64``
+    tensors, so the result carries the same quantization error as the hardware.
+
+    :param x: The values to be computed.
+    :param bits_width: The CORDIC width, 8, 16, 24, 32, default value is 16.
+    :param cordic_mode: cordic_mode, 1-conventional, 2-angle recoding, 3-pipeline.
+    :return: ``exp(x)`` with the error of the hardware, in the floating point type of ``x``.
+    """
+    x = torch.as_tensor(x)
+    dtype = x.dtype if x.is_floating_point() else torch.get_default_dtype()
+
+    table = cordic_table(bits_width, cordic_mode)
+    tables = table.to(x.device)
+    frac_bits = table.frac_bits
+
+    # Quantization and range reduction.
+    z = torch.round(x.double() * (1 << frac_bits)).long()
+    k = torch.div(z + table.ln2 // 2, table.ln2, rounding_mode="floor")
+    z = z - k * table.ln2
+
+    shift = tables["shift"]
+    thetai = tables["thetai"]
+
+    x = torch.full_like(z, table.x0)
+    y = torch.zeros_like(z)
+
+    if cordic_mode == 1:
+        for i in range(shift.numel()):
+            d = torch.where(z >= 0, 1, -1)
+            s = int(shift[i])
+            x_new = x + d * (y >> s)
+            y = y + d * (x >> s)
+            x = x_new
+            z = z - d * int(thetai[i])
+    else:
+        scale = tables["scale"]
+        midpoints = tables["midpoints"]
+        choice = tables["choice"]
+
+        # Scale factor of the rotations applied so far, for angle recoding.
+        gain = torch.full_like(z, table.x0)
+
+        for _ in range(bits_width):
+            z_abs = z.abs()
+            active = z_abs > table.threshold
+            if not active.any():
+                break
+
+            j = choice[torch.searchsorted(midpoints, (2 * z_abs).contiguous())]
+            d = z.sign()
+            s = shift[j]
+            x_new = x + d * (y >> s)
+            y_new = y + d * (x >> s)
+            z_new = z - d * thetai[j]
+            if cordic_mode == 3:
+                x_new = x_new * scale[j] >> frac_bits
+                y_new = y_new * scale[j] >> frac_bits
+            else:
+                gain = torch.where(active, gain * scale[j] >> frac_bits, gain)
+
+            x = torch.where(active, x_new, x)
+            y = torch.where(active, y_new, y)
+            z = torch.where(active, z_new, z)
+
+        if cordic_mode == 2:
+            x = x * gain >> frac_bits
+            y = y * gain >> frac_bits
+
+    exp_result = torch.ldexp((x + y).double(), (k - frac_bits).double())
+    return exp_result.to(dtype)
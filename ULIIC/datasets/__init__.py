@@ -4,6 +4,7 @@ from .davis import Davis
 
 from .collate import time_aware_collate
 from .dataloader import DataLoader
+from .spike_cache import SpikeCache
 
 
 CIFAR10 = create_torchvision_dataset_wrapper("CIFAR10")
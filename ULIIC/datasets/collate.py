@@ -12,6 +12,8 @@ from torch._six import container_abcs, string_classes, int_classes
 
 from torch.utils.data._utils import collate as pytorch_collate
 
+from ..auxiliary.spike_packing import PackedSpikes
+
 
 def safe_worker_check():
     """ Method to check to used shared memory will change in a newer
@@ -31,11 +33,19 @@ def time_aware_collate(batch):
     -  0 dim (,) - (1, batch_size, 1)
     -  1 dim (time,) - (time, batch_size, 1)
     - >2 dim (time, n_0, ...) - (time, batch_size, n_0, ...)
+
+    ``PackedSpikes`` of shape (time, n_0, ...) are stacked without unpacking
+    into ``PackedSpikes`` of shape (time, batch_size, n_0, ...).
     """
 
     elem = batch[0]
     elem_type = type(elem)
-    if isinstance(elem, torch.Tensor):
+    if isinstance(elem, PackedSpikes):
+        assert elem.dim() >= 2, "Packed spikes must have a time dimension"
+        data = torch.stack([x.data for x in batch], 1)
+        shape = (elem.shape[0], len(batch)) + tuple(elem.shape[1:])
+        return PackedSpikes(data, shape, elem.dtype)
+    elif isinstance(elem, torch.Tensor):
         # catch 0 and 1 dimension cases and view as specified
         if elem.dim() == 0:
             batch = [x.view((1, 1)) for x in batch]
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+
+from ..auxiliary.spike_packing import PackedSpikes, pack_spikes
+
+
+class SpikeCache(torch.utils.data.Dataset):
+    # language=rst
+    """
+    Caches the encoded spike trains of a dataset in an on-disk, memory-mapped, bit-packed store.
+
+    The wrapped dataset (e.g. one created by ``create_torchvision_dataset_wrapper``) is encoded once, item by item
+    with the global random number generator seeded by ``seed + index``, so seeded stochastic encoders such as Poisson
+    are reproducible. The ``encoded_image`` of every item is packed with 1 bit per spike into a single file under
+    ``root``, in a directory named after a hash of the encoder configuration. Later instances (and epochs) with the same
+    configuration map the file instead of encoding again. Samples are served as ``PackedSpikes`` views of the
+    copy-on-write memory map, so DataLoader workers share the page cache instead of copying spike trains; each worker
+    opens its own map.
+
+    Items are dictionaries with ``"encoded_image"`` and ``"label"``. Packed items are batched by ``time_aware_collate``
+    (the ``DataLoader`` of this package) and unpacked by ``Network.run``; pass ``unpack=True`` for regular tensors.
+    """
+
+    def __init__(
+        self,
+        dataset: torch.utils.data.Dataset,
+        root: str,
+        seed: int = 0,
+        key: Optional[Dict] = None,
+        unpack: bool = False,
+    ) -> None:
+        # language=rst
+        """
+        Constructs a ``SpikeCache``, encoding the dataset if it is not cached yet.
+
+        :param dataset: Dataset whose items are dictionaries with ``"encoded_image"`` and ``"label"``.
+        :param root: Directory holding the caches.
+        :param seed: Base seed of the per-item encoding.
+        :param key: Additional configuration distinguishing caches, e.g. input intensity applied by a transform (whose
+                    parameters are not part of its ``repr``).
+        :param unpack: Whether to return unpacked spike tensors instead of ``PackedSpikes``.
+        """
+        super().__init__()
+
+        self.dataset = dataset
+        self.root = root
+        self.seed = seed
+        self.unpack = unpack
+
+        self.config = self.configuration(dataset, seed, key)
+        digest = hashlib.sha1(
+            json.dumps(self.config, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self.path = os.path.join(root, digest)
+
+        if not os.path.exists(os.path.join(self.path, "meta.json")):
+            self.build()
+
+        with open(os.path.join(self.path, "meta.json")) as f:
+            meta = json.load(f)
+
+        self.shape = tuple(meta["shape"])
+        self.packed_shape = tuple(meta["packed_shape"])
+        self.dtype = getattr(torch, meta["dtype"])
+        self.labels = np.load(os.path.join(self.path, "labels.npy"))
+        self.spikes = None  # Memory map, opened on first access in every process.
+
+    @staticmethod
+    def configuration(
+        dataset: torch.utils.data.Dataset, seed: int, key: Optional[Dict]
+    ) -> Dict:
+        # language=rst
+        """
+        Describes everything the encoded spike trains depend on.
+        """
+        encoder = getattr(dataset, "image_encoder", None)
+        return {
+            "dataset": type(dataset).__name__,
+            "length": len(dataset),
+            "root": getattr(dataset, "root", None),
+            "train": getattr(dataset, "train", None),
+            "transform": repr(getattr(dataset, "transform", None)),
+            "encoder": type(encoder).__name__,
+            "encoder_args": getattr(encoder, "enc_args", None),
+            "encoder_kwargs": getattr(encoder, "enc_kwargs", None),
+            "seed": seed,
+            "key": key,
+        }
+
+    def build(self) -> None:
+        # language=rst
+        """
+        Encodes every item into a temporary directory, which is moved into place once complete.
+        """
+        assert len(self.dataset) > 0, "Can not cache an empty dataset"
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.root)
+
+        try:
+            spikes, labels, meta = None, [], None
+            for i in range(len(self.dataset)):
+                with torch.random.fork_rng(devices=[]):
+                    torch.manual_seed(self.seed + i)
+                    item = self.dataset[i]
+
+                packed = pack_spikes(item["encoded_image"])
+                if spikes is None:
+                    meta = {
+                        "shape": list(packed.shape),
+                        "packed_shape": list(packed.data.shape),
+                        "dtype": str(packed.dtype).replace("torch.", ""),
+                        "config": self.config,
+                    }
+                    spikes = np.memmap(
+                        os.path.join(tmp, "spikes.bin"),
+                        dtype=np.uint8,
+                        mode="w+",
+                        shape=(len(self.dataset),) + tuple(packed.data.shape),
+                    )
+
+                assert list(packed.shape) == meta["shape"], "All items must have the same shape"
+                spikes[i] = packed.data.cpu().numpy()
+                labels.append(int(item["label"]))
+
+            if spikes is not None:
+                spikes.flush()
+                del spikes
+
+            np.save(os.path.join(tmp, "labels.npy"), np.array(labels, dtype=np.int64))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f, default=str)
+
+            try:
+                os.rename(tmp, self.path)
+            except OSError:
+                # Built concurrently by another process.
+                shutil.rmtree(tmp)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def __getstate__(self) -> Dict:
+        # Memory maps are reopened by every DataLoader worker.
+        state = self.__dict__.copy()
+        state["spikes"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, ind: int) -> Dict:
+        # language=rst
+        """
+        Returns a cached item without encoding.
+
+        :param ind: Index of the item.
+        :return: Dictionary with the ``"encoded_image"`` and the ``"label"`` of the item.
+        """
+        if self.spikes is None:
+            self.spikes = np.memmap(
+                os.path.join(self.path, "spikes.bin"),
+                dtype=np.uint8,
+                mode="c",
+                shape=(len(self.labels),) + self.packed_shape,
+            )
+
+        spikes = PackedSpikes(torch.from_numpy(self.spikes[ind]), self.shape, self.dtype)
+        if self.unpack:
+            spikes = spikes.unpack()
+
+        return {"encoded_image": spikes, "label": int(self.labels[ind])}
@@ -1,5 +1,6 @@
 from .encodings import single, repeat, bernoulli, poisson, rank_order
 from .loaders import bernoulli_loader, poisson_loader, rank_order_loader
+from .sources import AbstractSource, PoissonSource
 from .encoders import (
     Encoder,
     NullEncoder,
@@ -1,4 +1,5 @@
 from . import encodings
+from ..auxiliary.spike_packing import pack_spikes
 
 
 class Encoder:
@@ -7,14 +8,24 @@ class Encoder:
 
     - Calls self.enc from the subclass and passes whatever arguments were
       provided. self.enc must be callable with torch.Tensor, *args, **kwargs
+    - With the keyword argument ``packed=True``, spikes are returned as
+      ``PackedSpikes`` (1 bit per spike).
+    - With the keyword argument ``batched=True``, inputs of shape
+      ``[n_samples, n_1, ..., n_k]`` are encoded in one call into
+      ``[time, n_samples, n_1, ..., n_k]``.
     """
 
     def __init__(self, *args, **kwargs) -> None:
+        self.packed = kwargs.pop("packed", False)
         self.enc_args = args
         self.enc_kwargs = kwargs
 
     def __call__(self, img):
-        return self.enc(img, *self.enc_args, **self.enc_kwargs)
+        spikes = self.enc(img, *self.enc_args, **self.enc_kwargs)
+        if self.packed:
+            return pack_spikes(spikes)
+
+        return spikes
 
 
 class NullEncoder(Encoder):
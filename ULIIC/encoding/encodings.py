@@ -18,11 +18,21 @@ def single(
     :param dt: Simulation time step.
     :param sparsity: Sparsity of the input representation. 0 for no spike and 1 for all spike.
     :return: Tensor of shape ``[time, n_1, ..., n_k]``.
+
+    Keyword arguments:
+
+    :param bool batched: Whether ``datum`` is a batch of shape ``[n_samples, n_1, ..., n_k]``, encoded sample by
+        sample into ``[time, n_samples, n_1, ..., n_k]``.
     """
     time = int(time / dt)
     shape = list(datum.shape)
     datum = np.copy(datum)
-    quantile = np.quantile(datum, 1 - sparsity)
+    if kwargs.get("batched", False):
+        # One quantile per sample.
+        quantile = np.quantile(datum.reshape(shape[0], -1), 1 - sparsity, axis=1)
+        quantile = quantile.reshape([shape[0]] + [1] * (len(shape) - 1))
+    else:
+        quantile = np.quantile(datum, 1 - sparsity)
     s = np.zeros([time, *shape])
     s[0] = np.where(datum > quantile, np.ones(shape), np.zeros(shape))
     return torch.Tensor(s).byte()
@@ -34,7 +44,8 @@ def repeat(datum: torch.Tensor, time: int, dt: float = 1.0, **kwargs) -> torch.T
     :param datum: Repeats a tensor along a new dimension in the 0th position for ``int(time / dt)`` timesteps.
     :param time: Tensor of shape ``[n_1, ..., n_k]``.
     :param dt: Simulation time step.
-    :return: Tensor of shape ``[time, n_1, ..., n_k]`` of repeated data along the 0th dimension.
+    :return: Tensor of shape ``[time, n_1, ..., n_k]`` of repeated data along the 0th dimension. A batch of shape
+             ``[n_samples, n_1, ..., n_k]`` is repeated into ``[time, n_samples, n_1, ..., n_k]`` as it is.
     """
     time = int(time / dt)
     return datum.repeat([time, *([1] * len(datum.shape))])
@@ -55,9 +66,12 @@ def bernoulli(
     Keyword arguments:
 
     :param float max_prob: Maximum probability of spike per Bernoulli trial.
+    :param bool batched: Whether ``datum`` is a batch of shape ``[n_samples, n_1, ..., n_k]``, normalized sample by
+        sample and encoded into ``[time, n_samples, n_1, ..., n_k]``.
     """
     # Setting kwargs.
     max_prob = kwargs.get("max_prob", 1.0)
+    batched = kwargs.get("batched", False)
 
     assert 0 <= max_prob <= 1, "Maximum firing probability must be in range [0, 1]"
     assert (datum >= 0).all(), "Inputs must be non-negative"
@@ -69,7 +83,11 @@ def bernoulli(
         time = int(time / dt)
 
     # Normalize inputs and rescale (spike probability proportional to normalized intensity).
-    if datum.max() > 1.0:
+    if batched:
+        datum = datum.view(shape[0], -1)
+        maximum = datum.max(1, keepdim=True)[0]
+        datum = torch.where(maximum > 1.0, datum / maximum, datum).view(-1)
+    elif datum.max() > 1.0:
         datum /= datum.max()
 
     # Make spike data from Bernoulli sampling.
@@ -95,7 +113,9 @@ def poisson(datum: torch.Tensor, time: int, dt: float = 1.0, **kwargs) -> torch.
     :param datum: Tensor of shape ``[n_1, ..., n_k]``.
     :param time: Length of Poisson spike train per input variable.
     :param dt: Simulation time step.
-    :return: Tensor of shape ``[time, n_1, ..., n_k]`` of Poisson-distributed spikes.
+    :return: Tensor of shape ``[time, n_1, ..., n_k]`` of Poisson-distributed spikes. Every input variable is sampled
+             independently, so a batch of shape ``[n_samples, n_1, ..., n_k]`` is encoded into
+             ``[time, n_samples, n_1, ..., n_k]`` as it is.
     """
     assert (datum >= 0).all(), "Inputs must be non-negative"
 
@@ -135,28 +155,34 @@ def rank_order(
     Encodes data via a rank order coding-like representation. One spike per neuron, temporally ordered by decreasing
     intensity. Inputs must be non-negative.
 
-    :param datum: Tensor of shape ``[n_samples, n_1, ..., n_k]``.
+    :param datum: Tensor of shape ``[n_1, ..., n_k]``.
     :param time: Length of rank order-encoded spike train per input variable.
     :param dt: Simulation time step.
     :return: Tensor of shape ``[time, n_1, ..., n_k]`` of rank order-encoded spikes.
+
+    Keyword arguments:
+
+    :param bool batched: Whether ``datum`` is a batch of shape ``[n_samples, n_1, ..., n_k]``, ranked sample by sample
+        and encoded into ``[time, n_samples, n_1, ..., n_k]``.
     """
     assert (datum >= 0).all(), "Inputs must be non-negative"
 
-    shape, size = datum.shape, datum.numel()
-    datum = datum.view(-1)
+    shape = datum.shape
+    n_samples = shape[0] if kwargs.get("batched", False) else 1
+    datum = datum.reshape(n_samples, -1)
+    size = datum.size(1)
     time = int(time / dt)
 
     # Create spike times in order of decreasing intensity.
-    datum /= datum.max()
-    times = torch.zeros(size)
+    datum = datum / datum.max(1, keepdim=True)[0]
+    times = torch.zeros(n_samples, size)
     times[datum != 0] = 1 / datum[datum != 0]
-    times *= time / times.max()  # Extended through simulation time.
+    times *= time / times.max(1, keepdim=True)[0]  # Extended through simulation time.
     times = torch.ceil(times).long()
 
-    # Create spike times tensor.
-    spikes = torch.zeros(time, size).byte()
-    for i in range(size):
-        if 0 < times[i] < time:
-            spikes[times[i] - 1, i] = 1
+    # Create spike times tensor, scattering one spike per input variable.
+    spikes = torch.zeros(time, n_samples, size).byte()
+    sample, neuron = ((times > 0) & (times < time)).nonzero(as_tuple=True)
+    spikes[times[sample, neuron] - 1, sample, neuron] = 1
 
     return spikes.reshape(time, *shape)
@@ -5,6 +5,26 @@ import torch
 from .encodings import bernoulli, poisson, rank_order
 
 
+def chunks(
+    data: Union[torch.Tensor, Iterable[torch.Tensor]], chunk_size: int
+) -> Iterator[torch.Tensor]:
+    # language=rst
+    """
+    Splits a sequence of data into consecutive batches.
+
+    :param data: Tensor of shape ``[n_samples, n_1, ..., n_k]`` or sequence of tensors of shape ``[n_1, ..., n_k]``.
+    :param chunk_size: Number of samples per batch (the last batch may be smaller).
+    :return: Tensors of shape ``[chunk_size, n_1, ..., n_k]``.
+    """
+    assert chunk_size > 0, "Chunk size must be positive"
+
+    for i in range(0, len(data), chunk_size):
+        if isinstance(data, torch.Tensor):
+            yield data[i : i + chunk_size]
+        else:
+            yield torch.stack([data[j] for j in range(i, min(i + chunk_size, len(data)))])
+
+
 def bernoulli_loader(
     data: Union[torch.Tensor, Iterable[torch.Tensor]],
     time: Optional[int] = None,
@@ -23,9 +43,20 @@ def bernoulli_loader(
     Keyword arguments:
 
     :param float max_prob: Maximum probability of spike per Bernoulli trial.
+    :param int chunk_size: If given, encode ``chunk_size`` samples at a time and yield tensors of shape
+        ``[time, chunk_size, n_1, ..., n_k]``.
     """
     # Setting kwargs.
-    max_prob = kwargs.get("dt", 1.0)
+    max_prob = kwargs.get("max_prob", 1.0)
+    chunk_size = kwargs.get("chunk_size", None)
+
+    if chunk_size is not None:
+        for chunk in chunks(data, chunk_size):
+            # Encode batch of data as Bernoulli spike trains.
+            yield bernoulli(
+                datum=chunk, time=time, dt=dt, max_prob=max_prob, batched=True
+            )
+        return
 
     for i in range(len(data)):
         # Encode datum as Bernoulli spike trains.
@@ -46,7 +77,20 @@ def poisson_loader(
     :param time: Length of Poisson spike train per input variable.
     :param dt: Simulation time step.
     :return: Tensors of shape ``[time, n_1, ..., n_k]`` of Poisson-distributed spikes.
+
+    Keyword arguments:
+
+    :param int chunk_size: If given, encode ``chunk_size`` samples at a time and yield tensors of shape
+        ``[time, chunk_size, n_1, ..., n_k]``.
     """
+    chunk_size = kwargs.get("chunk_size", None)
+
+    if chunk_size is not None:
+        for chunk in chunks(data, chunk_size):
+            # Encode batch of data as Poisson spike trains.
+            yield poisson(datum=chunk, time=time, dt=dt)
+        return
+
     for i in range(len(data)):
         # Encode datum as Poisson spike trains.
         yield poisson(datum=data[i], time=time, dt=dt)
@@ -66,7 +110,20 @@ def rank_order_loader(
     :param time: Length of rank order-encoded spike train per input variable.
     :param dt: Simulation time step.
     :return: Tensors of shape ``[time, n_1, ..., n_k]`` of rank order-encoded spikes.
+
+    Keyword arguments:
+
+    :param int chunk_size: If given, encode ``chunk_size`` samples at a time and yield tensors of shape
+        ``[time, chunk_size, n_1, ..., n_k]``.
     """
+    chunk_size = kwargs.get("chunk_size", None)
+
+    if chunk_size is not None:
+        for chunk in chunks(data, chunk_size):
+            # Encode batch of data as rank order-encoded spike trains.
+            yield rank_order(datum=chunk, time=time, dt=dt, batched=True)
+        return
+
     for i in range(len(data)):
         # Encode datum as rank order-encoded spike trains.
         yield rank_order(datum=data[i], time=time, dt=dt)
@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Union
+
+import torch
+
+
+class AbstractSource(ABC):
+    # language=rst
+    """
+    Abstract base class for lazy input sources.
+
+    A source stands in for an input tensor of shape ``[time, batch_size, n_1, ..., n_k]`` in ``Network.run``: it
+    reports that shape through ``size`` and produces the spikes of timestep ``t`` when indexed with ``t``, so the full
+    spike train is never stored. Timesteps must be requested in order; indexing timestep ``0`` restarts the source.
+    """
+
+    def __init__(self, time: int, batch_size: int, shape: Sequence[int]) -> None:
+        # language=rst
+        """
+        Abstract constructor for sources.
+
+        :param time: Number of timesteps of the spike train.
+        :param batch_size: Number of samples generated in parallel.
+        :param shape: Shape of a single sample.
+        """
+        self.time = time
+        self.batch_size = batch_size
+        self.shape = tuple(shape)
+        self.t = 0
+
+    def size(self, dim: Optional[int] = None) -> Union[torch.Size, int]:
+        # language=rst
+        """
+        Returns the shape ``[time, batch_size, n_1, ..., n_k]`` of the equivalent input tensor, or its size along
+        ``dim``.
+        """
+        size = torch.Size((self.time, self.batch_size) + self.shape)
+        if dim is None:
+            return size
+
+        return size[dim]
+
+    def dim(self) -> int:
+        return 2 + len(self.shape)
+
+    def __len__(self) -> int:
+        return self.time
+
+    def __getitem__(self, t: int) -> torch.Tensor:
+        # language=rst
+        """
+        Generates the spikes of timestep ``t``.
+
+        :param t: Timestep, ``0`` or the timestep following the last one generated.
+        :return: Tensor of shape ``[batch_size, n_1, ..., n_k]``.
+        """
+        if t == 0:
+            self.reset_()
+
+        assert t == self.t, "Timesteps of a source must be generated in order"
+        assert t < self.time, "Timestep %d is past the end of the source" % t
+
+        self.t += 1
+        return self.step()
+
+    @abstractmethod
+    def step(self) -> torch.Tensor:
+        # language=rst
+        """
+        Abstract method generating the spikes of the next timestep.
+        """
+        pass
+
+    @abstractmethod
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Abstract method restarting the source from its first timestep.
+        """
+        self.t = 0
+
+
+class PoissonSource(AbstractSource):
+    # language=rst
+    """
+    Poisson spike trains generated one timestep at a time.
+
+    Follows ``encodings.poisson``: inputs are firing rates in Hz, inter-spike intervals are Poisson-distributed with
+    mean ``1000 / (rate * dt)`` timesteps (zero intervals are incremented by one) and zero inputs never spike. Each
+    neuron only keeps a countdown to its next spike, and new intervals are drawn from a generator per sample, so the
+    spikes of a sample depend on its seed alone and are reproduced every time the source is restarted.
+    """
+
+    def __init__(
+        self,
+        datum: torch.Tensor,
+        time: int,
+        dt: float = 1.0,
+        seeds: Optional[Union[int, Sequence[int], torch.Tensor]] = None,
+        **kwargs
+    ) -> None:
+        # language=rst
+        """
+        Constructs a ``PoissonSource``.
+
+        :param datum: Tensor of shape ``[batch_size, n_1, ..., n_k]`` of non-negative firing rates.
+        :param time: Length of Poisson spike train per input variable.
+        :param dt: Simulation time step.
+        :param seeds: Seed of every sample (a single seed is used for sample ``0`` and incremented for the others).
+                      Drawn from the global random number generator if ``None``.
+        """
+        assert (datum >= 0).all(), "Inputs must be non-negative"
+
+        super().__init__(int(time / dt), datum.size(0), datum.shape[1:])
+
+        datum = datum.reshape(self.batch_size, -1).float()
+
+        if seeds is None:
+            seeds = torch.randint(2 ** 62, (self.batch_size,))
+        elif isinstance(seeds, int):
+            seeds = range(seeds, seeds + self.batch_size)
+
+        self.seeds = [int(s) for s in seeds]
+        assert len(self.seeds) == self.batch_size, "One seed per sample is required"
+
+        # Mean inter-spike intervals (in timesteps) of the firing neurons.
+        self.active = datum != 0
+        self.interval = torch.zeros_like(datum)
+        self.interval[self.active] = 1 / datum[self.active] * (1000 / dt)
+
+        self.generators = None
+        self.countdown = None
+
+    def sample(self, b: int, index: Optional[torch.Tensor] = None) -> torch.Tensor:
+        # language=rst
+        """
+        Draws the next inter-spike intervals of sample ``b``.
+
+        :param b: Sample.
+        :param index: Neurons to draw intervals for; all neurons if ``None``.
+        :return: ``long`` tensor of intervals.
+        """
+        interval = self.interval[b] if index is None else self.interval[b, index]
+        active = self.active[b] if index is None else self.active[b, index]
+
+        intervals = torch.poisson(interval, generator=self.generators[b])
+        intervals += ((intervals == 0) & active).float()
+        return intervals.long()
+
+    def step(self) -> torch.Tensor:
+        # language=rst
+        """
+        Counts down to the next spike of every neuron and draws new intervals for the neurons that spike.
+
+        :return: Tensor of shape ``[batch_size, n_1, ..., n_k]`` of spikes.
+        """
+        self.countdown -= 1
+        spikes = (self.countdown == 0) & self.active
+
+        for b in range(self.batch_size):
+            index = spikes[b].nonzero(as_tuple=True)[0]
+            if index.numel() > 0:
+                self.countdown[b, index] = self.sample(b, index)
+
+        return spikes.view(self.batch_size, *self.shape).byte()
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Restarts the spike trains from the seeds.
+        """
+        super().reset_()
+
+        device = self.interval.device
+        self.generators = [
+            torch.Generator(device=device).manual_seed(s) for s in self.seeds
+        ]
+        self.countdown = torch.stack([self.sample(b) for b in range(self.batch_size)])
+
+    def to(self, device: Union[str, torch.device]) -> "PoissonSource":
+        # language=rst
+        """
+        Moves the source to a device; it restarts on its first timestep.
+        """
+        self.active = self.active.to(device)
+        self.interval = self.interval.to(device)
+        self.generators = None
+        self.countdown = None
+        return self
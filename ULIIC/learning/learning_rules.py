@@ -20,9 +20,17 @@ from ULIIC.network.synapese import (
     Connection,
     Conv2dConnection,
     LocalConnection,
+    SparseConnection,
 )
 from ULIIC.auxiliary.snn_utils import im2col_indices
-from ULIIC.computing.cordic_exp import error_exp, conventional_cordic_exp, pipeline_cordic_exp
+from ULIIC.computing.cordic_exp import (
+    error_exp,
+    decay_factor,
+    paired_error_mask,
+    table_exp,
+    conventional_cordic_exp,
+    pipeline_cordic_exp,
+)
 
 
 class LearningRule(ABC):
@@ -47,6 +55,38 @@ class LearningRule(ABC):
         :param nu: Single or pair of learning rates for pre- and post-synaptic events, respectively.
         :param reduction: Method for reducing parameter updates along the minibatch dimension.
         :param weight_decay: Constant multiple to decay weights by on each iteration.
+
+        Keyword arguments:
+
+        :param str batch_update: Semantics of parameter updates across the minibatch dimension. ``"mean"`` averages
+            and ``"sum"`` sums per-sample updates every step. ``"sequential"`` accumulates per-sample updates during the
+            run and applies them one sample after another (with bounding and normalization in between) in
+            ``commit_batch``. This approximates presenting the samples one at a time with the weights frozen during
+            the run: every update is computed against the weights at the start of the run, weights are not bounded
+            within a sample and no sample sees the weight changes of the others. The accumulated updates take a
+            ``[batch_size, source.n, target.n]`` tensor per connection. Defaults to ``reduction``.
+        :param int bits_width: Width of the CORDIC exp unit of the error model, 8, 16, 24 or 32 (default 16).
+        :param int error_mode: Error model of ``error_exp``, 0-average offset, 1-worst offset, 2-tiny offset,
+            3-bit-accurate fixed-point emulation (default 0).
+        :param int cordic_mode: CORDIC variant of the error model, 0-control, 1-conventional, 2-angle recoding,
+            3-pipeline (default 3); the bit-accurate error model has no control variant.
+        :param float event_threshold: Fraction of spiking source (or target) neurons at or below which updates of
+            ``Connection`` weights touch only the rows (or columns) of the neurons that spiked. Updates are the same as
+            the dense ones; ``None`` (default) always updates densely.
+        :param clamp_interval: Cadence of bounding the weights to ``[wmin, wmax]``: every ``k`` timesteps (``int``,
+            default ``1``), every ``n`` runs (``(n, "sample")``, ``"sample"`` for every run) or ``"lazy"``. Lazy
+            bounding only bounds the rows and columns an update changed (everything after weight decay, normalization
+            or deferred batch updates, and when an update does not report them), which gives the same weights as
+            bounding every timestep.
+        :param decay_interval: Cadence of weight decay, an ``int`` or ``(n, "sample")`` as for ``clamp_interval``
+            (default ``1``). Decay postponed by ``j`` timesteps multiplies the weights by ``(1 - weight_decay) ^ j``
+            once, which equals per-timestep decay only for weights not updated in between.
+        :param norm_interval: Cadence of ``connection.normalize``, an ``int`` or ``(n, "sample")`` as for
+            ``clamp_interval`` (default ``"sample"``, after every run).
+
+        Bounding, decay and normalization at cadences other than the defaults (and lazy bounding) are not equivalent
+        to the defaults, as updates in between see unbounded, undecayed or unnormalized weights. Timestep cadences
+        are completed at the end of every run (see ``finish``), so weights are maintained after every run.
         """
         # Connection parameters.
         self.connection = connection
@@ -64,29 +104,362 @@ class LearningRule(ABC):
 
         self.nu = nu
 
+        # Semantics of parameter updates across minibatch dimension.
+        self.batch_update = kwargs.get("batch_update", None)
+        assert self.batch_update in (
+            None,
+            "mean",
+            "sum",
+            "sequential",
+        ), "Unknown batch update semantics: %s" % self.batch_update
+
+        if self.batch_update == "sequential" and not isinstance(
+            self, (NoOp, PostPre, ExpWeightSTDP)
+        ):
+            raise NotImplementedError(
+                "Sequential batch updates are not supported for this learning rule."
+            )
+
         # Parameter update reduction across minibatch dimension.
         if reduction is None:
-            reduction = torch.mean
+            if self.batch_update == "sum":
+                reduction = torch.sum
+            else:
+                reduction = torch.mean
 
         self.reduction = reduction
 
+        # Per-sample updates deferred to the end of the run (sequential batch updates), ``[batch_size, *w.shape]``.
+        self.deferred = None
+
         # Weight decay.
         self.weight_decay = weight_decay
 
-    def update(self) -> None:
+        # Error model of the exp unit.
+        self.neederror = kwargs.get("neederror", True)
+        self.bits_width = kwargs.get("bits_width", 16)
+        self.error_mode = kwargs.get("error_mode", 0)
+        self.cordic_mode = kwargs.get("cordic_mode", 3)
+        assert self.error_mode != 3 or self.cordic_mode in (1, 2, 3), (
+            "The bit-accurate error model has no control (0) CORDIC variant"
+        )
+
+        # Decay factors resolved by ``decay_factor``.
+        self.decays = {}
+
+        # Paired simulation, see ``set_paired``.
+        self.paired = False
+
+        # Sparse updates of rows and columns of spiking neurons.
+        self.event_threshold = kwargs.get("event_threshold", None)
+
+        # Cadences of weight maintenance, and timesteps and runs since it last ran.
+        self.schedule = {
+            "decay": self._cadence(kwargs.get("decay_interval", 1)),
+            "clamp": self._cadence(kwargs.get("clamp_interval", 1)),
+            "norm": self._cadence(kwargs.get("norm_interval", "sample")),
+        }
+        assert self.schedule["decay"][1] != "lazy" and self.schedule["norm"][1] != "lazy", (
+            "Only bounding can be lazy"
+        )
+        self.pending_steps = {kind: 0 for kind in self.schedule}
+        self.pending_runs = {kind: 0 for kind in self.schedule}
+        self.clamped = False
+
+    def set_paired(self, paired: bool = True) -> None:
         # language=rst
         """
-        Abstract method for a learning rule update.
+        Switches the rule to paired simulation (see ``Network.set_paired``): the connection holds one weight matrix
+        per half of the batch, updates are reduced over each half separately and exponentials of the second half use
+        the error model.
+
+        :param paired: Whether to simulate paired batches.
+        """
+        if paired:
+            self.check_paired()
+
+        self.paired = paired
+
+    def check_paired(self) -> None:
+        # language=rst
+        """
+        Raises ``NotImplementedError`` if the rule can not be simulated in paired mode.
+        """
+        if not isinstance(self, (NoOp, PostPre, WeightDependentPostPre, Hebbian, ExpWeightSTDP)):
+            raise NotImplementedError(
+                "Paired simulation is not supported for this learning rule."
+            )
+        if not isinstance(self.connection, Connection):
+            raise NotImplementedError(
+                "Paired simulation of learning is only supported for ``Connection`` objects."
+            )
+        if self.batch_update == "sequential":
+            raise NotImplementedError(
+                "Paired simulation does not support sequential batch updates."
+            )
+
+    def reduce(self, update: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Reduces per-sample parameter updates along the minibatch dimension; in paired mode, separately for each half
+        of the batch.
+
+        :param update: Per-sample updates of shape ``[batch_size, *w.shape]``.
+        :return: Updates of shape ``w.shape`` (``[2, *w.shape]`` in paired mode).
+        """
+        if self.paired:
+            return self.reduction(update.view(2, -1, *update.shape[1:]), dim=1)
+
+        return self.reduction(update, dim=0)
+
+    def exp(self, x: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Exponential under the error model of the learning rule.
+
+        :param x: The values to be computed; in paired mode, of shape ``[2, ...]`` or ``[batch_size, ...]``.
+        """
+        error = self.neederror
+        if self.paired:
+            error = paired_error_mask(x.size(0), x.dim(), self.neederror, x.device)
+
+        return error_exp(
+            x,
+            error=error,
+            bits_width=self.bits_width,
+            mode=self.error_mode,
+            cordic_mode=self.cordic_mode,
+        )
+
+    def decay_factor(self, tc: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Per-timestep decay factor ``exp(-dt / tc)`` under the error model of the learning rule.
+
+        The factor is resolved once and reused on later timesteps; it is looked up again only when the connection's
+        ``dt``, the error model or the time constant (reassigned or modified in place) change.
+
+        :param tc: Time constant of the decay.
+        """
+        state = (
+            self.connection.dt,
+            tc._version,
+            self.neederror,
+            self.bits_width,
+            self.error_mode,
+            self.cordic_mode,
+        )
+        entry = self.decays.get(id(tc), None)
+        if entry is not None and entry[0] is tc and entry[1] == state:
+            return entry[2]
+
+        factor = decay_factor(
+            self.connection.dt,
+            tc,
+            error=self.neederror,
+            bits_width=self.bits_width,
+            mode=self.error_mode,
+            cordic_mode=self.cordic_mode,
+        )
+        self.decays[id(tc)] = (tc, state, factor)
+        return factor
+
+    def active(self, s: torch.Tensor) -> Optional[torch.Tensor]:
+        # language=rst
         """
+        Finds the neurons that spiked in any sample, if few enough of them did for a sparse update (see
+        ``event_threshold``).
+
+        :param s: Spikes of shape ``[batch_size, n, 1]`` or ``[batch_size, 1, n]``.
+        :return: Indices of the spiking neurons, or ``None`` if the update should be dense.
+        """
+        if self.event_threshold is None or self.batch_update == "sequential":
+            return None
+
+        s = s.view(s.size(0), -1)
+        active = s.any(0).nonzero(as_tuple=True)[0]
+        if active.numel() > self.event_threshold * s.size(1):
+            return None
+
+        return active
+
+    @staticmethod
+    def _cadence(interval: Union[int, str, tuple]) -> tuple:
+        # language=rst
+        """
+        Parses a maintenance cadence into ``(n, unit)``, with unit ``"step"``, ``"sample"`` or ``"lazy"``.
+        """
+        if interval in ("sample", "lazy"):
+            return 1, interval
+
+        if isinstance(interval, int):
+            interval = (interval, "step")
+
+        n, unit = interval
+        assert int(n) >= 1 and unit in ("step", "sample"), "Unknown cadence: %s" % (interval,)
+        return int(n), unit
+
+    def update(self, **kwargs) -> None:
+        # language=rst
+        """
+        Abstract method for a learning rule update. Weight decay, bounding and normalization run when due (see
+        ``clamp_interval``, ``decay_interval`` and ``norm_interval``).
+
+        Keyword arguments:
+
+        :param tuple changed: Indices of the rows and of the columns of ``w`` changed by the update (``None`` for
+            neither), for lazy bounding. Everything is considered changed if not given.
+        """
+        for kind in self.pending_steps:
+            self.pending_steps[kind] += 1
+
         # Implement weight decay.
-        if self.weight_decay:
-            self.connection.w -= self.weight_decay * self.connection.w
+        n, unit = self.schedule["decay"]
+        decayed = unit == "step" and self.pending_steps["decay"] >= n
+        if decayed:
+            self.decay()
 
         # Bound weights.
+        n, unit = self.schedule["clamp"]
+        if unit == "lazy":
+            changed = kwargs.get("changed", None)
+            if changed is None or not self.clamped or (decayed and self.weight_decay):
+                self.clamp()
+                self.clamped = True
+            elif changed[0] is not None or changed[1] is not None:
+                self.clamp(*changed)
+        elif unit == "step" and self.pending_steps["clamp"] >= n:
+            self.clamp()
+
+        # Normalize weights.
+        n, unit = self.schedule["norm"]
+        if unit == "step" and self.pending_steps["norm"] >= n:
+            self.normalize()
+
+    def decay(self) -> None:
+        # language=rst
+        """
+        Applies the weight decay of the timesteps since it last ran.
+        """
+        steps = self.pending_steps["decay"]
+        self.pending_steps["decay"] = 0
+
+        if self.weight_decay and steps:
+            w = self.synapse_weights()
+            if steps == 1:
+                w -= self.weight_decay * w
+            else:
+                w *= (1 - self.weight_decay) ** steps
+
+    def clamp(
+        self, rows: Optional[torch.Tensor] = None, cols: Optional[torch.Tensor] = None
+    ) -> None:
+        # language=rst
+        """
+        Bounds the weights to ``[wmin, wmax]``; only the given rows and columns, if any is given.
+
+        :param rows: Indices of rows of ``w`` to bound.
+        :param cols: Indices of columns of ``w`` to bound.
+        """
+        self.pending_steps["clamp"] = 0
+
         if (
-            self.connection.wmin != -np.inf or self.connection.wmax != np.inf
-        ) and not isinstance(self, NoOp):
-            self.connection.w.clamp_(self.connection.wmin, self.connection.wmax)
+            self.connection.wmin == -np.inf and self.connection.wmax == np.inf
+        ) or isinstance(self, NoOp):
+            return
+
+        w = self.synapse_weights()
+        if rows is None and cols is None:
+            w.clamp_(self.connection.wmin, self.connection.wmax)
+            return
+
+        if rows is not None:
+            w[..., rows, :] = w[..., rows, :].clamp(self.connection.wmin, self.connection.wmax)
+        if cols is not None:
+            w[..., cols] = w[..., cols].clamp(self.connection.wmin, self.connection.wmax)
+
+    def normalize(self) -> None:
+        # language=rst
+        """
+        Normalizes the connection's weights.
+        """
+        self.pending_steps["norm"] = 0
+        self.connection.normalize()
+
+        # Normalization may move any weight out of bounds.
+        self.clamped = False
+
+    def finish(self) -> None:
+        # language=rst
+        """
+        Completes weight maintenance at the end of a run: pending timestep cadences run, and cadences of runs run
+        when due. Called by the network after ``commit_batch``.
+        """
+        for kind, (n, unit) in self.schedule.items():
+            if unit == "step":
+                due = self.pending_steps[kind] > 0 or kind == "norm"
+            elif unit == "sample":
+                self.pending_runs[kind] += 1
+                due = self.pending_runs[kind] >= n
+            else:
+                due = False
+
+            if not due:
+                continue
+
+            self.pending_runs[kind] = 0
+            if kind == "decay":
+                self.decay()
+            elif kind == "clamp":
+                if self.pending_steps["clamp"] > 0:
+                    self.clamp()
+            else:
+                self.normalize()
+
+    def synapse_weights(self) -> torch.Tensor:
+        # language=rst
+        """
+        Weights of the connection's synapses, to be updated in place: ``w``, or the values of sparse CSR weights.
+        """
+        w = self.connection.w
+        if w.layout == torch.sparse_csr:
+            w = w.values()
+
+        return w
+
+    def defer(self, update: torch.Tensor) -> None:
+        # language=rst
+        """
+        Accumulates per-sample parameter updates until ``commit_batch`` is called.
+
+        :param update: Per-sample updates of shape ``[batch_size, *w.shape]``.
+        """
+        if self.deferred is None:
+            self.deferred = update.clone()
+        else:
+            self.deferred += update
+
+    def commit_batch(self) -> None:
+        # language=rst
+        """
+        Applies deferred per-sample updates in sample order, bounding and normalizing the weights after each sample.
+        The updates were computed against the weights at the start of the run. Called by the network at the end of a
+        run.
+        """
+        if self.deferred is None:
+            return
+
+        for update in self.deferred:
+            self.connection.w += update
+
+            # Bound weights.
+            if self.connection.wmin != -np.inf or self.connection.wmax != np.inf:
+                self.connection.w.clamp_(self.connection.wmin, self.connection.wmax)
+
+            self.connection.normalize()
+
+        self.deferred = None
+        self.clamped = False
 
 
 class NoOp(LearningRule):
@@ -166,10 +539,17 @@ class PostPre(LearningRule):
             self.source.traces and self.target.traces
         ), "Both pre- and post-synaptic Neurons must record spike traces."
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if self.batch_update == "sequential" and not isinstance(connection, Connection):
+            raise NotImplementedError(
+                "Sequential batch updates are only supported for ``Connection`` objects."
+            )
+
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
+        elif isinstance(connection, (SparseConnection, LocalConnection)):
+            self.update = self._synapse_update
         else:
             raise NotImplementedError(
                 "This learning rule is not supported for this Connection type."
@@ -187,15 +567,70 @@ class PostPre(LearningRule):
         target_s = self.target.s.view(batch_size, -1).unsqueeze(1).float()
         target_x = self.target.x.view(batch_size, -1).unsqueeze(1)
 
+        if self.batch_update == "sequential":
+            # Per-sample pre- and post-synaptic updates, applied in ``commit_batch``.
+            if self.nu[0]:
+                self.defer(-self.nu[0] * torch.bmm(source_s, target_x))
+            if self.nu[1]:
+                self.defer(self.nu[1] * torch.bmm(source_x, target_s))
+
+            super().update()
+            return
+
+        # Rows and columns changed by the update, unless it is dense.
+        changed = [None, None]
+
+        # Pre-synaptic update.
+        if self.nu[0]:
+            rows = self.active(source_s)
+            if rows is None:
+                update = self.reduce(torch.bmm(source_s, target_x))
+                self.connection.w -= self.nu[0] * update
+                changed = None
+            elif rows.numel():
+                update = self.reduce(torch.bmm(source_s[:, rows], target_x))
+                self.connection.w[..., rows, :] -= self.nu[0] * update
+                changed[0] = rows
+
+        # Post-synaptic update.
+        if self.nu[1]:
+            cols = self.active(target_s)
+            if cols is None:
+                update = self.reduce(torch.bmm(source_x, target_s))
+                self.connection.w += self.nu[1] * update
+                changed = None
+            elif cols.numel():
+                update = self.reduce(torch.bmm(source_x, target_s[..., cols]))
+                self.connection.w[..., cols] += self.nu[1] * update
+                if changed is not None:
+                    changed[1] = cols
+
+        super().update(changed=None if changed is None else tuple(changed))
+
+    def _synapse_update(self, **kwargs) -> None:
+        # language=rst
+        """
+        Post-pre learning rule for ``SparseConnection`` and ``LocalConnection`` subclasses of ``AbstractConnection``
+        class, which store existing synapses only.
+        """
+        batch_size = self.source.batch_size
+
+        source_s = self.source.s.view(batch_size, -1).float()
+        source_x = self.source.x.view(batch_size, -1)
+        target_s = self.target.s.view(batch_size, -1).float()
+        target_x = self.target.x.view(batch_size, -1)
+
+        w = self.synapse_weights()
+
         # Pre-synaptic update.
         if self.nu[0]:
-            update = self.reduction(torch.bmm(source_s, target_x), dim=0)
-            self.connection.w -= self.nu[0] * update
+            update = self.reduce(self.connection.outer(source_s, target_x))
+            w -= self.nu[0] * update
 
         # Post-synaptic update.
         if self.nu[1]:
-            update = self.reduction(torch.bmm(source_x, target_s), dim=0)
-            self.connection.w += self.nu[1] * update
+            update = self.reduce(self.connection.outer(source_x, target_s))
+            w += self.nu[1] * update
 
         super().update()
 
@@ -281,10 +716,12 @@ class WeightDependentPostPre(LearningRule):
         self.wmin = connection.wmin
         self.wmax = connection.wmax
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
+        elif isinstance(connection, (SparseConnection, LocalConnection)):
+            self.update = self._synapse_update
         else:
             raise NotImplementedError(
                 "This learning rule is not supported for this Connection type."
@@ -302,22 +739,100 @@ class WeightDependentPostPre(LearningRule):
         target_s = self.target.s.view(batch_size, -1).unsqueeze(1).float()
         target_x = self.target.x.view(batch_size, -1).unsqueeze(1)
 
+        rows = self.active(source_s) if self.nu[0] else None
+        cols = self.active(target_s) if self.nu[1] else None
+        if (rows is not None or not self.nu[0]) and (cols is not None or not self.nu[1]):
+            self._sparse_connection_update(source_s, source_x, target_s, target_x, rows, cols)
+            super().update(changed=(rows, cols))
+            return
+
         update = 0
 
         # Pre-synaptic update.
         if self.nu[0]:
-            outer_product = self.reduction(torch.bmm(source_s, target_x), dim=0)
+            outer_product = self.reduce(torch.bmm(source_s, target_x))
             update -= self.nu[0] * outer_product * (self.connection.w - self.wmin)
 
         # Post-synaptic update.
         if self.nu[1]:
-            outer_product = self.reduction(torch.bmm(source_x, target_s), dim=0)
+            outer_product = self.reduce(torch.bmm(source_x, target_s))
             update += self.nu[1] * outer_product * (self.wmax - self.connection.w)
 
         self.connection.w += update
 
         super().update()
 
+    def _sparse_connection_update(
+        self,
+        source_s: torch.Tensor,
+        source_x: torch.Tensor,
+        target_s: torch.Tensor,
+        target_x: torch.Tensor,
+        rows: Optional[torch.Tensor],
+        cols: Optional[torch.Tensor],
+    ) -> None:
+        # language=rst
+        """
+        Updates only the rows of spiking source neurons and the columns of spiking target neurons of ``Connection``
+        weights, with the same arithmetic as the dense update.
+
+        :param rows: Spiking source neurons, ``None`` without pre-synaptic update.
+        :param cols: Spiking target neurons, ``None`` without post-synaptic update.
+        """
+        w = self.connection.w
+        pre, post = None, None
+
+        # Pre-synaptic update of the spiking rows.
+        if rows is not None and rows.numel():
+            outer_product = self.reduce(torch.bmm(source_s[:, rows], target_x))
+            pre = 0 - self.nu[0] * outer_product * (w[..., rows, :] - self.wmin)
+
+        # Post-synaptic update of the spiking columns.
+        if cols is not None and cols.numel():
+            outer_product = self.reduce(torch.bmm(source_x, target_s[..., cols]))
+            post = self.nu[1] * outer_product * (self.wmax - w[..., cols])
+
+        if pre is not None:
+            if post is not None:
+                # Synapses in both are updated once, with the sum of both updates.
+                pre[..., cols] += post[..., rows, :]
+                post[..., rows, :] = 0
+
+            w[..., rows, :] += pre
+
+        if post is not None:
+            w[..., cols] += post
+
+    def _synapse_update(self, **kwargs) -> None:
+        # language=rst
+        """
+        Post-pre learning rule for ``SparseConnection`` and ``LocalConnection`` subclasses of ``AbstractConnection``
+        class, which store existing synapses only.
+        """
+        batch_size = self.source.batch_size
+
+        source_s = self.source.s.view(batch_size, -1).float()
+        source_x = self.source.x.view(batch_size, -1)
+        target_s = self.target.s.view(batch_size, -1).float()
+        target_x = self.target.x.view(batch_size, -1)
+
+        w = self.synapse_weights()
+        update = 0
+
+        # Pre-synaptic update.
+        if self.nu[0]:
+            outer_product = self.reduce(self.connection.outer(source_s, target_x))
+            update -= self.nu[0] * outer_product * (w - self.wmin)
+
+        # Post-synaptic update.
+        if self.nu[1]:
+            outer_product = self.reduce(self.connection.outer(source_x, target_s))
+            update += self.nu[1] * outer_product * (self.wmax - w)
+
+        w += update
+
+        super().update()
+
     def _conv2d_connection_update(self, **kwargs) -> None:
         # language=rst
         """
@@ -411,10 +926,12 @@ class Hebbian(LearningRule):
             self.source.traces and self.target.traces
         ), "Both pre- and post-synaptic Neurons must record spike traces."
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
+        elif isinstance(connection, (SparseConnection, LocalConnection)):
+            self.update = self._synapse_update
         else:
             raise NotImplementedError(
                 "This learning rule is not supported for this Connection type."
@@ -433,15 +950,40 @@ class Hebbian(LearningRule):
         target_x = self.target.x.view(batch_size, -1).unsqueeze(1)
 
         # Pre-synaptic update.
-        update = self.reduction(torch.bmm(source_s, target_x), dim=0)
+        update = self.reduce(torch.bmm(source_s, target_x))
         self.connection.w += self.nu[0] * update
 
         # Post-synaptic update.
-        update = self.reduction(torch.bmm(source_x, target_s), dim=0)
+        update = self.reduce(torch.bmm(source_x, target_s))
         self.connection.w += self.nu[1] * update
 
         super().update()
 
+    def _synapse_update(self, **kwargs) -> None:
+        # language=rst
+        """
+        Hebbian learning rule for ``SparseConnection`` and ``LocalConnection`` subclasses of ``AbstractConnection``
+        class, which store existing synapses only.
+        """
+        batch_size = self.source.batch_size
+
+        source_s = self.source.s.view(batch_size, -1).float()
+        source_x = self.source.x.view(batch_size, -1)
+        target_s = self.target.s.view(batch_size, -1).float()
+        target_x = self.target.x.view(batch_size, -1)
+
+        w = self.synapse_weights()
+
+        # Pre-synaptic update.
+        update = self.reduce(self.connection.outer(source_s, target_x))
+        w += self.nu[0] * update
+
+        # Post-synaptic update.
+        update = self.reduce(self.connection.outer(source_x, target_s))
+        w += self.nu[1] * update
+
+        super().update()
+
     def _conv2d_connection_update(self, **kwargs) -> None:
         # language=rst
         """
@@ -513,7 +1055,7 @@ class MSTDP(LearningRule):
             **kwargs
         )
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
@@ -561,9 +1103,9 @@ class MSTDP(LearningRule):
         self.connection.w += self.nu[0] * self.reduction(update, dim=0)
 
         # Update P^+ and P^- values.
-        self.p_plus *= error_exp(-self.connection.dt / self.tc_plus, error=self.neederror)
+        self.p_plus *= self.decay_factor(self.tc_plus)
         self.p_plus += a_plus * source_s
-        self.p_minus *= error_exp(-self.connection.dt / self.tc_minus, error=self.neederror)
+        self.p_minus *= self.decay_factor(self.tc_minus)
         self.p_minus += a_minus * target_s
 
         # Calculate point eligibility value.
@@ -625,9 +1167,9 @@ class MSTDP(LearningRule):
         target_s = self.target.s.view(batch_size, out_channels, -1).float()
 
         # Update P^+ and P^- values.
-        self.p_plus *= error_exp(-self.connection.dt / self.tc_plus, error=self.neederror)
+        self.p_plus *= self.decay_factor(self.tc_plus)
         self.p_plus += a_plus * source_s
-        self.p_minus *= error_exp(-self.connection.dt / self.tc_minus, error=self.neederror)
+        self.p_minus *= self.decay_factor(self.tc_minus)
         self.p_minus += a_minus * target_s
 
         # Calculate point eligibility value.
@@ -678,7 +1220,7 @@ class MSTDPET(LearningRule):
             **kwargs
         )
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
@@ -723,7 +1265,7 @@ class MSTDPET(LearningRule):
         a_minus = torch.tensor(kwargs.get("a_minus", -1.0))
 
         # Calculate value of eligibility trace based on the value of the point eligibility value of the past timestep.
-        self.eligibility_trace *= error_exp(-self.connection.dt / self.tc_e_trace, error=self.neederror)
+        self.eligibility_trace *= self.decay_factor(self.tc_e_trace)
         self.eligibility_trace += self.eligibility / self.tc_e_trace
 
         # Compute weight update.
@@ -732,9 +1274,9 @@ class MSTDPET(LearningRule):
         )
 
         # Update P^+ and P^- values.
-        self.p_plus *= error_exp(-self.connection.dt / self.tc_plus, error=self.neederror)
+        self.p_plus *= self.decay_factor(self.tc_plus)
         self.p_plus += a_plus * source_s
-        self.p_minus *= error_exp(-self.connection.dt / self.tc_minus, error=self.neederror)
+        self.p_minus *= self.decay_factor(self.tc_minus)
         self.p_minus += a_minus * target_s
 
         # Calculate point eligibility value.
@@ -769,7 +1311,7 @@ class MSTDPET(LearningRule):
         a_minus = torch.tensor(kwargs.get("a_minus", -1.0))
 
         # Calculate value of eligibility trace based on the value of the point eligibility value of the past timestep.
-        self.eligibility_trace *= error_exp(-self.connection.dt / self.tc_e_trace, error=self.neederror)
+        self.eligibility_trace *= self.decay_factor(self.tc_e_trace)
 
         # Compute weight update.
         update = reward * self.eligibility_trace
@@ -801,9 +1343,9 @@ class MSTDPET(LearningRule):
         )
 
         # Update P^+ and P^- values.
-        self.p_plus *= error_exp(-self.connection.dt / self.tc_plus, error=self.neederror)
+        self.p_plus *= self.decay_factor(self.tc_plus)
         self.p_plus += a_plus * source_s
-        self.p_minus *= error_exp(-self.connection.dt / self.tc_minus, error=self.neederror)
+        self.p_minus *= self.decay_factor(self.tc_minus)
         self.p_minus += a_minus * target_s
 
         # Calculate point eligibility value.
@@ -862,7 +1404,7 @@ class Rmax(LearningRule):
             self.target, SRM0Neurons
         ), "R-max needs stochastically firing neurons, use SRM0Neurons."
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         else:
             raise NotImplementedError(
@@ -933,6 +1475,15 @@ class ExpWeightSTDP(LearningRule):
         :param reduction: Method for reducing parameter updates along the minibatch dimension.
         :param weight_decay: Constant multiple to decay weights by on each iteration.
         :param beta: Determines the strength of the weight dependence.
+
+        Keyword arguments:
+
+        :param float event_threshold: As for ``LearningRule``, but defaults to ``1.0``: updates of ``Connection``
+            weights are restricted to the columns of spiking target neurons, the only ones that change.
+        :param bool exp_table: Whether to look the bit-accurate (``error_mode=3``) weight-dependent exponentials up in
+            a table over the range of bounded weights (see ``table_exp``) instead of emulating the exp unit on every
+            weight. Results are unchanged (default ``False``); ranges too large to tabulate at the CORDIC width use
+            ``error_exp``.
         """
         super().__init__(
             connection=connection,
@@ -946,10 +1497,17 @@ class ExpWeightSTDP(LearningRule):
             self.source.traces and self.target.traces
         ), "Both pre- and post-synaptic nodes must record spike traces in this learning rule."
 
-        if isinstance(connection, (Connection, LocalConnection)):
+        if self.batch_update == "sequential" and not isinstance(connection, Connection):
+            raise NotImplementedError(
+                "Sequential batch updates are only supported for ``Connection`` objects."
+            )
+
+        if isinstance(connection, Connection):
             self.update = self._connection_update
         elif isinstance(connection, Conv2dConnection):
             self.update = self._conv2d_connection_update
+        elif isinstance(connection, (SparseConnection, LocalConnection)):
+            self.update = self._synapse_update
         else:
             raise NotImplementedError(
                 "This learning rule is not supported for this Connection type."
@@ -958,6 +1516,57 @@ class ExpWeightSTDP(LearningRule):
         self.beta = beta
         self.neederror = neederror
 
+        # Only the columns of spiking target neurons change, so the update is restricted to them by default.
+        self.event_threshold = kwargs.get("event_threshold", 1.0)
+
+        # Tabulated exp over the arguments reachable by bounded weights.
+        self.exp_table = kwargs.get("exp_table", False)
+        if self.exp_table:
+            assert (
+                connection.wmin != -np.inf and connection.wmax != np.inf
+            ), "Connection must define finite wmin and wmax to tabulate exp."
+
+            bounds = [
+                -beta * connection.wmin,
+                -beta * connection.wmax,
+                -beta * (connection.wmax - connection.wmin),
+                0.0,
+            ]
+            self.exp_range = (min(bounds), max(bounds))
+
+    def exp(self, x: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Exponential under the error model of the learning rule, looked up in a table over the range of the
+        weight-dependent arguments with ``exp_table``.
+
+        :param x: The values to be computed; in paired mode, of shape ``[2, ...]`` or ``[batch_size, ...]``.
+        """
+        if not self.exp_table:
+            return super().exp(x)
+
+        error = self.neederror
+        if self.paired:
+            error = paired_error_mask(x.size(0), x.dim(), self.neederror, x.device)
+
+        return table_exp(
+            x,
+            *self.exp_range,
+            error=error,
+            bits_width=self.bits_width,
+            mode=self.error_mode,
+            cordic_mode=self.cordic_mode,
+        )
+
+    def weight_update(self, outer_product: torch.Tensor, w: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Weight-dependent update of the synapses ``w`` given the outer product of pre-synaptic traces and post-synaptic
+        spikes.
+        """
+        return outer_product * self.exp(-self.beta * w) - \
+               outer_product * self.exp(-self.beta * (self.wmax - w))
+
     def _connection_update(self, **kwargs) -> None:
         # language=rst
         """
@@ -965,31 +1574,42 @@ class ExpWeightSTDP(LearningRule):
         """
         batch_size = self.source.batch_size
 
-        source_s = self.source.s.view(batch_size, -1).unsqueeze(2).float()
         source_x = self.source.x.view(batch_size, -1).unsqueeze(2)
         target_s = self.target.s.view(batch_size, -1).unsqueeze(1).float()
-        target_x = self.target.x.view(batch_size, -1).unsqueeze(1)
 
-        # # Pre-synaptic update.
-        # if self.nu[0]:
-        #     update = self.reduction(torch.bmm(source_s, target_x), dim=0)
-        #     self.connection.w -= self.nu[0] * update
-        # update = self.reduction(source_s, dim=0) * \
-        #          self.reduction(source_x, dim=0) * error_exp()()()(-self.beta * self.connection.w) - \
-        #          self.reduction(torch.bmm(source_x, target_s), dim=0) * \
-        #          error_exp()()()(-self.beta * (self.wmax - self.connection.w))
-        # self.connection.w += self.nu[0] * update
-
-        update = self.reduction(torch.bmm(source_x, target_s), dim=0) * \
-                 error_exp(-self.beta * self.connection.w, error=self.neederror) - \
-                 self.reduction(torch.bmm(source_x, target_s), dim=0) * \
-                 error_exp(-self.beta * (self.wmax - self.connection.w), error=self.neederror)
-        self.connection.w += self.nu[0] * update
+        if self.batch_update == "sequential":
+            # Per-sample updates against the weights at the start of the run, applied in ``commit_batch``.
+            update = self.weight_update(torch.bmm(source_x, target_s), self.connection.w)
+            self.defer(self.nu[0] * update)
+
+            super().update(changed=(None, None))
+            return
+
+        cols = self.active(target_s)
+        if cols is None:
+            outer_product = self.reduce(torch.bmm(source_x, target_s))
+            self.connection.w += self.nu[0] * self.weight_update(outer_product, self.connection.w)
+        elif cols.numel():
+            outer_product = self.reduce(torch.bmm(source_x, target_s[..., cols]))
+            update = self.weight_update(outer_product, self.connection.w[..., cols])
+            self.connection.w[..., cols] += self.nu[0] * update
+
+        super().update(changed=None if cols is None else (None, cols))
+
+    def _synapse_update(self, **kwargs) -> None:
+        # language=rst
+        """
+        ExpWeight learning rule for ``SparseConnection`` and ``LocalConnection`` subclasses of ``AbstractConnection``
+        class, which store existing synapses only.
+        """
+        batch_size = self.source.batch_size
+
+        source_x = self.source.x.view(batch_size, -1)
+        target_s = self.target.s.view(batch_size, -1).float()
 
-        # # Post-synaptic update.
-        # if self.nu[1]:
-        #     update = self.reduction(torch.bmm(source_x, target_s), dim=0)
-        #     self.connection.w += self.nu[1] * update
+        w = self.synapse_weights()
+        outer_product = self.reduce(self.connection.outer(source_x, target_s))
+        w += self.nu[0] * self.weight_update(outer_product, w)
 
         super().update()
 
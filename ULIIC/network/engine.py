@@ -0,0 +1,263 @@
+"""
+Author: Jiajun Wu, HUST, China
+Main Library: Pytorch
+Description: It is a library with spiking neural network. We would like to implement this NN in hardware.
+File Information: This file includes the simulation engine, which compiles a network into a flat step plan.
+Log: 2020/1/20 Build firstly
+Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
+
+"""
+
+from typing import Dict, Tuple
+
+import torch
+
+from ULIIC.network.neurons import AbstractInput
+
+
+class SimulationEngine:
+    # language=rst
+    """
+    Compiles the layer, connection and monitor graph of a ``Network`` into a flat, pre-resolved step plan.
+
+    The plan is a generated Python closure in which every layer, connection and monitor call of a timestep is written
+    out explicitly, so all ``time / dt`` steps run without dictionary lookups, ``isinstance`` checks or keyword
+    parsing per object. The operations (and their order) are exactly those of ``Network.run``, so results are
+    identical to the interpreted loop.
+
+    Plans are cached per run signature (``one_step`` and the kinds of clamps, unclamps and voltage injections used), and
+    are dropped whenever layers, connections or monitors are added to the network.
+    """
+
+    def __init__(self, network: "Network") -> None:
+        # language=rst
+        """
+        Instantiates the engine of a network.
+
+        :param network: Network to compile.
+        """
+        self.network = network
+        self.plans = {}
+
+    def __getstate__(self) -> Dict:
+        # Generated closures are not picklable; they are rebuilt on demand.
+        state = self.__dict__.copy()
+        state["plans"] = {}
+        return state
+
+    def invalidate(self) -> None:
+        # language=rst
+        """
+        Drops all compiled plans. Called by the network whenever its graph changes.
+        """
+        self.plans = {}
+
+    def run(
+        self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, **kwargs
+    ) -> None:
+        # language=rst
+        """
+        Simulate network for given inputs and time with the compiled step plan. Accepts the same arguments as
+        ``Network.run``.
+
+        :param inputs: Dictionary of ``Tensor``s of shape ``[time, *input_shape]`` or
+                      ``[batch_size, time, *input_shape]``.
+        :param time: Simulation time.
+        :param one_step: Whether to run the network in "feed-forward" mode.
+        """
+        network = self.network
+
+        # Parse keyword arguments.
+        clamps = kwargs.get("clamp", {})
+        unclamps = kwargs.get("unclamp", {})
+        masks = kwargs.get("masks", {})
+        injects_v = kwargs.get("injects_v", {})
+
+        network._prepare_run(inputs, kwargs)
+
+        # Effective number of timesteps.
+        timesteps = int(time / network.dt)
+
+        # Get input to all layers (synchronous mode).
+        if not one_step:
+            inputs.update(network._get_inputs())
+
+        plan = self._get_plan(one_step, clamps, unclamps, injects_v)
+
+        # Keyword arguments of the synapse updates are resolved once per run.
+        update_kwargs = []
+        for c in network.connections:
+            kw = dict(kwargs)
+            kw["mask"] = masks.get(c, None)
+            kw["learning"] = network.learning
+            update_kwargs.append(kw)
+
+        outputs = plan(
+            timesteps,
+            inputs,
+            clamps,
+            unclamps,
+            injects_v,
+            list(network.layers.values()),
+            list(network.connections.values()),
+            list(network.monitors.values()),
+            update_kwargs,
+            network.batch_size,
+        )
+        inputs.update(outputs)
+
+        network._finish_run()
+
+    def _get_plan(
+        self, one_step: bool, clamps: Dict, unclamps: Dict, injects_v: Dict
+    ) -> callable:
+        # language=rst
+        """
+        Fetches the compiled plan for a run signature, compiling it if necessary.
+        """
+        layers = self.network.layers
+        signature = (one_step,) + tuple(
+            (
+                self._kind(clamps.get(l, None)),
+                self._kind(unclamps.get(l, None)),
+                self._kind(injects_v.get(l, None)),
+            )
+            for l in layers
+        )
+
+        plan = self.plans.get(signature, None)
+        if plan is None:
+            plan = self._compile(signature)
+            self.plans[signature] = plan
+
+        return plan
+
+    @staticmethod
+    def _kind(value: torch.Tensor) -> int:
+        # 0: not given, 1: same for every timestep, 2: indexed by timestep.
+        if value is None:
+            return 0
+
+        return 1 if value.ndimension() == 1 else 2
+
+    def _compile(self, signature: Tuple) -> callable:
+        # language=rst
+        """
+        Generates the step plan closure for a run signature.
+
+        :param signature: ``one_step`` followed by the clamp, unclamp and injection kinds of every layer.
+        :return: Function running all timesteps and returning the final layer inputs.
+        """
+        network = self.network
+        one_step = signature[0]
+        names = list(network.layers)
+        index = {name: i for i, name in enumerate(names)}
+
+        # Incoming connections of every layer, in the order ``Network._get_inputs`` visits them.
+        incoming = {name: [] for name in names}
+        for i, c in enumerate(network.connections):
+            incoming[c[1]].append(i)
+
+        head = [
+            "def plan(timesteps, inputs, clamps, unclamps, injects_v, layers, connections, monitors, "
+            "update_kwargs, batch_size):"
+        ]
+        body = []
+
+        def compute(i, indent):
+            # Sum of source spikes multiplied by connection weights, as in ``Network._get_inputs``.
+            lines = ["x%d = zeros(shape%d, device=layer%d.s.device)" % (i, i, i)]
+            for j in incoming[names[i]]:
+                lines.append("x%d += compute%d(source%d.s)" % (i, j, j))
+
+            return [indent + line for line in lines]
+
+        for i, name in enumerate(names):
+            head.append("    layer%d = layers[%d]" % (i, i))
+            head.append("    forward%d = layer%d.forward" % (i, i))
+            if incoming[name]:
+                head.append(
+                    "    shape%d = (batch_size,) + tuple(layer%d.shape)" % (i, i)
+                )
+
+            if isinstance(network.layers[name], AbstractInput):
+                head.append("    x%d = inputs[%r]" % (i, name))
+            elif incoming[name]:
+                if one_step:
+                    head.append("    x%d = None" % i)
+                else:
+                    head.append("    x%d = inputs[%r]" % (i, name))
+            else:
+                head.append("    x%d = inputs[%r]" % (i, name))
+
+            clamp, unclamp, inject_v = signature[1 + i]
+            if clamp:
+                head.append("    clamp%d = clamps[%r]" % (i, name))
+            if unclamp:
+                head.append("    unclamp%d = unclamps[%r]" % (i, name))
+            if inject_v:
+                head.append("    inject%d = injects_v[%r]" % (i, name))
+
+        for j in range(len(network.connections)):
+            head.append("    source%d = connections[%d].source" % (j, j))
+            head.append("    compute%d = connections[%d].compute" % (j, j))
+            head.append("    update%d = connections[%d].update" % (j, j))
+            head.append("    kwargs%d = update_kwargs[%d]" % (j, j))
+
+        for k in range(len(network.monitors)):
+            head.append("    record%d = monitors[%d].record" % (k, k))
+
+        # Update each layer of neurons.
+        for i, name in enumerate(names):
+            if isinstance(network.layers[name], AbstractInput):
+                body.append("        forward%d(x=x%d[t])" % (i, i))
+            else:
+                if one_step and incoming[name]:
+                    body.extend(compute(i, "        "))
+
+                body.append("        forward%d(x=x%d)" % (i, i))
+
+            clamp, unclamp, inject_v = signature[1 + i]
+            if clamp:
+                body.append(
+                    "        layer%d.s[:, clamp%d%s] = 1" % (i, i, "" if clamp == 1 else "[t]")
+                )
+            if unclamp:
+                body.append(
+                    "        layer%d.s[unclamp%d%s] = 0" % (i, i, "" if unclamp == 1 else "[t]")
+                )
+            if inject_v:
+                body.append(
+                    "        layer%d.v += inject%d%s" % (i, i, "" if inject_v == 1 else "[t]")
+                )
+
+        # Run synapse updates.
+        for j in range(len(network.connections)):
+            body.append("        update%d(**kwargs%d)" % (j, j))
+
+        # Get input to all layers.
+        for i, name in enumerate(names):
+            if incoming[name]:
+                body.extend(compute(i, "        "))
+
+        # Record state variables of interest.
+        for k in range(len(network.monitors)):
+            body.append("        record%d()" % k)
+
+        outputs = ", ".join(
+            "%r: x%d" % (name, index[name])
+            for name in names
+            if incoming[name] and not isinstance(network.layers[name], AbstractInput)
+        )
+
+        source = "\n".join(
+            head
+            + ["    for t in range(timesteps):"]
+            + (body or ["        pass"])
+            + ["    outputs = {%s}" % outputs]
+            + ["    return {k: v for k, v in outputs.items() if v is not None}"]
+        )
+
+        namespace = {"zeros": torch.zeros}
+        exec(compile(source, "<ULIIC step plan>", "exec"), namespace)
+        return namespace["plan"]
@@ -9,12 +9,18 @@ Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
 """
 
 import os
+import json
+import queue
+import tempfile
+import threading
 import torch
 import numpy as np
 
 from abc import ABC, abstractmethod
 from typing import Union, Optional, Iterable, Dict
 
+from ULIIC.analysis.value_error import weights_error
+from ULIIC.auxiliary.spike_packing import PackedSpikes, pack_spikes
 from ULIIC.network.neurons import Neurons
 from ULIIC.network.synapese import AbstractConnection
 
@@ -26,6 +32,117 @@ class AbstractMonitor(ABC):
     """
 
 
+class RecordingBuffer:
+    # language=rst
+    """
+    Preallocated recording of a single state variable.
+
+    With a recording length ``time``, records are written in place into a mirrored ring buffer of ``2 * time`` slots
+    (every record is stored at ``i % time`` and ``i % time + time``), so the last ``time`` records are always a
+    contiguous, ordered slice of the buffer. Without a recording length, the buffer doubles its capacity whenever it is
+    full. Memory is allocated on the first record and reused after ``reset_`` as long as the recorded shape, type and
+    device do not change.
+    """
+
+    def __init__(
+        self,
+        time: Optional[int] = None,
+        dtype: Optional[torch.dtype] = None,
+        pad: bool = False,
+    ) -> None:
+        # language=rst
+        """
+        Constructs a ``RecordingBuffer`` object.
+
+        :param time: If not ``None``, number of most recent records to keep.
+        :param dtype: If not ``None``, type records are converted to while being copied.
+        :param pad: If ``True`` (requires ``time``), always return ``time`` records, with zeros before the first one.
+        """
+        self.time = time
+        self.dtype = dtype
+        self.pad = pad
+        self.buffer = None
+        self.i = 0  # Number of records written since the last reset.
+
+    def append(self, data: torch.Tensor) -> None:
+        # language=rst
+        """
+        Copies a record into the buffer.
+
+        :param data: Current value of the state variable. Sparse CSR tensors (e.g. weights of a
+                     ``SparseConnection``) are recorded by their values.
+        """
+        if data.layout == torch.sparse_csr:
+            data = data.values()
+
+        if (
+            self.buffer is None
+            or self.buffer.shape[1:] != data.shape
+            or self.buffer.dtype != (self.dtype or data.dtype)
+            or self.buffer.device != data.device
+        ):
+            self.allocate(data)
+
+        if self.time is not None:
+            j = self.i % self.time
+            self.buffer[j].copy_(data)
+            self.buffer[j + self.time].copy_(data)
+        else:
+            if self.i == self.buffer.shape[0]:
+                buffer = self.buffer.new_empty(
+                    (2 * self.buffer.shape[0],) + tuple(data.shape)
+                )
+                buffer[: self.i].copy_(self.buffer)
+                self.buffer = buffer
+
+            self.buffer[self.i].copy_(data)
+
+        self.i += 1
+
+    def allocate(self, data: torch.Tensor) -> None:
+        # language=rst
+        """
+        Allocates the buffer for records like ``data``, dropping previous records.
+
+        :param data: Example record.
+        """
+        if data.layout == torch.sparse_csr:
+            data = data.values()
+
+        length = 2 * self.time if self.time is not None else 16
+        self.buffer = torch.zeros(
+            (length,) + tuple(data.shape),
+            dtype=self.dtype or data.dtype,
+            device=data.device,
+        )
+        self.i = 0
+
+    def get(self) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the records in order without copying them. The view is only valid until the next record or reset.
+
+        :return: Tensor of shape ``[n_records, *data.shape]``.
+        """
+        if self.buffer is None:
+            return torch.empty(0)
+
+        if self.time is not None and (self.pad or self.i >= self.time):
+            start = self.i % self.time
+            return self.buffer[start : start + self.time]
+
+        return self.buffer[: self.i]
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Drops all records, keeping the allocated memory.
+        """
+        self.i = 0
+        if self.pad and self.buffer is not None:
+            self.buffer.zero_()
+
+
 class Monitor(AbstractMonitor):
     # language=rst
     """
@@ -38,6 +155,7 @@ class Monitor(AbstractMonitor):
         state_vars: Iterable[str],
         time: Optional[int] = None,
         batch_size: int = 1,
+        packed: bool = False,
     ):
         # language=rst
         """
@@ -46,6 +164,8 @@ class Monitor(AbstractMonitor):
         :param obj: An object to record state variables from during network simulation.
         :param state_vars: Iterable of strings indicating names of state variables to record.
         :param time: If not ``None``, pre-allocate memory for state variable recording.
+        :param packed: Whether to store spikes (``s``) with 1 bit per spike; ``get("s")`` then returns
+            ``PackedSpikes``.
         """
         super().__init__()
 
@@ -53,42 +173,49 @@ class Monitor(AbstractMonitor):
         self.state_vars = state_vars
         self.time = time
         self.batch_size = batch_size
+        self.packed = packed
 
-        # Deal with time later, the same underlying list is used
-        self.recording = {v: [] for v in self.state_vars}
+        # Preallocated recordings; with ``time`` set only the most recent ``time`` steps are kept.
+        self.recording = {v: RecordingBuffer(self.time) for v in self.state_vars}
 
     def get(self, var: str) -> torch.Tensor:
         # language=rst
         """
-        Return recording to user.
+        Return recording to user. The recording is a view of the monitor's buffer, valid until the next ``record`` or
+        ``reset_``; clone it to keep it.
 
         :param var: State variable recording to return.
         :return: Tensor of shape ``[time, n_1, ..., n_k]``, where ``[n_1, ..., n_k]`` is the shape of the recorded
                  state variable.
         """
-        return torch.cat(self.recording[var], 0)
+        recording = self.recording[var].get()
+        if self.packed and var == "s" and recording.dim() > 1:
+            data = getattr(self.obj, var)
+            return PackedSpikes(
+                recording, recording.shape[:-1] + data.shape[-1:], data.dtype
+            )
+
+        return recording
 
     def record(self) -> None:
         # language=rst
         """
-        Appends the current value of the recorded state variables to the recording.
+        Writes the current value of the recorded state variables to the recording.
         """
         for v in self.state_vars:
-            data = getattr(self.obj, v).unsqueeze(0)
-            self.recording[v].append(data.detach().clone())
+            data = getattr(self.obj, v).detach()
+            if self.packed and v == "s":
+                data = pack_spikes(data).data
 
-        # remove the oldest element (first in the list)
-        if self.time is not None:
-            for v in self.state_vars:
-                if len(self.recording[v]) > self.time:
-                    self.recording[v].pop(0)
+            self.recording[v].append(data)
 
     def reset_(self) -> None:
         # language=rst
         """
         Resets recordings to empty ``torch.Tensor``s.
         """
-        self.recording = {v: [] for v in self.state_vars}
+        for v in self.state_vars:
+            self.recording[v].reset_()
 
 
 class NetworkMonitor(AbstractMonitor):
@@ -130,152 +257,548 @@ class NetworkMonitor(AbstractMonitor):
         if self.time is not None:
             self.i = 0
 
-        # Initialize empty recording.
+        # Initialize recordings.
         self.recording = {k: {} for k in self.layers + self.connections}
+        for v in self.state_vars:
+            for l in self.layers:
+                if hasattr(self.network.layers[l], v):
+                    self.recording[l][v] = self._buffer(
+                        getattr(self.network.layers[l], v), torch.float
+                    )
+
+            for c in self.connections:
+                if hasattr(self.network.connections[c], v):
+                    self.recording[c][v] = self._buffer(
+                        getattr(self.network.connections[c], v)
+                    )
 
-        # If no simulation time is specified, specify 0-dimensional recordings.
-        if self.time is None:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        self.recording[l][v] = torch.Tensor()
+    def _buffer(
+        self, data: torch.Tensor, dtype: Optional[torch.dtype] = None
+    ) -> RecordingBuffer:
+        # Recordings of a fixed length cover all ``time`` steps from the start, with zeros before the first record.
+        buffer = RecordingBuffer(self.time, dtype=dtype, pad=self.time is not None)
+        if self.time is not None:
+            buffer.allocate(data)
 
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        self.recording[c][v] = torch.Tensor()
+        return buffer
 
-        # If simulation time is specified, pre-allocate recordings in memory for speed.
-        else:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        self.recording[l][v] = torch.zeros(
-                            self.time, *getattr(self.network.layers[l], v).size()
-                        )
-
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        self.recording[c][v] = torch.zeros(
-                            self.time, *getattr(self.network.connections[c], v).size()
-                        )
-
-    def get(self) -> Dict[str, Dict[str, Union[Neurons, AbstractConnection]]]:
+    def get(self) -> Dict[str, Dict[str, torch.Tensor]]:
         # language=rst
         """
-        Return entire recording to user.
+        Return entire recording to user. Recordings are views of the monitor's buffers, valid until the next
+        ``record`` or ``reset_``.
 
         :return: Dictionary of dictionary of all layers' and connections' recorded state variables.
         """
-        return self.recording
+        return {
+            o: {v: self.recording[o][v].get() for v in self.recording[o]}
+            for o in self.recording
+        }
 
     def record(self) -> None:
         # language=rst
         """
-        Appends the current value of the recorded state variables to the recording.
+        Writes the current value of the recorded state variables to the recording.
         """
-        if self.time is None:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        data = getattr(self.network.layers[l], v).unsqueeze(0).float()
-                        self.recording[l][v] = torch.cat(
-                            (self.recording[l][v], data), 0
-                        )
-
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        data = getattr(self.network.connections[c], v).unsqueeze(0)
-                        self.recording[c][v] = torch.cat(
-                            (self.recording[c][v], data), 0
-                        )
+        for v in self.state_vars:
+            for l in self.layers:
+                if v in self.recording[l]:
+                    self.recording[l][v].append(
+                        getattr(self.network.layers[l], v).detach()
+                    )
 
-        else:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        data = getattr(self.network.layers[l], v).float().unsqueeze(0)
-                        self.recording[l][v] = torch.cat(
-                            (self.recording[l][v][1:].type(data.type()), data), 0
-                        )
-
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        data = getattr(self.network.connections[c], v).unsqueeze(0)
-                        self.recording[c][v] = torch.cat(
-                            (self.recording[c][v][1:].type(data.type()), data), 0
-                        )
+            for c in self.connections:
+                if v in self.recording[c]:
+                    self.recording[c][v].append(
+                        getattr(self.network.connections[c], v).detach()
+                    )
 
+        if self.time is not None:
             self.i += 1
 
-    def save(self, path: str, fmt: str = "npz") -> None:
+    def save(self, path: str, fmt: str = "npz", packed: bool = False) -> None:
         # language=rst
         """
         Write the recording dictionary out to file.
 
         :param path: The directory to which to write the monitor's recording.
         :param fmt: Type of file to write to disk. One of ``"pickle"`` or ``"npz"``.
+        :param packed: Whether to write spikes (``s``) with 1 bit per spike. ``"pickle"`` files then hold
+            ``PackedSpikes``; ``"npz"`` files hold the packed bytes (``numpy.unpackbits(..., bitorder="little")``
+            along the last axis) with the unpacked shape stored under the same name suffixed by ``_shape``.
         """
         if not os.path.exists(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
+        recording = self.get()
+        if packed:
+            recording = {
+                o: {
+                    v: pack_spikes(recording[o][v]) if v == "s" else recording[o][v]
+                    for v in recording[o]
+                }
+                for o in recording
+            }
+
         if fmt == "npz":
             # Build a list of arrays to write to disk.
             arrays = {}
-            for o in self.recording:
-                if type(o) == tuple:
-                    arrays.update(
-                        {
-                            "_".join(["-".join(o), v]): self.recording[o][v]
-                            for v in self.recording[o]
-                        }
-                    )
-                elif type(o) == str:
-                    arrays.update(
-                        {
-                            "_".join([o, v]): self.recording[o][v]
-                            for v in self.recording[o]
-                        }
-                    )
+            for o in recording:
+                for v in recording[o]:
+                    if type(o) == tuple:
+                        name = "_".join(["-".join(o), v])
+                    elif type(o) == str:
+                        name = "_".join([o, v])
+                    else:
+                        continue
+
+                    if isinstance(recording[o][v], PackedSpikes):
+                        arrays[name] = recording[o][v].data.cpu().numpy()
+                        arrays[name + "_shape"] = np.array(recording[o][v].shape)
+                    else:
+                        arrays[name] = recording[o][v].cpu().numpy()
 
             np.savez_compressed(path, **arrays)
 
         elif fmt == "pickle":
+            # Views would serialize the whole buffers.
             with open(path, "wb") as f:
-                torch.save(self.recording, f)
+                torch.save(
+                    {o: {v: recording[o][v].clone() for v in recording[o]} for o in recording},
+                    f,
+                )
 
     def reset_(self) -> None:
         # language=rst
         """
-        Resets recordings to empty ``torch.Tensors``.
+        Resets recordings, keeping the allocated memory.
         """
-        # Reset to empty recordings
-        self.recording = {k: {} for k in self.layers + self.connections}
-
         if self.time is not None:
             self.i = 0
 
-        # If no simulation time is specified, specify 0-dimensional recordings.
-        if self.time is None:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        self.recording[l][v] = torch.Tensor()
+        for o in self.recording:
+            for v in self.recording[o]:
+                self.recording[o][v].reset_()
 
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        self.recording[c][v] = torch.Tensor()
 
-        # If simulation time is specified, pre-allocate recordings in memory for speed.
-        else:
-            for v in self.state_vars:
-                for l in self.layers:
-                    if hasattr(self.network.layers[l], v):
-                        self.recording[l][v] = torch.zeros(
-                            self.time, *getattr(self.network.layers[l], v).size()
-                        )
-
-                for c in self.connections:
-                    if hasattr(self.network.connections[c], v):
-                        self.recording[c][v] = torch.zeros(
-                            self.time, *getattr(self.network.layers[c], v).size()
-                        )
+class StreamingMonitor(AbstractMonitor):
+    # language=rst
+    """
+    Records state variables of layers and connections straight to disk, with bounded memory.
+
+    Records are collected in host memory in chunks of ``chunk_size`` timesteps. Full chunks are handed to a background
+    thread which writes every chunk to its own ``.npy`` file, ``<path>/<name>/<index>.npy`` with ``name`` as in
+    ``NetworkMonitor.save`` (e.g. ``Y_v`` or ``X-Y_w``). ``flush`` and ``close`` rewrite ``<path>/manifest.json``.
+    Files are written under temporary names and moved into place, so the manifest only ever lists complete chunks and
+    the recording up to the last ``flush`` can be read with ``load_stream`` while the run is still going. At most
+    ``max_chunks`` chunks wait for the writer; ``record`` blocks when the disk falls behind. Resetting the network
+    does not write anything: records of successive runs are appended to the same chunks.
+    """
+
+    def __init__(
+        self,
+        network: "Network",
+        path: str,
+        layers: Optional[Iterable[str]] = None,
+        connections: Optional[Iterable[str]] = None,
+        state_vars: Optional[Iterable[str]] = None,
+        chunk_size: int = 1000,
+        max_chunks: int = 4,
+    ):
+        # language=rst
+        """
+        Constructs a ``StreamingMonitor`` object.
+
+        :param network: Network to record state variables from.
+        :param path: Directory the recording is written to; an existing recording in it is appended to.
+        :param layers: Layers to record state variables from.
+        :param connections: Connections to record state variables from.
+        :param state_vars: List of strings indicating names of state variables to record.
+        :param chunk_size: Number of timesteps per chunk file.
+        :param max_chunks: Maximum number of full chunks waiting to be written.
+        """
+        super().__init__()
+
+        self.network = network
+        self.path = path
+        self.layers = layers if layers is not None else list(self.network.layers.keys())
+        self.connections = (
+            connections
+            if connections is not None
+            else list(self.network.connections.keys())
+        )
+        self.state_vars = state_vars if state_vars is not None else ("v", "s", "w")
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+        os.makedirs(self.path, exist_ok=True)
+        self.manifest = {"chunk_size": chunk_size, "arrays": {}}
+        manifest = os.path.join(self.path, "manifest.json")
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                self.manifest["arrays"] = json.load(f)["arrays"]
+
+        self._write_manifest()
+
+        # Chunks being filled, and the number of records in them.
+        self.chunks = {}
+        self.i = 0
+
+        self.queue = queue.Queue(maxsize=max_chunks)
+        self.error = None
+        self.writer = None
+
+    def __getstate__(self) -> Dict:
+        # The queue and the writer thread are not picklable; they are recreated on demand. Pending chunks are written
+        # first so that the manifest is not pickled while the writer changes it.
+        self.queue.join()
+        state = self.__dict__.copy()
+        state["queue"] = None
+        state["error"] = None
+        state["writer"] = None
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self.queue = queue.Queue(maxsize=self.max_chunks)
+
+    def _objects(self):
+        # Recorded ``(name, getter)`` pairs.
+        for v in self.state_vars:
+            for l in self.layers:
+                if hasattr(self.network.layers[l], v):
+                    yield "_".join([l, v]), (self.network.layers[l], v)
+
+            for c in self.connections:
+                if hasattr(self.network.connections[c], v):
+                    yield "_".join(["-".join(c), v]), (self.network.connections[c], v)
+
+    def record(self) -> None:
+        # language=rst
+        """
+        Copies the current value of the recorded state variables into the current chunk, handing the chunk to the
+        writer once it is full.
+        """
+        self._raise()
+
+        records = {name: getattr(obj, v).detach() for name, (obj, v) in self._objects()}
+
+        # A changed shape or type (e.g. a new batch size) starts new chunks.
+        for name, data in records.items():
+            chunk = self.chunks.get(name, None)
+            if chunk is not None and (chunk.shape[1:] != data.shape or chunk.dtype != data.dtype):
+                self._submit_all()
+                break
+
+        for name, data in records.items():
+            chunk = self.chunks.get(name, None)
+            if chunk is None:
+                chunk = torch.empty((self.chunk_size,) + tuple(data.shape), dtype=data.dtype)
+                self.chunks[name] = chunk
+
+            chunk[self.i].copy_(data)
+
+        self.i += 1
+        if self.i == self.chunk_size:
+            self._submit_all()
+
+    def _submit_all(self) -> None:
+        # Hands all chunks (filled up to ``self.i``) to the writer.
+        for name, chunk in self.chunks.items():
+            self._submit(name, chunk[: self.i])
+
+        self.chunks = {}
+        self.i = 0
+
+    def _submit(self, name: str, chunk: torch.Tensor) -> None:
+        if chunk.size(0) == 0:
+            return
+
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write, daemon=True)
+            self.writer.start()
+
+        self.queue.put((name, chunk.numpy()))
+
+    def _write(self) -> None:
+        # Writer thread: stores chunks until the ``None`` sentinel.
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+
+                if self.error is None:
+                    self._store(*item)
+            except BaseException as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _store(self, name: str, chunk: np.ndarray) -> None:
+        # language=rst
+        """
+        Writes a chunk file atomically and adds it to the manifest (written by ``flush``).
+        """
+        array = self.manifest["arrays"].setdefault(
+            name, {"dtype": chunk.dtype.str, "chunks": [], "length": 0}
+        )
+        directory = os.path.join(self.path, name)
+        os.makedirs(directory, exist_ok=True)
+
+        file_name = "%06d.npy" % len(array["chunks"])
+        self._replace(os.path.join(directory, file_name), lambda f: np.save(f, chunk))
+
+        array["chunks"].append({"file": file_name, "shape": list(chunk.shape)})
+        array["length"] += chunk.shape[0]
+
+    def _write_manifest(self) -> None:
+        manifest = json.dumps(self.manifest).encode()
+        self._replace(os.path.join(self.path, "manifest.json"), lambda f: f.write(manifest))
+
+    @staticmethod
+    def _replace(path: str, write: callable) -> None:
+        # Writes to a temporary file next to ``path``, then moves it into place.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _raise(self) -> None:
+        # Re-raises a failure of the writer thread.
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def flush(self) -> None:
+        # language=rst
+        """
+        Writes the partially filled chunks and waits until everything recorded so far is on disk, then writes the
+        manifest.
+        """
+        self._submit_all()
+        self.queue.join()
+
+        # The writer is idle: the manifest does not change while it is written.
+        self._write_manifest()
+        self._raise()
+
+    def close(self) -> None:
+        # language=rst
+        """
+        Flushes the recording and stops the writer thread.
+        """
+        self.flush()
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Does nothing: records of the next run are appended to the current chunks, which are written when full or by
+        ``flush`` and ``close``.
+        """
+        pass
+
+
+def load_stream(
+    path: str, name: Optional[str] = None, mmap: bool = False
+) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+    # language=rst
+    """
+    Loads a recording written by ``StreamingMonitor``, possibly while it is still being written; only the chunks listed
+    in the manifest (which are complete) are read.
+
+    :param path: Directory of the recording.
+    :param name: Recording to load, e.g. ``"Y_v"``; all recordings if ``None``.
+    :param mmap: Whether to memory-map the chunk files instead of reading them (their records are still concatenated).
+    :return: Array of shape ``[time, *shape]``, or dictionary from names to arrays.
+    """
+    with open(os.path.join(path, "manifest.json")) as f:
+        arrays = json.load(f)["arrays"]
+
+    def load(n: str) -> np.ndarray:
+        chunks = [
+            np.load(os.path.join(path, n, chunk["file"]), mmap_mode="r" if mmap else None)
+            for chunk in arrays[n]["chunks"]
+        ]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=arrays[n]["dtype"])
+
+    if name is not None:
+        return load(name)
+
+    return {n: load(n) for n in arrays}
+
+
+class DivergenceMonitor(AbstractMonitor):
+    # language=rst
+    """
+    Streams the divergence between the exact and the error-model halves of a paired simulation (see
+    ``Network.set_paired``) without recording state histories.
+
+    Per neuron and sample, the monitor accumulates the squared voltage differences for the NRMSD and pairs the
+    ``k``-th spikes of both halves as they occur for the spike timing error (STER), with the definitions of
+    ``nrmsd_error`` and ``spike_timing_error``. Spikes of the leading half wait for their partner in a small ring
+    buffer of spike times, which grows with the largest spike count difference. Weight errors compare the per-half
+    weights of learning connections.
+    """
+
+    def __init__(
+        self,
+        network: "Network",
+        layers: Optional[Iterable[str]] = None,
+        connections: Optional[Iterable[str]] = None,
+    ):
+        # language=rst
+        """
+        Constructs a ``DivergenceMonitor`` object.
+
+        :param network: Network simulated in paired mode.
+        :param layers: Layers to compare; all layers by default.
+        :param connections: Connections whose weights to compare; all connections by default.
+        """
+        super().__init__()
+
+        self.network = network
+        self.layers = layers if layers is not None else list(self.network.layers.keys())
+        self.connections = (
+            connections
+            if connections is not None
+            else list(self.network.connections.keys())
+        )
+
+        self.t = 0  # Number of records since the last reset.
+        self.state = {}
+
+    def _state(self, l: str, s: torch.Tensor) -> Dict[str, torch.Tensor]:
+        # Accumulators of a layer, allocated on its first record.
+        state = self.state.get(l, None)
+        if state is None:
+            n = s[: s.size(0) // 2].numel()
+            state = {
+                "count": torch.zeros(2, n, dtype=torch.long, device=s.device),
+                "times": torch.zeros(2, 8, n, dtype=torch.long, device=s.device),
+                "error": torch.zeros(n, dtype=torch.float64, device=s.device),
+                "squares": torch.zeros(n, dtype=torch.float64, device=s.device),
+            }
+            self.state[l] = state
+
+        return state
+
+    def record(self) -> None:
+        # language=rst
+        """
+        Accumulates the divergence of the current timestep.
+        """
+        assert self.network.paired, "DivergenceMonitor requires a paired simulation"
+
+        for l in self.layers:
+            layer = self.network.layers[l]
+            state = self._state(l, layer.s)
+
+            if hasattr(layer, "v"):
+                v = layer.v.detach().view(2, -1).double()
+                state["squares"] += (v[0] - v[1]) ** 2
+
+            self._pair_spikes(state, (layer.s.view(2, -1) != 0))
+
+        self.t += 1
+
+    def _pair_spikes(self, state: Dict[str, torch.Tensor], s: torch.Tensor) -> None:
+        # language=rst
+        """
+        Pairs the spikes of the current timestep with the spikes of the same rank in the other half.
+
+        :param state: Accumulators of the layer.
+        :param s: Spikes of both halves, of shape ``[2, n]``.
+        """
+        count, times = state["count"], state["times"]
+        rank = count.clone()  # Ranks of the current spikes.
+        count += s
+
+        # Unpaired spikes of the leading half must fit in the ring of spike times.
+        if (count[0] - count[1]).abs().max() > times.size(1):
+            times = self._grow(times, rank)
+            state["times"] = times
+
+        size = times.size(1)
+        for h in range(2):
+            index = s[h].nonzero(as_tuple=True)[0]
+            times[h, rank[h, index] % size, index] = self.t
+
+        # Spikes whose partner of the same rank already occurred: add ``t_error - t_exact``.
+        for h, sign in ((0, 1), (1, -1)):
+            index = (s[h] & (count[1 - h] > rank[h])).nonzero(as_tuple=True)[0]
+            if index.numel() > 0:
+                partner = times[1 - h, rank[h, index] % size, index]
+                state["error"][index] += sign * (partner - self.t).double()
+
+    @staticmethod
+    def _grow(times: torch.Tensor, count: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Doubles the ring of spike times, moving spike ``j`` from slot ``j % size`` to ``j % (2 * size)``.
+
+        :param times: Spike times of shape ``[2, size, n]``.
+        :param count: Spike counts of shape ``[2, n]``.
+        :return: Spike times of shape ``[2, 2 * size, n]``.
+        """
+        size = times.size(1)
+        slot = torch.arange(size, device=times.device).view(1, -1, 1)
+        last = count.unsqueeze(1) - 1
+        rank = last - torch.remainder(last - slot, size)
+
+        grown = torch.zeros(2, 2 * size, times.size(2), dtype=times.dtype, device=times.device)
+        return grown.scatter_(1, torch.remainder(rank, 2 * size), times)
+
+    def get(self, metric: str) -> Dict:
+        # language=rst
+        """
+        Returns the divergence accumulated since the last reset.
+
+        :param metric: ``"ster"`` (spike timing error), ``"nrmsd"`` (root-mean-square voltage difference) or
+                       ``"weights"`` (root-mean-square weight difference).
+        :return: Dictionary from layer names to tensors of shape ``[batch_size, n_1, ..., n_k]`` (of the unpaired
+                 batch size) or, for ``"weights"``, from connection names to scalar tensors.
+        """
+        if metric == "weights":
+            result = {}
+            for c in self.connections:
+                w = self.network.connections[c].w
+                if w.dim() == 3:
+                    result[c] = weights_error(w[0], w[1])
+
+            return result
+
+        assert metric in ("ster", "nrmsd"), "Unknown divergence metric: %s" % metric
+
+        result = {}
+        for l in self.layers:
+            state = self.state.get(l, None)
+            if state is None:
+                continue
+
+            layer = self.network.layers[l]
+            shape = (layer.s.size(0) // 2, *layer.shape)
+            if metric == "ster":
+                paired = state["count"].min(0)[0]
+                result[l] = (state["error"] / paired / self.t).view(shape)
+            elif hasattr(layer, "v"):
+                result[l] = ((state["squares"] / self.t) ** 0.5).view(shape)
+
+        return result
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Resets the accumulated divergence.
+        """
+        self.t = 0
+        self.state = {}
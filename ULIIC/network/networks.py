@@ -3,8 +3,11 @@ from typing import Dict, Optional, Type, Iterable
 
 import torch
 
+from ULIIC.auxiliary.spike_packing import PackedSpikes
+from ULIIC.network.engine import SimulationEngine
 from ULIIC.network.monitors import AbstractMonitor
 from ULIIC.network.neurons import AbstractInput, Neurons
+from ULIIC.network.profiler import NetworkProfiler
 from ULIIC.network.synapese import AbstractConnection
 from ULIIC.learning.reward import AbstractReward
 
@@ -86,6 +89,7 @@ class Network(torch.nn.Module):
             batch_size: int = 1,
             learning: bool = True,
             reward_fn: Optional[Type[AbstractReward]] = None,
+            compiled: bool = False,
     ) -> None:
         # language=rst
         """
@@ -94,6 +98,7 @@ class Network(torch.nn.Module):
         :param dt: Simulation timestep.
         :param learning: Whether to allow connection updates. True by default.
         :param reward_fn: Optional class allowing for modification of reward in case of reward-modulated learning.
+        :param compiled: Whether to simulate with a compiled step plan (see ``compile_run``).
         """
         super().__init__()
 
@@ -103,6 +108,7 @@ class Network(torch.nn.Module):
         self.layers = {}
         self.connections = {}
         self.monitors = {}
+        self.paired = False
         self.train(learning)
 
         if reward_fn is not None:
@@ -110,6 +116,9 @@ class Network(torch.nn.Module):
         else:
             self.reward_fn = None
 
+        self.engine = None
+        self.compile_run(compiled)
+
     def add_layer(self, layer: Neurons, name: str) -> None:
         # language=rst
         """
@@ -123,8 +132,12 @@ class Network(torch.nn.Module):
 
         layer.train(self.learning)
         layer.compute_decays(self.dt)
+        layer.set_paired(self.paired)
         layer.set_batch_size(self.batch_size)
 
+        if self.engine is not None:
+            self.engine.invalidate()
+
     def add_connection(
             self, connection: AbstractConnection, source: str, target: str
     ) -> None:
@@ -141,6 +154,10 @@ class Network(torch.nn.Module):
 
         connection.dt = self.dt
         connection.train(self.learning)
+        connection.set_paired(self.paired)
+
+        if self.engine is not None:
+            self.engine.invalidate()
 
     def add_monitor(self, monitor: AbstractMonitor, name: str) -> None:
         # language=rst
@@ -154,6 +171,94 @@ class Network(torch.nn.Module):
         monitor.network = self
         monitor.dt = self.dt
 
+        if self.engine is not None:
+            self.engine.invalidate()
+
+    def profile(self, synchronize: Optional[bool] = None) -> NetworkProfiler:
+        # language=rst
+        """
+        Returns a profiler of the network's simulation, to be used as a context manager around ``run``. Nothing is
+        measured (or slowed down) outside of it.
+
+        :param synchronize: Whether to synchronize the CUDA device around every profiled call. Defaults to ``True``
+                            on CUDA.
+        :return: ``NetworkProfiler`` of the network.
+        """
+        return NetworkProfiler(self, synchronize=synchronize)
+
+    def compile_run(self, compiled: bool = True) -> None:
+        # language=rst
+        """
+        Switches ``run`` to a compiled step plan. The layer, connection and monitor graph is compiled once into a flat
+        closure which runs all timesteps without per-object Python dispatch, giving the same results as the
+        interpreted loop.
+
+        :param compiled: Whether to use the compiled step plan.
+        """
+        if compiled:
+            if self.engine is None:
+                self.engine = SimulationEngine(self)
+        else:
+            self.engine = None
+
+    def set_paired(self, paired: bool = True) -> None:
+        # language=rst
+        """
+        Switches to paired simulation: every sample is simulated twice in lockstep, exactly (``neederror=False``) in
+        the first half of the batch and under the error model of each layer and learning rule in the second half. Both
+        halves share the input spikes passed to ``run`` (of the unpaired batch size) and the connection computations
+        driven by input layers; learning ``Connection`` objects keep one weight matrix per half, stacked into ``w`` of
+        shape ``[2, source.n, target.n]``. Layer states and monitor recordings have the doubled batch size;
+        ``DivergenceMonitor`` compares both halves online.
+
+        Learning layers with adaptive thresholds, and learning rules other than ``PostPre``, ``WeightDependentPostPre``,
+        ``Hebbian`` and ``ExpWeightSTDP``, are not supported.
+
+        :param paired: Whether to simulate paired batches.
+        """
+        if paired == self.paired:
+            return
+
+        # Everything is checked before anything is switched.
+        self._check_paired(paired)
+        self.paired = paired
+
+        for l in self.layers:
+            self.layers[l].set_paired(paired)
+
+        for c in self.connections:
+            self.connections[c].set_paired(paired)
+
+        if paired:
+            self.batch_size *= 2
+        else:
+            self.batch_size //= 2
+
+        for l in self.layers:
+            self.layers[l].set_batch_size(self.batch_size)
+
+        for m in self.monitors:
+            self.monitors[m].reset_()
+
+        if self.engine is not None:
+            self.engine.invalidate()
+
+    def _check_paired(self, paired: Optional[bool] = None) -> None:
+        # Raises if the network can not be simulated in paired mode (``self.paired`` by default).
+        if not (self.paired if paired is None else paired):
+            return
+
+        # Adaptive thresholds are shared by the whole batch, so they can not learn separately for each half.
+        if self.learning:
+            for l in self.layers:
+                if hasattr(self.layers[l], "theta") and self.layers[l].learning:
+                    raise NotImplementedError(
+                        "Paired simulation of learning adaptive thresholds is not supported."
+                    )
+
+        for c in self.connections:
+            self.connections[c].check_paired()
+
     def save(self, file_name: str) -> None:
         # language=rst
         """
@@ -231,6 +336,69 @@ class Network(torch.nn.Module):
 
         return inputs
 
+    def _prepare_run(self, inputs: Dict[str, torch.Tensor], kwargs: Dict) -> None:
+        # language=rst
+        """
+        Computes reward and sets the batch size from the inputs before a simulation run.
+
+        :param inputs: Dictionary of input ``Tensor``s (or ``PackedSpikes``, which are unpacked, or lazy sources such
+                       as ``PoissonSource``, which generate their spikes timestep by timestep); tensors are reshaped in
+                       place to ``[time, batch, *input_shape]``.
+        :param kwargs: Keyword arguments of the run; the computed reward is stored in place.
+        """
+        # Compute reward.
+        if self.reward_fn is not None:
+            kwargs["reward"] = self.reward_fn.compute(**kwargs)
+
+        # Unpack bit-packed spike inputs.
+        for key in inputs:
+            if isinstance(inputs[key], PackedSpikes):
+                inputs[key] = inputs[key].unpack()
+
+        # Dynamic setting of batch size.
+        if inputs != {}:
+            for key in inputs:
+                # goal shape is [time, batch, n_0, ...]
+                if len(inputs[key].size()) == 1:
+                    # current shape is [n_0, ...]
+                    # unsqueeze twice to make [1, 1, n_0, ...]
+                    inputs[key] = inputs[key].unsqueeze(0).unsqueeze(0)
+                elif len(inputs[key].size()) == 2:
+                    # current shape is [time, n_0, ...]
+                    # unsqueeze dim 1 so that we have
+                    # [time, 1, n_0, ...]
+                    inputs[key] = inputs[key].unsqueeze(1)
+
+            for key in inputs:
+                # batch dimension is 1, grab this and use for batch size (doubled in paired mode)
+                batch_size = inputs[key].size(1) * (2 if self.paired else 1)
+                if batch_size != self.batch_size:
+                    self.batch_size = batch_size
+
+                    for l in self.layers:
+                        self.layers[l].set_batch_size(self.batch_size)
+
+                    for m in self.monitors:
+                        self.monitors[m].reset_()
+
+                break
+
+    def _finish_run(self) -> None:
+        # language=rst
+        """
+        Post-processing after a simulation run.
+        """
+        # Apply parameter updates deferred over the mini-batch.
+        for l in self.layers:
+            self.layers[l].commit_batch()
+
+        for c in self.connections:
+            self.connections[c].update_rule.commit_batch()
+
+        # Complete weight maintenance (re-normalize connections).
+        for c in self.connections:
+            self.connections[c].update_rule.finish()
+
     def run(
             self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, **kwargs
     ) -> None:
@@ -291,42 +459,16 @@ class Network(torch.nn.Module):
             plt.title('Input spiking')
             plt.show()
         """
+        if self.engine is not None:
+            return self.engine.run(inputs, time, one_step=one_step, **kwargs)
+
         # Parse keyword arguments.
         clamps = kwargs.get("clamp", {})
         unclamps = kwargs.get("unclamp", {})
         masks = kwargs.get("masks", {})
         injects_v = kwargs.get("injects_v", {})
 
-        # Compute reward.
-        if self.reward_fn is not None:
-            kwargs["reward"] = self.reward_fn.compute(**kwargs)
-
-        # Dynamic setting of batch size.
-        if inputs != {}:
-            for key in inputs:
-                # goal shape is [time, batch, n_0, ...]
-                if len(inputs[key].size()) == 1:
-                    # current shape is [n_0, ...]
-                    # unsqueeze twice to make [1, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(0).unsqueeze(0)
-                elif len(inputs[key].size()) == 2:
-                    # current shape is [time, n_0, ...]
-                    # unsqueeze dim 1 so that we have
-                    # [time, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(1)
-
-            for key in inputs:
-                # batch dimension is 1, grab this and use for batch size
-                if inputs[key].size(1) != self.batch_size:
-                    self.batch_size = inputs[key].size(1)
-
-                    for l in self.layers:
-                        self.layers[l].set_batch_size(self.batch_size)
-
-                    for m in self.monitors:
-                        self.monitors[m].reset_()
-
-                break
+        self._prepare_run(inputs, kwargs)
 
         # Effective number of timesteps.
         timesteps = int(time / self.dt)
@@ -386,9 +528,7 @@ class Network(torch.nn.Module):
             for m in self.monitors:
                 self.monitors[m].record()
 
-        # Re-normalize connections.
-        for c in self.connections:
-            self.connections[c].normalize()
+        self._finish_run()
 
     def reset_(self) -> None:
         # language=rst
@@ -413,4 +553,6 @@ class Network(torch.nn.Module):
         :return: ``self`` as specified in ``torch.nn.Module``.
         """
         self.learning = mode
-        return super().train(mode)
+        module = super().train(mode)
+        self._check_paired()
+        return module
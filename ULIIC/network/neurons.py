@@ -15,15 +15,30 @@ from typing import Iterable, Optional, Union
 
 import torch
 import torch.nn
-from ULIIC.computing.cordic_exp import error_exp
+from ULIIC.computing.cordic_exp import error_exp, decay_factor, paired_error_mask
+from ULIIC.auxiliary.snn_utils import all_but_self
 
 
 class Neurons(torch.nn.Module):
     # language=rst
     """
     Abstract base class for groups of neurons.
+
+    With ``inplace=True``, every simulation step updates the state variables in place and computes intermediate
+    results in scratch buffers preallocated by ``set_batch_size``, so that a steady-state step allocates no memory.
+    The results are identical to the default mode. Spikes are then a persistent tensor of type ``spike_dtype``. The
+    error model exponentials (escape noise of ``SRM0Neurons`` and ``SoftMaxNeurons``) and spike-dependent steps (the
+    single spike selection of ``DiehlAndCookNeurons``, inter-columnar inputs of ``IzhikevichNeurons``) still allocate
+    temporaries.
+
+    With ``compact=True``, the state takes less memory per neuron: refractory periods are counted down in whole
+    timesteps (``ceil(refrac / dt)``, identical to the default mode when ``refrac`` is a multiple of ``dt``) by
+    ``int16`` counters, spikes are kept in persistent ``bool`` (``uint8`` for ``Input``) buffers by the in-place mode,
+    and voltages may be stored in half precision with ``voltage_dtype``.
     """
 
+    spike_dtype = torch.bool  # Type of the spike occurrences in in-place mode.
+
     def __init__(
         self,
         n: Optional[int] = None,
@@ -50,6 +65,20 @@ class Neurons(torch.nn.Module):
         :param trace_scale: Scaling factor for spike trace.
         :param sum_input: Whether to sum all inputs.
         :param learning: Whether to be in learning or testing.
+
+        Keyword arguments:
+
+        :param int bits_width: Width of the CORDIC exp unit of the error model, 8, 16, 24 or 32 (default 16).
+        :param int error_mode: Error model of ``error_exp``, 0-average offset, 1-worst offset, 2-tiny offset,
+            3-bit-accurate fixed-point emulation (default 0).
+        :param int cordic_mode: CORDIC variant of the error model, 0-control, 1-conventional, 2-angle recoding,
+            3-pipeline (default 3); the bit-accurate error model has no control variant.
+        :param bool inplace: Whether to update the state in place, using preallocated scratch buffers (default
+            ``False``).
+        :param bool compact: Whether to use the compact state layout, with ``int16`` refractory counters in whole
+            timesteps and persistent spike buffers; implies ``inplace`` (default ``False``).
+        :param torch.dtype voltage_dtype: Type of the neuron voltages, e.g. ``torch.float16`` or ``torch.bfloat16``
+            (default ``torch.float``).
         """
         super().__init__()
 
@@ -99,6 +128,35 @@ class Neurons(torch.nn.Module):
         self.learning = learning
         self.neederror = neederror
 
+        # Error model of the exp unit.
+        self.bits_width = kwargs.get("bits_width", 16)
+        self.error_mode = kwargs.get("error_mode", 0)
+        self.cordic_mode = kwargs.get("cordic_mode", 3)
+        assert self.error_mode != 3 or self.cordic_mode in (1, 2, 3), (
+            "The bit-accurate error model has no control (0) CORDIC variant"
+        )
+
+        # Paired simulation, see ``set_paired``.
+        self.paired = False
+
+        # Compact state layout.
+        self.compact = kwargs.get("compact", False)
+        self.voltage_dtype = kwargs.get("voltage_dtype", torch.float)
+        self.refrac_dtype = torch.int16 if self.compact else torch.float
+
+        # In-place simulation steps.
+        self.inplace = kwargs.get("inplace", False) or self.compact
+        if self.inplace:
+            self.register_buffer(
+                "mask", torch.BoolTensor(), persistent=False
+            )  # Scratch comparisons.
+            self.register_buffer(
+                "scratch", torch.FloatTensor(), persistent=False
+            )  # Scratch values.
+            self.register_buffer(
+                "count", torch.FloatTensor(), persistent=False
+            )  # Scratch spike counts over the batch.
+
     @abstractmethod
     def forward(self, x: torch.Tensor) -> None:
         # language=rst
@@ -111,14 +169,26 @@ class Neurons(torch.nn.Module):
             # Decay and set spike traces.
             # self.x *= self.trace_decay
 
-            if self.traces_additive:
+            if self.inplace:
+                if self.traces_additive:
+                    self.scratch.copy_(self.s).mul_(self.trace_scale)
+                    self.x += self.scratch
+                else:
+                    self.x.masked_fill_(self._spiked(), 1)
+            elif self.traces_additive:
                 self.x += self.trace_scale * self.s.float()
             else:
                 self.x.masked_fill_(self.s != 0, 1)
 
         if self.sum_input:
             # Add current input to running sum.
-            self.summed += x.float()
+            if self.inplace and x.size(0) != self.batch_size:
+                # Inputs shared by both halves of a paired batch.
+                self.summed.view(2, -1, *self.shape).add_(x)
+            elif self.inplace:
+                self.summed.add_(x)
+            else:
+                self.summed += x.float()
 
     def reset_(self) -> None:
         # language=rst
@@ -133,15 +203,221 @@ class Neurons(torch.nn.Module):
         if self.sum_input:
             self.summed.zero_()  # Summed inputs.
 
+    def commit_batch(self) -> None:
+        # language=rst
+        """
+        Applies parameter updates deferred over a mini-batch. Called by the network at the end of a run.
+        """
+        pass
+
+    def exp(self, x: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Exponential under the error model of the layer.
+
+        :param x: The values to be computed; in paired mode, of shape ``[batch_size, ...]``.
+        """
+        error = self.neederror
+        if self.paired:
+            error = paired_error_mask(x.size(0), x.dim(), self.neederror, x.device)
+
+        return error_exp(
+            x,
+            error=error,
+            bits_width=self.bits_width,
+            mode=self.error_mode,
+            cordic_mode=self.cordic_mode,
+        )
+
+    def decay_factor(self, tc: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Per-timestep decay factor ``exp(-dt / tc)`` under the error model of the layer, computed once per set of
+        parameters through the decay cache (the layer gets its own copy).
+
+        In paired mode, the factor has a leading batch dimension selecting the exact factor for the first half of the
+        batch and the factor under the error model for the second half.
+
+        :param tc: Time constant(s) of the decay.
+        """
+        factor = decay_factor(
+            self.dt,
+            tc,
+            error=self.neederror,
+            bits_width=self.bits_width,
+            mode=self.error_mode,
+            cordic_mode=self.cordic_mode,
+        )
+
+        if self.paired:
+            exact = decay_factor(self.dt, tc, error=False)
+            mask = paired_error_mask(
+                self.batch_size, 1 + len(self.shape), self.neederror, self.s.device
+            )
+            factor = torch.where(mask, factor, exact)
+
+        return factor
+
+    def _decay(
+        self, v: torch.Tensor, decay: torch.Tensor, rest: torch.Tensor
+    ) -> torch.Tensor:
+        # language=rst
+        """
+        Decays state variables towards their rest value, ``decay * (v - rest) + rest``.
+
+        :param v: State variables, overwritten in in-place mode.
+        :param decay: Per-timestep decay factor.
+        :param rest: Rest value.
+        :return: Decayed state variables.
+        """
+        if self.inplace:
+            return v.sub_(rest).mul_(decay).add_(rest)
+
+        return decay * (v - rest) + rest
+
+    def _gate(
+        self, x: torch.Tensor, scale: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        # language=rst
+        """
+        Inputs of the neurons which are not refractory, ``(refrac_count == 0).float() * scale * x``.
+
+        :param x: Inputs to the layer.
+        :param scale: Optional scaling factor of the inputs.
+        :return: Gated inputs; the scratch buffer in in-place mode.
+        """
+        if not self.inplace:
+            if scale is None:
+                return (self.refrac_count == 0).float() * x
+
+            return (self.refrac_count == 0).float() * scale * x
+
+        torch.eq(self.refrac_count, 0, out=self.mask)
+        self.scratch.copy_(self.mask)
+        if scale is not None:
+            self.scratch *= scale
+
+        return self.scratch.mul_(x)
+
+    def _refractory(self) -> torch.Tensor:
+        # language=rst
+        """
+        Decrements the refractory counters, ``(refrac_count > 0).float() * (refrac_count - dt)``, or by one step in
+        the compact layout.
+
+        :return: Decremented refractory counters.
+        """
+        if self.compact:
+            return self.refrac_count.sub_(1).clamp_(min=0)
+
+        if self.inplace:
+            torch.gt(self.refrac_count, 0, out=self.mask)
+            self.scratch.copy_(self.mask)
+            return self.refrac_count.sub_(self.dt).mul_(self.scratch)
+
+        return (self.refrac_count > 0).float() * (self.refrac_count - self.dt)
+
+    def _start_refractory(self) -> None:
+        # language=rst
+        """
+        Starts the refractory periods of the spiking neurons, ``refrac_count.masked_fill_(s, refrac)``.
+        """
+        if self.compact:
+            self.refrac_count.masked_fill_(self.s, self.refrac_steps)
+        else:
+            self.refrac_count.masked_fill_(self.s, self.refrac)
+
+    def _threshold(
+        self, v: torch.Tensor, thresh: torch.Tensor, *theta: torch.Tensor
+    ) -> torch.Tensor:
+        # language=rst
+        """
+        Checks for spiking neurons, ``v >= thresh + theta[0] + ...``.
+
+        :param v: Neuron voltages.
+        :param thresh: Spike threshold voltage.
+        :param theta: Adaptive thresholds added to ``thresh``.
+        :return: Spike occurrences; the spike buffer in in-place mode.
+        """
+        if not self.inplace:
+            for t in theta:
+                thresh = thresh + t
+
+            return v >= thresh
+
+        if theta:
+            self.scratch.copy_(thresh)
+            for t in theta:
+                self.scratch += t
+
+            thresh = self.scratch
+
+        return torch.ge(v, thresh, out=self.s)
+
+    def _clip(self, v: torch.Tensor, lbound: float) -> None:
+        # language=rst
+        """
+        Clips state variables to a lower bound.
+
+        :param v: State variables, clipped in place.
+        :param lbound: Lower bound.
+        """
+        if self.inplace:
+            torch.lt(v, lbound, out=self.mask)
+            v.masked_fill_(self.mask, lbound)
+        else:
+            v.masked_fill_(v < lbound, lbound)
+
+    def _adapt(self, theta: torch.Tensor, reduce: Optional[str] = None) -> None:
+        # language=rst
+        """
+        Increases adaptive thresholds after spiking, ``theta += theta_plus * s.float().sum(0)``.
+
+        :param theta: Adaptive thresholds, updated in place.
+        :param reduce: Reduction of the spikes over the batch, ``"sum"``, ``"mean"`` or ``None`` for per-sample
+            thresholds.
+        """
+        if not self.inplace:
+            s = self.s.float()
+            if reduce == "sum":
+                s = s.sum(0)
+            elif reduce == "mean":
+                s = s.mean(0)
+
+            theta += self.theta_plus * s
+            return
+
+        s = self.scratch.copy_(self.s)
+        if reduce == "sum":
+            s = torch.sum(s, 0, out=self.count)
+        elif reduce == "mean":
+            s = torch.mean(s, 0, out=self.count)
+
+        theta += s.mul_(self.theta_plus)
+
+    def _spiked(self) -> torch.Tensor:
+        # language=rst
+        """
+        Boolean spike occurrences, in the mask buffer unless the spikes are boolean already.
+        """
+        if self.s.dtype == torch.bool:
+            return self.s
+
+        return torch.ne(self.s, 0, out=self.mask)
+
     def compute_decays(self, dt) -> None:
         # language=rst
         """
         Abstract base class method for setting decays.
         """
         self.dt = dt
+        if self.compact and hasattr(self, "refrac"):
+            # Refractory period in whole timesteps.
+            self.refrac_steps = torch.ceil(self.refrac / dt).to(torch.int16)
+
         if self.traces:
-            self.trace_decay = error_exp(
-                -self.dt / self.tc_trace, error=self.neederror
+            self.trace_decay = self.decay_factor(
+                self.tc_trace
             )  # Spike trace decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -152,7 +428,15 @@ class Neurons(torch.nn.Module):
         :param batch_size: Mini-batch size.
         """
         self.batch_size = batch_size
-        self.s = torch.zeros(batch_size, *self.shape, device=self.s.device)
+        if self.inplace:
+            self.s = torch.zeros(
+                batch_size, *self.shape, dtype=self.spike_dtype, device=self.s.device
+            )
+            self.mask = torch.zeros_like(self.s, dtype=torch.bool)
+            self.scratch = torch.zeros_like(self.s, dtype=torch.float)
+            self.count = torch.zeros(*self.shape, device=self.s.device)
+        else:
+            self.s = torch.zeros(batch_size, *self.shape, device=self.s.device)
 
         if self.traces:
             self.x = torch.zeros(batch_size, *self.shape, device=self.x.device)
@@ -162,6 +446,23 @@ class Neurons(torch.nn.Module):
                 batch_size, *self.shape, device=self.summed.device
             )
 
+        # Paired decays depend on the batch size.
+        if self.paired and self.dt is not None:
+            self.compute_decays(self.dt)
+
+    def set_paired(self, paired: bool = True) -> None:
+        # language=rst
+        """
+        Switches the layer to paired simulation, where the first half of the batch is simulated exactly and the second
+        half under the error model of the layer (if ``neederror``). Called by ``Network.set_paired``, which also sets
+        the (doubled) batch size.
+
+        :param paired: Whether to simulate paired batches.
+        """
+        self.paired = paired
+        if self.dt is not None:
+            self.compute_decays(self.dt)
+
     def train(self, mode: bool = True) -> "Neurons":
         # language=rst
         """
@@ -187,6 +488,8 @@ class Input(Neurons, AbstractInput):
     Layer of nodes with user-specified spiking behavior.
     """
 
+    spike_dtype = torch.uint8
+
     def __init__(
         self,
         n: Optional[int] = None,
@@ -218,6 +521,7 @@ class Input(Neurons, AbstractInput):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
     def forward(self, x: torch.Tensor) -> None:
@@ -225,8 +529,21 @@ class Input(Neurons, AbstractInput):
         """
         On each simulation step, set the spikes of the population equal to the inputs.
 
-        :param x: Inputs to the layer.
+        :param x: Inputs to the layer. In paired mode, inputs of half the batch size are shared by both halves.
         """
+        if self.inplace:
+            # Set spike occurrences to input values, shared by both halves of a paired batch.
+            if x.size(0) != self.batch_size:
+                self.s.view(2, -1, *self.shape).copy_(x)
+            else:
+                self.s.copy_(x)
+
+            super().forward(x)
+            return
+
+        if self.paired and x.size(0) != self.batch_size:
+            x = torch.cat((x, x))
+
         # Set spike occurrences to input values.
         self.s = x.byte()
 
@@ -246,6 +563,8 @@ class RealInput(Neurons, AbstractInput):
     Layer of nodes with user-specified real-valued outputs.
     """
 
+    spike_dtype = torch.float
+
     def __init__(
         self,
         n: Optional[int] = None,
@@ -277,6 +596,7 @@ class RealInput(Neurons, AbstractInput):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
     def forward(self, x: torch.Tensor) -> None:
@@ -284,8 +604,22 @@ class RealInput(Neurons, AbstractInput):
         """
         On each simulation step, set the outputs of the population equal to the inputs.
 
-        :param x: Inputs to the layer.
+        :param x: Inputs to the layer. In paired mode, inputs of half the batch size are shared by both halves.
         """
+        if self.inplace:
+            # Set outputs to input values, shared by both halves of a paired batch.
+            if x.size(0) != self.batch_size:
+                self.s.view(2, -1, *self.shape).copy_(x)
+            else:
+                self.s.copy_(x)
+
+            self.s *= self.dt
+            super().forward(x)
+            return
+
+        if self.paired and x.size(0) != self.batch_size:
+            x = torch.cat((x, x))
+
         # Set spike occurrences to input values.
         self.s = self.dt * x
 
@@ -341,6 +675,7 @@ class McCullochPitts(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer(
@@ -355,8 +690,11 @@ class McCullochPitts(Neurons):
 
         :param x: Inputs to the layer.
         """
-        self.v = x  # Voltages are equal to the inputs.
-        self.s = self.v >= self.thresh  # Check for spiking neurons.
+        if self.inplace:
+            self.v.copy_(x)  # Voltages are equal to the inputs.
+        else:
+            self.v = x  # Voltages are equal to the inputs.
+        self.s = self._threshold(self.v, self.thresh)  # Check for spiking neurons.
 
         super().forward(x)
 
@@ -375,7 +713,9 @@ class McCullochPitts(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = torch.zeros(batch_size, *self.shape, device=self.v.device)
+        self.v = torch.zeros(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
 
 
 class IFNeurons(Neurons):
@@ -425,6 +765,7 @@ class IFNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer(
@@ -451,23 +792,21 @@ class IFNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Integrate input voltages.
-        self.v += (self.refrac_count == 0).float() * x
+        self.v += self._gate(x)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh
+        self.s = self._threshold(self.v, self.thresh)
 
         # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
 
@@ -488,8 +827,12 @@ class IFNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.reset * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.reset * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
 
 
 class LIFNeurons(Neurons):
@@ -544,6 +887,7 @@ class LIFNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer(
@@ -579,26 +923,24 @@ class LIFNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Decay voltages.
-        self.v = self.decay * (self.v - self.rest) + self.rest
+        self.v = self._decay(self.v, self.decay, self.rest)
 
         # Integrate inputs.
-        self.v += (self.refrac_count == 0).float() * x
+        self.v += self._gate(x)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh
+        self.s = self._threshold(self.v, self.thresh)
 
         # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
         # print(self.v)
@@ -618,8 +960,8 @@ class LIFNeurons(Neurons):
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -630,8 +972,12 @@ class LIFNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
 
 
 class CurrentLIFNeurons(Neurons):
@@ -688,6 +1034,7 @@ class CurrentLIFNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -725,28 +1072,26 @@ class CurrentLIFNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Decay voltages and current.
-        self.v = self.decay * (self.v - self.rest) + self.rest
+        self.v = self._decay(self.v, self.decay, self.rest)
         self.i *= self.i_decay
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Integrate inputs.
         self.i += x
-        self.v += (self.refrac_count == 0).float() * self.i
+        self.v += self._gate(self.i)
 
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh
+        self.s = self._threshold(self.v, self.thresh)
 
         # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
 
@@ -766,11 +1111,11 @@ class CurrentLIFNeurons(Neurons):
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
-        self.i_decay = error_exp(
-            -self.dt / self.tc_i_decay, error=self.neederror
+        self.i_decay = self.decay_factor(
+            self.tc_i_decay
         )  # Synaptic input current decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -781,9 +1126,13 @@ class CurrentLIFNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.i = torch.zeros_like(self.v, device=self.i.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.i = torch.zeros_like(self.v, dtype=torch.float, device=self.i.device)
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
 
 
 class AdaptiveLIFNeurons(Neurons):
@@ -842,6 +1191,7 @@ class AdaptiveLIFNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -881,30 +1231,28 @@ class AdaptiveLIFNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Decay voltages and adaptive thresholds.
-        self.v = self.decay * (self.v - self.rest) + self.rest
+        self.v = self._decay(self.v, self.decay, self.rest)
         if self.learning:
             self.theta *= self.theta_decay
 
         # Integrate inputs.
-        self.v += (self.refrac_count == 0).float() * x
+        self.v += self._gate(x)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh + self.theta
+        self.s = self._threshold(self.v, self.thresh, self.theta)
 
         # Refractoriness, voltage reset, and adaptive thresholds.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
         if self.learning:
-            self.theta += self.theta_plus * self.s.float().sum(0)
+            self._adapt(self.theta, "sum")
 
         # voltage clipping to lowerbound
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
 
@@ -923,11 +1271,11 @@ class AdaptiveLIFNeurons(Neurons):
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
-        self.theta_decay = error_exp(
-            -self.dt / self.tc_theta_decay, error=self.neederror
+        self.theta_decay = self.decay_factor(
+            self.tc_theta_decay
         )  # Adaptive threshold decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -938,8 +1286,12 @@ class AdaptiveLIFNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
 
 
 class DiehlAndCookNeurons(Neurons):
@@ -968,6 +1320,8 @@ class DiehlAndCookNeurons(Neurons):
         tc_theta_decay: Union[float, torch.Tensor] = 1e7,
         lbound: float = None,
         one_spike: bool = True,
+        batch_update: str = "sum",
+        lateral_inhibition: Optional[float] = None,
         **kwargs,
     ) -> None:
         # language=rst
@@ -990,6 +1344,14 @@ class DiehlAndCookNeurons(Neurons):
         :param tc_theta_decay: Time constant of adaptive threshold decay.
         :param lbound: Lower bound of the voltage.
         :param one_spike: Whether to allow only one spike per timestep.
+        :param batch_update: Semantics of adaptive threshold updates across the minibatch dimension. ``"sum"`` and
+            ``"mean"`` reduce the per-sample increments every step. ``"sequential"`` keeps per-sample increments during
+            the run, so each sample only sees its own threshold changes (not those of the other samples, unlike a
+            one-at-a-time presentation), and adds them to the shared thresholds in ``commit_batch``.
+        :param lateral_inhibition: Strength of the winner-take-all inhibition of every neuron by the spikes of all other
+            neurons of the layer in the previous timestep. Replaces a recurrent connection with weights
+            ``-lateral_inhibition`` off the diagonal, and is computed in O(n) from the spike count of every sample; with
+            ``one_spike``, from the single selected spike.
         """
         super().__init__(
             n=n,
@@ -1000,6 +1362,7 @@ class DiehlAndCookNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -1025,12 +1388,23 @@ class DiehlAndCookNeurons(Neurons):
         )  # Set in compute_decays.
         self.register_buffer("v", torch.FloatTensor())  # Neuron voltages.
         self.register_buffer("theta", torch.zeros(*self.shape))  # Adaptive thresholds.
+        self.register_buffer(
+            "theta_batch", torch.FloatTensor()
+        )  # Per-sample adaptive threshold increments (sequential batch updates).
         self.register_buffer(
             "refrac_count", torch.FloatTensor()
         )  # Refractory period counters.
 
+        assert batch_update in (
+            "sum",
+            "mean",
+            "sequential",
+        ), "Unknown batch update semantics: %s" % batch_update
+
         self.lbound = lbound  # Lower bound of voltage.
         self.one_spike = one_spike  # One spike per timestep.
+        self.batch_update = batch_update  # Adaptive threshold updates across the batch.
+        self.lateral_inhibition = lateral_inhibition  # Fused all-but-self inhibition.
         self.neederror = neederror
 
     def forward(self, x: torch.Tensor) -> None:
@@ -1040,27 +1414,38 @@ class DiehlAndCookNeurons(Neurons):
 
         :param x: Inputs to the layer.
         """
+        # Inhibition by the spikes of the other neurons in the previous timestep.
+        if self.lateral_inhibition is not None:
+            x = x + all_but_self(self.s, -self.lateral_inhibition)
+
         # Decay voltages and adaptive thresholds.
         # self.v = self.decay * (self.v - self.rest) + self.rest
+        sequential = self.batch_update == "sequential"
         if self.learning:
             self.theta *= self.theta_decay
+            if sequential:
+                self.theta_batch *= self.theta_decay
 
         # Integrate inputs.
-        self.v += (self.refrac_count == 0).float() * x
+        self.v += self._gate(x)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh + self.theta
+        if sequential:
+            self.s = self._threshold(self.v, self.thresh, self.theta, self.theta_batch)
+        else:
+            self.s = self._threshold(self.v, self.thresh, self.theta)
 
         # Refractoriness, voltage reset, and adaptive thresholds.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
         if self.learning:
-            self.theta += self.theta_plus * self.s.float().sum(0)
+            if sequential:
+                self._adapt(self.theta_batch)
+            else:
+                self._adapt(self.theta, self.batch_update)
 
         # Choose only a single neuron to spike.
         if self.one_spike:
@@ -1075,7 +1460,7 @@ class DiehlAndCookNeurons(Neurons):
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
 
@@ -1088,17 +1473,26 @@ class DiehlAndCookNeurons(Neurons):
         self.v.fill_(self.rest)  # Neuron voltages.
         self.refrac_count.zero_()  # Refractory period counters.
 
+    def commit_batch(self) -> None:
+        # language=rst
+        """
+        Adds the per-sample adaptive threshold increments of a sequential batch to the shared thresholds.
+        """
+        if self.batch_update == "sequential":
+            self.theta += self.theta_batch.sum(0)
+            self.theta_batch.zero_()
+
     def compute_decays(self, dt) -> None:
         # language=rst
         """
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
-        self.theta_decay = error_exp(
-            -self.dt / self.tc_theta_decay, error=self.neederror
+        self.theta_decay = self.decay_factor(
+            self.tc_theta_decay
         )  # Adaptive threshold decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -1109,8 +1503,15 @@ class DiehlAndCookNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
+        self.theta_batch = torch.zeros_like(
+            self.v, dtype=torch.float, device=self.theta_batch.device
+        )
 
 
 class IzhikevichNeurons(Neurons):
@@ -1160,6 +1561,7 @@ class IzhikevichNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -1233,6 +1635,14 @@ class IzhikevichNeurons(Neurons):
         self.register_buffer("v", self.rest * torch.ones(n))  # Neuron voltages.
         self.register_buffer("u", self.b * self.v)  # Neuron recovery.
 
+        if self.inplace:
+            self.register_buffer(
+                "dv", torch.FloatTensor(), persistent=False
+            )  # Scratch voltage terms.
+            self.register_buffer(
+                "rate", torch.empty_like(self.a), persistent=False
+            )  # Scratch recovery rates.
+
     def forward(self, x: torch.Tensor) -> None:
         # language=rst
         """
@@ -1241,11 +1651,16 @@ class IzhikevichNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Check for spiking neurons.
-        self.s = self.v >= self.thresh
+        self.s = self._threshold(self.v, self.thresh)
 
         # Voltage and recovery reset.
-        self.v = torch.where(self.s, self.c, self.v)
-        self.u = torch.where(self.s, self.u + self.d, self.u)
+        if self.inplace:
+            torch.where(self.s, self.c.to(self.v.dtype), self.v, out=self.v)
+            torch.add(self.u, self.d, out=self.scratch)
+            torch.where(self.s, self.scratch, self.u, out=self.u)
+        else:
+            self.v = torch.where(self.s, self.c.to(self.v.dtype), self.v)
+            self.u = torch.where(self.s, self.u + self.d, self.u)
 
         # Add inter-columnar input.
         if self.s.any():
@@ -1255,13 +1670,27 @@ class IzhikevichNeurons(Neurons):
             )
 
         # Apply v and u updates.
-        self.v += self.dt * 0.5 * (0.04 * self.v ** 2 + 5 * self.v + 140 - self.u + x)
-        self.v += self.dt * 0.5 * (0.04 * self.v ** 2 + 5 * self.v + 140 - self.u + x)
-        self.u += self.dt * self.a * (self.b * self.v - self.u)
+        if self.inplace:
+            for _ in range(2):
+                torch.pow(self.v, 2, out=self.scratch)
+                self.scratch *= 0.04
+                self.scratch += torch.mul(self.v, 5, out=self.dv)
+                self.scratch += 140
+                self.scratch -= self.u
+                self.scratch += x
+                self.v += self.scratch.mul_(self.dt * 0.5)
+
+            torch.mul(self.b, self.v, out=self.scratch)
+            self.scratch -= self.u
+            self.u += self.scratch.mul_(torch.mul(self.a, self.dt, out=self.rate))
+        else:
+            self.v += self.dt * 0.5 * (0.04 * self.v ** 2 + 5 * self.v + 140 - self.u + x)
+            self.v += self.dt * 0.5 * (0.04 * self.v ** 2 + 5 * self.v + 140 - self.u + x)
+            self.u += self.dt * self.a * (self.b * self.v - self.u)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
 
@@ -1272,7 +1701,10 @@ class IzhikevichNeurons(Neurons):
         """
         super().reset_()
         self.v.fill_(self.rest)  # Neuron voltages.
-        self.u = self.b * self.v  # Neuron recovery.
+        if self.inplace:
+            torch.mul(self.b, self.v, out=self.u)  # Neuron recovery.
+        else:
+            self.u = self.b * self.v  # Neuron recovery.
 
     def set_batch_size(self, batch_size) -> None:
         # language=rst
@@ -1282,9 +1714,14 @@ class IzhikevichNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
         self.u = self.b * self.v
 
+        if self.inplace:
+            self.dv = torch.zeros_like(self.v)
+
 
 class SRM0Neurons(Neurons):
     # language=rst
@@ -1344,6 +1781,7 @@ class SRM0Neurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -1370,6 +1808,14 @@ class SRM0Neurons(Neurons):
             "refrac_count", torch.FloatTensor()
         )  # Refractory period counters.
 
+        if self.inplace:
+            self.register_buffer(
+                "rho", torch.FloatTensor(), persistent=False
+            )  # Instantaneous spiking rates.
+            self.register_buffer(
+                "s_prob", torch.FloatTensor(), persistent=False
+            )  # Spiking probabilities.
+
         self.lbound = lbound  # Lower bound of voltage.
 
     def forward(self, x: torch.Tensor) -> None:
@@ -1380,31 +1826,40 @@ class SRM0Neurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Decay voltages.
-        self.v = self.decay * (self.v - self.rest) + self.rest
+        self.v = self._decay(self.v, self.decay, self.rest)
 
         # Integrate inputs.
-        self.v += (self.refrac_count == 0).float() * self.eps_0 * x
+        self.v += self._gate(x, self.eps_0)
 
         # Compute (instantaneous) probabilities of spiking, clamp between 0 and 1 using exponentials.
         # Also known as 'escape noise', this simulates nearby neurons.
-        self.rho = self.rho_0 * error_exp((self.v - self.thresh) / self.d_thresh, error=self.neederror)
-        self.s_prob = 1.0 - error_exp(-self.rho * self.dt, error=self.neederror)
+        if self.inplace:
+            torch.sub(self.v, self.thresh, out=self.scratch)
+            self.scratch /= self.d_thresh
+            torch.mul(self.exp(self.scratch), self.rho_0, out=self.rho)
+            torch.neg(self.rho, out=self.scratch)
+            self.scratch *= self.dt
+            self.s_prob.copy_(self.exp(self.scratch)).neg_().add_(1.0)
+        else:
+            self.rho = self.rho_0 * self.exp((self.v - self.thresh) / self.d_thresh)
+            self.s_prob = 1.0 - self.exp(-self.rho * self.dt)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons (spike when probability > some random number).
-        self.s = torch.rand_like(self.s_prob) < self.s_prob
+        if self.inplace:
+            self.s = torch.lt(self.scratch.uniform_(), self.s_prob, out=self.s)
+        else:
+            self.s = torch.rand_like(self.s_prob) < self.s_prob
 
         # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
         # print(self.v)
@@ -1424,8 +1879,8 @@ class SRM0Neurons(Neurons):
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -1436,8 +1891,16 @@ class SRM0Neurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
+
+        if self.inplace:
+            self.rho = torch.zeros_like(self.v, dtype=torch.float)
+            self.s_prob = torch.zeros_like(self.v, dtype=torch.float)
 
 
 class SoftMaxNeurons(Neurons):
@@ -1497,6 +1960,7 @@ class SoftMaxNeurons(Neurons):
             tc_trace=tc_trace,
             trace_scale=trace_scale,
             sum_input=sum_input,
+            **kwargs,
         )
 
         self.register_buffer("rest", torch.tensor(rest))  # Rest voltage.
@@ -1523,6 +1987,14 @@ class SoftMaxNeurons(Neurons):
             "refrac_count", torch.FloatTensor()
         )  # Refractory period counters.
 
+        if self.inplace:
+            self.register_buffer(
+                "rho", torch.FloatTensor(), persistent=False
+            )  # Instantaneous spiking rates.
+            self.register_buffer(
+                "s_prob", torch.FloatTensor(), persistent=False
+            )  # Spiking probabilities.
+
         self.lbound = lbound  # Lower bound of voltage.
 
     def forward(self, x: torch.Tensor) -> None:
@@ -1533,31 +2005,40 @@ class SoftMaxNeurons(Neurons):
         :param x: Inputs to the layer.
         """
         # Decay voltages.
-        self.v = self.decay * (self.v - self.rest) + self.rest
+        self.v = self._decay(self.v, self.decay, self.rest)
 
         # Integrate inputs.
-        self.v += (self.refrac_count == 0).float() * self.eps_0 * x
+        self.v += self._gate(x, self.eps_0)
 
         # Compute (instantaneous) probabilities of spiking, clamp between 0 and 1 using exponentials.
         # Also known as 'escape noise', this simulates nearby neurons.
-        self.rho = self.rho_0 * error_exp((self.v - self.thresh) / self.d_thresh, error=self.neederror)
-        self.s_prob = 1.0 - error_exp(-self.rho * self.dt, error=self.neederror)
+        if self.inplace:
+            torch.sub(self.v, self.thresh, out=self.scratch)
+            self.scratch /= self.d_thresh
+            torch.mul(self.exp(self.scratch), self.rho_0, out=self.rho)
+            torch.neg(self.rho, out=self.scratch)
+            self.scratch *= self.dt
+            self.s_prob.copy_(self.exp(self.scratch)).neg_().add_(1.0)
+        else:
+            self.rho = self.rho_0 * self.exp((self.v - self.thresh) / self.d_thresh)
+            self.s_prob = 1.0 - self.exp(-self.rho * self.dt)
 
         # Decrement refractory counters.
-        self.refrac_count = (self.refrac_count > 0).float() * (
-            self.refrac_count - self.dt
-        )
+        self.refrac_count = self._refractory()
 
         # Check for spiking neurons (spike when probability > some random number).
-        self.s = torch.rand_like(self.s_prob) < self.s_prob
+        if self.inplace:
+            self.s = torch.lt(self.scratch.uniform_(), self.s_prob, out=self.s)
+        else:
+            self.s = torch.rand_like(self.s_prob) < self.s_prob
 
         # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
+        self._start_refractory()
         self.v.masked_fill_(self.s, self.reset)
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
-            self.v.masked_fill_(self.v < self.lbound, self.lbound)
+            self._clip(self.v, self.lbound)
 
         super().forward(x)
         # print(self.v)
@@ -1577,8 +2058,8 @@ class SoftMaxNeurons(Neurons):
         Sets the relevant decays.
         """
         super().compute_decays(dt=dt)
-        self.decay = error_exp(
-            -self.dt / self.tc_decay, error=self.neederror
+        self.decay = self.decay_factor(
+            self.tc_decay
         )  # Neuron voltage decay (per timestep).
 
     def set_batch_size(self, batch_size) -> None:
@@ -1589,5 +2070,13 @@ class SoftMaxNeurons(Neurons):
         :param batch_size: Mini-batch size.
         """
         super().set_batch_size(batch_size=batch_size)
-        self.v = self.rest * torch.ones(batch_size, *self.shape, device=self.v.device)
-        self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
+        self.v = self.rest * torch.ones(
+            batch_size, *self.shape, dtype=self.voltage_dtype, device=self.v.device
+        )
+        self.refrac_count = torch.zeros_like(
+            self.v, dtype=self.refrac_dtype, device=self.refrac_count.device
+        )
+
+        if self.inplace:
+            self.rho = torch.zeros_like(self.v, dtype=torch.float)
+            self.s_prob = torch.zeros_like(self.v, dtype=torch.float)
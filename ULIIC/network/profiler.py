@@ -0,0 +1,246 @@
+"""
+Author: Jiajun Wu, HUST, China
+Main Library: Pytorch
+Description: It is a library with spiking neural network. We would like to implement this NN in hardware.
+File Information: This file includes the profiler of network simulations.
+Log: 2020/1/20 Build firstly
+Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
+
+"""
+
+import time
+from typing import Dict, Optional, Tuple, Union
+
+import torch
+
+
+class NetworkProfiler:
+    # language=rst
+    """
+    Measures where the simulation time of a ``Network`` goes.
+
+    While the profiler is active (as a context manager, or between ``start`` and ``stop``), the ``forward`` method of
+    every layer, the ``compute`` and ``update`` methods of every connection, the ``record`` method of every monitor
+    and ``Network.run`` itself are replaced on their objects by timing wrappers. Both the interpreted loop and the
+    compiled step plan of ``Network.run`` pick them up, and the original methods are restored on exit, so the profiler
+    costs nothing when it is not active.
+
+    For every call site, the number of calls, the wall time and, on CUDA, the bytes allocated (net change of
+    ``torch.cuda.memory_allocated``) and the peak bytes allocated during a call are recorded. CUDA work is
+    asynchronous, so the device is synchronized around every call unless ``synchronize=False``; measuring the peak
+    resets the peak memory statistics of the device, and the peaks of calls made during a call (e.g. by
+    ``Network.run``) are carried over into the peak of the enclosing call.
+
+    **Example:**
+
+    .. code-block:: python
+
+        with network.profile() as profiler:
+            network.run(inputs=inputs, time=250)
+
+        print(profiler.table())
+    """
+
+    def __init__(
+        self,
+        network: "Network",
+        synchronize: Optional[bool] = None,
+        device: Optional[Union[str, torch.device]] = None,
+    ) -> None:
+        # language=rst
+        """
+        Constructs a ``NetworkProfiler``.
+
+        :param network: Network to profile.
+        :param synchronize: Whether to synchronize the CUDA device around every call. Defaults to ``True`` on CUDA.
+        :param device: Device of the simulation; defaults to the device of the layers' state.
+        """
+        self.network = network
+        self.synchronize = synchronize
+        self.device = device
+
+        self.stats_ = {}
+        self.wrapped = []
+
+        # Peak bytes allocated so far by each of the calls in progress, innermost last.
+        self.peaks = []
+
+        # Resolved by ``start``.
+        self.cuda = False
+        self.sync = False
+        self.active_device = None
+
+    def __enter__(self) -> "NetworkProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        # language=rst
+        """
+        Wraps the methods of the network's layers, connections and monitors. Statistics accumulate until ``reset_``.
+        """
+        assert not self.wrapped, "The profiler is already active"
+
+        network = self.network
+
+        device = self.device
+        if device is None:
+            device = next(
+                (l.s.device for l in network.layers.values() if l.s.is_cuda), "cpu"
+            )
+
+        self.cuda = torch.device(device).type == "cuda"
+        self.active_device = torch.device(device)
+        self.sync = self.cuda if self.synchronize is None else self.synchronize and self.cuda
+        self.peaks = []
+
+        self._wrap(network, "run", ("run", "network"))
+
+        for name, layer in network.layers.items():
+            self._wrap(layer, "forward", ("forward", name))
+
+        for (source, target), connection in network.connections.items():
+            name = "%s -> %s" % (source, target)
+            self._wrap(connection, "compute", ("compute", name))
+            self._wrap(connection, "update", ("update", name))
+
+        for name, monitor in network.monitors.items():
+            self._wrap(monitor, "record", ("record", name))
+
+    def stop(self) -> None:
+        # language=rst
+        """
+        Restores the original methods.
+        """
+        for obj, attribute, original in reversed(self.wrapped):
+            if original is None:
+                del obj.__dict__[attribute]
+            else:
+                obj.__dict__[attribute] = original
+
+        self.wrapped = []
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Drops all recorded statistics.
+        """
+        for stats in self.stats_.values():
+            stats.update(calls=0, time=0.0, bytes=0, peak_bytes=0)
+
+    def _wrap(self, obj: object, attribute: str, key: Tuple[str, str]) -> None:
+        # language=rst
+        """
+        Replaces a method of an object by a timing wrapper.
+
+        :param obj: Object whose method is wrapped.
+        :param attribute: Name of the method.
+        :param key: Kind of call and name of the object it is recorded under.
+        """
+        original = obj.__dict__.get(attribute, None)
+        method = getattr(obj, attribute)
+
+        stats = self.stats_.setdefault(
+            key, {"calls": 0, "time": 0.0, "bytes": 0, "peak_bytes": 0}
+        )
+        cuda, sync, device, peaks = self.cuda, self.sync, self.active_device, self.peaks
+
+        def wrapper(*args, **kwargs):
+            if sync:
+                torch.cuda.synchronize(device)
+            if cuda:
+                before = torch.cuda.memory_allocated(device)
+
+                # The enclosing call keeps its peak so far, which the reset below drops from the device statistics.
+                if peaks:
+                    peaks[-1] = max(peaks[-1], torch.cuda.max_memory_allocated(device))
+                torch.cuda.reset_peak_memory_stats(device)
+                peaks.append(before)
+
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            if sync:
+                torch.cuda.synchronize(device)
+
+            stats["time"] += time.perf_counter() - start
+            stats["calls"] += 1
+            if cuda:
+                peak = max(peaks.pop(), torch.cuda.max_memory_allocated(device))
+                if peaks:
+                    peaks[-1] = max(peaks[-1], peak)
+
+                stats["bytes"] += torch.cuda.memory_allocated(device) - before
+                stats["peak_bytes"] = max(stats["peak_bytes"], peak - before)
+
+            return result
+
+        obj.__dict__[attribute] = wrapper
+        self.wrapped.append((obj, attribute, original))
+
+    def stats(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        # language=rst
+        """
+        Aggregated statistics of every call site.
+
+        :return: Dictionary mapping ``(kind, name)`` (kind ``"run"``, ``"forward"``, ``"compute"``, ``"update"`` or
+            ``"record"``) to the number of ``calls``, the total ``time`` and ``mean_time`` in seconds, the
+            ``fraction`` of the time of ``Network.run``, the net ``bytes`` allocated and the ``peak_bytes`` allocated
+            during a call (zero unless on CUDA).
+        """
+        total = self.stats_.get(("run", "network"), {}).get("time", 0.0)
+
+        stats = {}
+        for key, value in self.stats_.items():
+            if value["calls"] == 0:
+                continue
+
+            stats[key] = dict(
+                value,
+                mean_time=value["time"] / value["calls"],
+                fraction=value["time"] / total if total else float("nan"),
+            )
+
+        return stats
+
+    def table(self, sort: str = "time") -> str:
+        # language=rst
+        """
+        Formats the statistics as a text table.
+
+        :param sort: Statistic to sort the call sites by, in decreasing order.
+        :return: Table with one row per call site.
+        """
+        stats = self.stats()
+        keys = sorted(stats, key=lambda k: stats[k][sort], reverse=True)
+
+        rows = [
+            ("kind", "name", "calls", "total ms", "mean us", "% run", "bytes", "peak bytes")
+        ]
+        for kind, name in keys:
+            s = stats[(kind, name)]
+            rows.append(
+                (
+                    kind,
+                    name,
+                    "%d" % s["calls"],
+                    "%.3f" % (s["time"] * 1e3),
+                    "%.1f" % (s["mean_time"] * 1e6),
+                    "%.1f" % (s["fraction"] * 100),
+                    "%d" % s["bytes"],
+                    "%d" % s["peak_bytes"],
+                )
+            )
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                cell.ljust(w) if i < 2 else cell.rjust(w)
+                for i, (cell, w) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
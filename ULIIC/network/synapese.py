@@ -17,7 +17,8 @@ from torch.nn import Module, Parameter
 import torch.nn.functional as F
 from torch.nn.modules.utils import _pair
 
-from ULIIC.network.neurons import Neurons
+from ULIIC.network.neurons import AbstractInput, Neurons
+from ULIIC.auxiliary.snn_utils import all_but_self
 
 
 class AbstractConnection(ABC, Module):
@@ -132,6 +133,29 @@ class AbstractConnection(ABC, Module):
         """
         pass
 
+    def set_paired(self, paired: bool = True) -> None:
+        # language=rst
+        """
+        Switches the connection to paired simulation (see ``Network.set_paired``). Both halves of the batch share the
+        connection parameters, so learning connections are only supported by ``Connection``.
+
+        :param paired: Whether to simulate paired batches.
+        """
+        if paired:
+            self.check_paired()
+
+    def check_paired(self) -> None:
+        # language=rst
+        """
+        Raises ``NotImplementedError`` if the connection can not be simulated in paired mode.
+        """
+        from ULIIC.learning.learning_rules import NoOp
+
+        if not isinstance(self.update_rule, NoOp):
+            raise NotImplementedError(
+                "Paired simulation of learning is not supported for this Connection type."
+            )
+
 
 class Connection(AbstractConnection):
     # language=rst
@@ -170,6 +194,10 @@ class Connection(AbstractConnection):
         :param ByteTensor norm_by_max: Normalize the weight of a neuron by its max weight.
         :param ByteTensor norm_by_max_with_shadow_weights: Normalize the weight of a neuron by its max weight by
                                                            original weights.
+        :param float event_threshold: Fraction of active source neurons below which ``compute`` switches to
+                                      event-driven propagation, gathering only the weight rows of neurons that spiked.
+                                      Spike density is measured on every call. ``None`` (default) always propagates
+                                      densely.
         """
         super().__init__(source, target, nu, reduction, weight_decay, neederror, **kwargs)
 
@@ -186,6 +214,8 @@ class Connection(AbstractConnection):
         self.w = Parameter(w, False)
         self.b = Parameter(kwargs.get("b", torch.zeros(target.n)), False)
 
+        self.event_threshold = kwargs.get("event_threshold", None)
+
         if self.norm_by_max_from_shadow_weights:
             self.shadow_w = self.w.clone().detach()
             self.prev_w = self.w.clone().detach()
@@ -195,14 +225,62 @@ class Connection(AbstractConnection):
         """
         Compute pre-activations given spikes using connection weights.
 
+        In paired mode, weights of shape ``[2, source.n, target.n]`` (learning connections) multiply the spikes of
+        each half of the batch with a batched product, and shared weights driven by an input layer, whose halves
+        receive the same spikes, are only multiplied with the first half.
+
         :param s: Incoming spikes.
         :return: Incoming spikes multiplied by synaptic weights (with or without
                  decaying spike activation).
         """
+        if self.w.dim() == 3:
+            # Per-variant weights of a paired simulation.
+            post = torch.bmm(s.float().view(2, s.size(0) // 2, -1), self.w) + self.b
+            return post.view(s.size(0), *self.target.shape)
+
+        if (
+            self.source.paired
+            and isinstance(self.source, AbstractInput)
+            and s.size(0) == self.source.batch_size
+        ):
+            half = s.size(0) // 2
+            post = self.compute(s[:half])
+            return torch.cat((post, post))
+
+        if self.event_threshold is not None:
+            spikes = s.view(s.size(0), -1)
+            active = spikes.nonzero()
+
+            # Event-driven propagation for sparse activity.
+            if active.size(0) <= self.event_threshold * spikes.numel():
+                post = self._gather(spikes, active)
+                return post.view(s.size(0), *self.target.shape)
+
         # Compute multiplication of spike activations by weights and add bias.
         post = s.float().view(s.size(0), -1) @ self.w + self.b
         return post.view(s.size(0), *self.target.shape)
 
+    def _gather(self, spikes: torch.Tensor, active: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Event-driven propagation: sums the weight rows of active source neurons.
+
+        :param spikes: Incoming spikes of shape ``[batch_size, source.n]``.
+        :param active: Indices ``(sample, neuron)`` of non-zero entries of ``spikes``.
+        :return: Pre-activations of shape ``[batch_size, target.n]``.
+        """
+        rows = self.w.index_select(0, active[:, 1])
+
+        # Real-valued inputs scale their weight rows.
+        if spikes.is_floating_point():
+            rows = rows * spikes[active[:, 0], active[:, 1]].unsqueeze(1)
+
+        if spikes.size(0) == 1:
+            return rows.sum(0, keepdim=True) + self.b
+
+        post = self.b.repeat(spikes.size(0), 1)
+        return post.index_add_(0, active[:, 0], rows)
+
     def update(self, **kwargs) -> None:
         # language=rst
         """
@@ -217,7 +295,7 @@ class Connection(AbstractConnection):
         ``self.norm``.
         """
         if self.norm is not None:
-            w_abs_sum = self.w.abs().sum(0).unsqueeze(0)
+            w_abs_sum = self.w.abs().sum(-2, keepdim=True)
             w_abs_sum[w_abs_sum == 0] = 1.0
             self.w *= self.norm / w_abs_sum
 
@@ -227,7 +305,7 @@ class Connection(AbstractConnection):
         Normalize weights by the max weight of the target neuron.
         """
         if self.norm_by_max:
-            w_max = self.w.abs().max(0)[0]
+            w_max = self.w.abs().max(-2, keepdim=True)[0]
             w_max[w_max == 0] = 1.0
             self.w /= w_max
 
@@ -250,6 +328,44 @@ class Connection(AbstractConnection):
         """
         super().reset_()
 
+    def set_paired(self, paired: bool = True) -> None:
+        # language=rst
+        """
+        Switches the connection to paired simulation (see ``Network.set_paired``). Learning connections keep one
+        weight matrix per half of the batch, stacked into ``w`` of shape ``[2, source.n, target.n]`` (exact first);
+        when leaving paired mode, the exact weights are kept.
+
+        :param paired: Whether to simulate paired batches.
+        """
+        from ULIIC.learning.learning_rules import NoOp
+
+        if paired:
+            self.check_paired()
+
+        learning = not isinstance(self.update_rule, NoOp)
+        if paired and learning:
+            if self.w.dim() == 2:
+                self.w = Parameter(self.w.detach().unsqueeze(0).repeat(2, 1, 1), False)
+        elif self.w.dim() == 3:
+            self.w = Parameter(self.w[0].clone(), False)
+
+        self.update_rule.set_paired(paired and learning)
+
+    def check_paired(self) -> None:
+        # language=rst
+        """
+        Raises ``NotImplementedError`` if the connection can not be simulated in paired mode.
+        """
+        from ULIIC.learning.learning_rules import NoOp
+
+        if not isinstance(self.update_rule, NoOp):
+            if self.norm_by_max_from_shadow_weights:
+                raise NotImplementedError(
+                    "Paired simulation does not support normalization by shadow weights."
+                )
+
+            self.update_rule.check_paired()
+
 
 class Conv2dConnection(AbstractConnection):
     # language=rst
@@ -490,6 +606,9 @@ class LocalConnection(AbstractConnection):
     # language=rst
     """
     Specifies a locally connected connection between one or two populations of neurons.
+
+    Only the synapses of the receptive fields are stored, as weights of shape ``[n_filters, conv_prod, kernel_prod]``;
+    ``to_dense`` expands them to a ``[source.n, target.n]`` matrix.
     """
 
     def __init__(
@@ -525,7 +644,8 @@ class LocalConnection(AbstractConnection):
         Keyword arguments:
 
         :param LearningRule update_rule: Modifies connection parameters according to some rule.
-        :param torch.Tensor w: Strengths of synapses.
+        :param torch.Tensor w: Strengths of synapses, of shape ``[n_filters, conv_prod, kernel_prod]`` (or a dense
+                               ``[source.n, target.n]`` matrix, of which only the receptive fields are kept).
         :param torch.Tensor b: Target population bias.
         :param float wmin: Minimum allowed value on the connection weights.
         :param float wmax: Maximum allowed value on the connection weights.
@@ -563,50 +683,77 @@ class LocalConnection(AbstractConnection):
             target.n == n_filters * conv_prod
         ), "Target layer size must be n_filters * (kernel_size ** 2)."
 
-        locations = torch.zeros(
-            kernel_size[0], kernel_size[1], conv_size[0], conv_size[1]
-        ).long()
-        for c1 in range(conv_size[0]):
-            for c2 in range(conv_size[1]):
-                for k1 in range(kernel_size[0]):
-                    for k2 in range(kernel_size[1]):
-                        location = (
-                            c1 * stride[0] * shape[1]
-                            + c2 * stride[1]
-                            + k1 * shape[0]
-                            + k2
-                        )
-                        locations[k1, k2, c1, c2] = location
+        # Source neuron of every kernel position of every receptive field.
+        k1 = torch.arange(kernel_size[0]).view(-1, 1, 1, 1)
+        k2 = torch.arange(kernel_size[1]).view(1, -1, 1, 1)
+        c1 = torch.arange(conv_size[0]).view(1, 1, -1, 1)
+        c2 = torch.arange(conv_size[1]).view(1, 1, 1, -1)
+        locations = c1 * stride[0] * shape[1] + c2 * stride[1] + k1 * shape[0] + k2
 
         self.register_buffer("locations", locations.view(kernel_prod, conv_prod))
         w = kwargs.get("w", None)
 
         if w is None:
-            w = torch.zeros(source.n, target.n)
-            for f in range(n_filters):
-                for c in range(conv_prod):
-                    for k in range(kernel_prod):
-                        if self.wmin == -np.inf or self.wmax == np.inf:
-                            w[self.locations[k, c], f * conv_prod + c] = np.clip(
-                                np.random.rand(), self.wmin, self.wmax
-                            )
-                        else:
-                            w[
-                                self.locations[k, c], f * conv_prod + c
-                            ] = self.wmin + np.random.rand() * (self.wmax - self.wmin)
+            w = torch.rand(n_filters, conv_prod, kernel_prod)
+            if self.wmin == -np.inf or self.wmax == np.inf:
+                w = torch.clamp(w, self.wmin, self.wmax)
+            else:
+                w = self.wmin + w * (self.wmax - self.wmin)
         else:
+            if w.shape == (source.n, target.n):
+                w = self.compact(w)
+
+            assert w.shape == (n_filters, conv_prod, kernel_prod), (
+                "Weights must have shape [source.n, target.n] or [n_filters, conv_prod, kernel_prod]"
+            )
             if self.wmin != -np.inf or self.wmax != np.inf:
                 w = torch.clamp(w, self.wmin, self.wmax)
 
         self.w = Parameter(w, False)
 
-        self.register_buffer("mask", self.w == 0)
-
         self.b = Parameter(kwargs.get("b", torch.zeros(target.n)), False)
 
         if self.norm is not None:
             self.norm *= kernel_prod
 
+    def compact(self, dense: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Gathers the entries of the existing synapses from a dense ``[source.n, target.n]`` tensor (weights or masks).
+
+        :param dense: Tensor of shape ``[source.n, target.n]``.
+        :return: Tensor of shape ``[n_filters, conv_prod, kernel_prod]``, where target neuron ``f * conv_prod + c``
+                 receives source neuron ``locations[k, c]`` at ``[f, c, k]``.
+        """
+        n_filters = self.n_filters
+        kernel_prod, conv_prod = self.locations.shape
+
+        dense = dense.view(self.source.n, n_filters, conv_prod)
+        c = torch.arange(conv_prod, device=dense.device)
+        return dense[self.locations.t(), :, c.unsqueeze(1)].permute(2, 0, 1)
+
+    def to_dense(self) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the weights as a dense tensor of shape ``[source.n, target.n]``, zero outside the receptive fields.
+        """
+        kernel_prod, conv_prod = self.locations.shape
+
+        dense = self.w.new_zeros(self.source.n, self.n_filters, conv_prod)
+        c = torch.arange(conv_prod, device=self.w.device)
+        dense[self.locations.t(), :, c.unsqueeze(1)] = self.w.permute(1, 2, 0)
+        return dense.view(self.source.n, self.target.n)
+
+    def patches(self, s: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Unfolds pre-synaptic quantities (spikes or traces) into receptive fields.
+
+        :param s: Tensor of shape ``[batch_size, *source.shape]``.
+        :return: Tensor of shape ``[batch_size, conv_prod, kernel_prod]``.
+        """
+        return s.reshape(s.size(0), -1)[:, self.locations.t()]
+
     def compute(self, s: torch.Tensor) -> torch.Tensor:
         # language=rst
         """
@@ -615,16 +762,23 @@ class LocalConnection(AbstractConnection):
         :param s: Incoming spikes.
         :return: Incoming spikes multiplied by synaptic weights (with or without decaying spike activation).
         """
-        # Compute multiplication of pre-activations by connection weights.
-        if self.w.shape[0] == self.source.n and self.w.shape[1] == self.target.n:
-            return s.float().view(s.size(0), -1) @ self.w + self.b
-        else:
-            a_post = (
-                s.float().view(s.size(0), -1)
-                @ self.w.view(self.source.n, self.target.n)
-                + self.b
-            )
-            return a_post.view(*self.target.shape)
+        # Multiply every receptive field by the kernels of its filters.
+        a_post = torch.einsum("bck,fck->bfc", self.patches(s.float()), self.w)
+        a_post = a_post.reshape(s.size(0), -1) + self.b
+        return a_post.view(s.size(0), *self.target.shape)
+
+    def outer(self, pre: torch.Tensor, post: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Per-synapse products of pre- and post-synaptic quantities (spikes or traces), the compact counterpart of
+        ``torch.bmm(pre, post)`` in the learning rules of ``Connection``.
+
+        :param pre: Tensor of shape ``[batch_size, source.n]``.
+        :param post: Tensor of shape ``[batch_size, target.n]``.
+        :return: Tensor of shape ``[batch_size, n_filters, conv_prod, kernel_prod]``.
+        """
+        post = post.reshape(post.size(0), self.n_filters, -1, 1)
+        return post * self.patches(pre).unsqueeze(1)
 
     def update(self, **kwargs) -> None:
         # language=rst
@@ -633,10 +787,12 @@ class LocalConnection(AbstractConnection):
 
         Keyword arguments:
 
-        :param ByteTensor mask: Boolean mask determining which weights to clamp to zero.
+        :param ByteTensor mask: Boolean mask of shape ``[source.n, target.n]`` or ``[n_filters, conv_prod,
+                                kernel_prod]`` determining which weights to clamp to zero.
         """
-        if kwargs["mask"] is None:
-            kwargs["mask"] = self.mask
+        mask = kwargs.get("mask", None)
+        if mask is not None and mask.shape != self.w.shape:
+            kwargs["mask"] = self.compact(mask)
 
         super().update(**kwargs)
 
@@ -646,8 +802,7 @@ class LocalConnection(AbstractConnection):
         Normalize weights so each target neuron has sum of connection weights equal to ``self.norm``.
         """
         if self.norm is not None:
-            w = self.w.view(self.source.n, self.target.n)
-            w *= self.norm / self.w.sum(0).view(1, -1)
+            self.w *= self.norm / self.w.sum(-1, keepdim=True)
 
     def reset_(self) -> None:
         # language=rst
@@ -736,10 +891,95 @@ class MeanFieldConnection(AbstractConnection):
         super().reset_()
 
 
+class AllButSelfConnection(AbstractConnection):
+    # language=rst
+    """
+    Lateral connection of equal weight ``w`` from every source neuron to every target neuron except its counterpart,
+    e.g. winner-take-all inhibition. Equivalent to a ``Connection`` with weights ``w * (1 - I)``, but computed in O(n)
+    from the spike count of every sample (see ``all_but_self``) without storing or multiplying an n x n matrix.
+    """
+
+    def __init__(
+        self,
+        source: Neurons,
+        target: Neurons,
+        nu: Optional[Union[float, Sequence[float]]] = None,
+        reduction: Optional[callable] = None,
+        weight_decay: float = 0.0,
+        neederror: bool = True,
+        **kwargs
+    ) -> None:
+        # language=rst
+        """
+        Instantiates an :code:`AllButSelfConnection` object.
+
+        :param source: A layer of Neurons from which the connection originates.
+        :param target: A layer of Neurons to which the connection connects, of the size of ``source``.
+        :param nu: Learning rate for both pre- and post-synaptic events.
+        :param reduction: Method for reducing parameter updates along the minibatch dimension.
+        :param weight_decay: Constant multiple to decay weights by on each iteration.
+
+        Keyword arguments:
+
+        :param torch.Tensor w: Strength of the synapses, a scalar.
+        :param float wmin: Minimum allowed value on the connection weight.
+        :param float wmax: Maximum allowed value on the connection weight.
+        """
+        super().__init__(source, target, nu, reduction, weight_decay, neederror, **kwargs)
+
+        assert source.n == target.n, "Source and target must have the same number of neurons"
+
+        w = kwargs.get("w", None)
+        assert w is not None, "The weight of an all-but-self connection must be given"
+
+        w = torch.as_tensor(w, dtype=torch.float)
+        assert w.dim() == 0, "All-but-self connections have a single weight"
+        if self.wmin != -np.inf or self.wmax != np.inf:
+            w = torch.clamp(w, self.wmin, self.wmax)
+
+        self.w = Parameter(w, False)
+
+    def compute(self, s: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Compute pre-activations given spikes using the connection weight.
+
+        :param s: Incoming spikes.
+        :return: Weighted spike count of all other source neurons of every target neuron.
+        """
+        post = all_but_self(s, self.w)
+        return post.view(s.size(0), *self.target.shape)
+
+    def update(self, **kwargs) -> None:
+        # language=rst
+        """
+        Compute connection's update rule.
+        """
+        super().update(**kwargs)
+
+    def normalize(self) -> None:
+        # language=rst
+        """
+        Weights of all-but-self connections are not normalized.
+        """
+        pass
+
+    def reset_(self) -> None:
+        # language=rst
+        """
+        Contains resetting logic for the connection.
+        """
+        super().reset_()
+
+
 class SparseConnection(AbstractConnection):
     # language=rst
     """
     Specifies sparse synapses between one or two populations of neurons.
+
+    Weights are stored as a compressed sparse row (CSR) tensor of shape ``[source.n, target.n]``, so memory grows with
+    the number of synapses only. Propagation multiplies a target-major (transposed) CSR view of the weights with the
+    batch of incoming spikes, and learning rules update the existing synapses only.
     """
 
     def __init__(
@@ -764,7 +1004,7 @@ class SparseConnection(AbstractConnection):
 
         Keyword arguments:
 
-        :param torch.Tensor w: Strengths of synapses.
+        :param torch.Tensor w: Strengths of synapses, a sparse (COO or CSR) tensor of shape ``[source.n, target.n]``.
         :param float sparsity: Fraction of sparse connections to use.
         :param LearningRule update_rule: Modifies connection parameters according to some rule.
         :param float wmin: Minimum allowed value on the connection weights.
@@ -784,50 +1024,144 @@ class SparseConnection(AbstractConnection):
         ), 'Only one of "weights" or "sparsity" must be specified'
 
         if w is None and self.sparsity is not None:
-            i = torch.bernoulli(
-                1 - self.sparsity * torch.ones(*source.shape, *target.shape)
-            )
+            index = self._sample(source.n * target.n, 1 - self.sparsity)
             if self.wmin == -np.inf or self.wmax == np.inf:
-                v = torch.clamp(
-                    torch.rand(*source.shape, *target.shape)[i.byte()],
-                    self.wmin,
-                    self.wmax,
-                )
+                v = torch.clamp(torch.rand(index.numel()), self.wmin, self.wmax)
             else:
-                v = self.wmin + torch.rand(*source.shape, *target.shape)[i.byte()] * (
-                    self.wmax - self.wmin
-                )
-            w = torch.sparse.FloatTensor(i.nonzero().t(), v)
+                v = self.wmin + torch.rand(index.numel()) * (self.wmax - self.wmin)
+
+            w = torch.sparse_coo_tensor(
+                torch.stack((index // target.n, index % target.n)),
+                v,
+                (source.n, target.n),
+                is_coalesced=True,
+            )
         elif w is not None and self.sparsity is None:
-            assert w.is_sparse, "Weight matrix is not sparse (see torch.sparse module)"
-            if self.wmin != -np.inf or self.wmax != np.inf:
-                w = torch.clamp(w, self.wmin, self.wmax)
+            assert w.is_sparse or w.layout == torch.sparse_csr, (
+                "Weight matrix is not sparse (see torch.sparse module)"
+            )
+
+        assert tuple(w.shape) == (source.n, target.n), "Weight matrix must have shape [source.n, target.n]"
+        if w.layout != torch.sparse_csr:
+            w = w.coalesce().to_sparse_csr()
+
+        if self.wmin != -np.inf or self.wmax != np.inf:
+            w.values().clamp_(self.wmin, self.wmax)
 
         self.w = Parameter(w, False)
 
+        # Source neuron of every synapse, and the target-major order of the synapses.
+        crow = w.crow_indices()
+        row = torch.repeat_interleave(
+            torch.arange(source.n), crow[1:] - crow[:-1]
+        )
+        col = w.col_indices()
+        perm = torch.argsort(col, stable=True)
+        self.register_buffer("row", row)
+        self.register_buffer("perm", perm)
+        self.register_buffer(
+            "t_crow",
+            torch.cat((crow.new_zeros(1), torch.bincount(col, minlength=target.n).cumsum(0))),
+        )
+        self.register_buffer("t_col", row[perm])
+
+    @staticmethod
+    def _sample(n: int, p: float) -> torch.Tensor:
+        # language=rst
+        """
+        Samples the positions of Bernoulli(``p``) successes among ``n`` trials without materializing the trials:
+        the gaps between successes are geometrically distributed, so only ``O(n * p)`` gaps are drawn.
+
+        :param n: Number of trials (``source.n * target.n``).
+        :param p: Success (connection) probability.
+        :return: Sorted ``long`` tensor of positions.
+        """
+        if p <= 0:
+            return torch.zeros(0, dtype=torch.long)
+        if p >= 1:
+            return torch.arange(n)
+
+        log_q = np.log1p(-p)
+        chunks, position = [], -1
+        while position < n:
+            # Draw a block of gaps, a few standard deviations more than expected to rarely need another block.
+            expected = (n - position) * p
+            size = int(expected + 6 * np.sqrt(expected) + 16)
+            gaps = torch.floor(torch.log(1 - torch.rand(size, dtype=torch.float64)) / log_q).long() + 1
+            index = position + gaps.cumsum(0)
+            chunks.append(index[index < n])
+            position = int(index[-1])
+
+        return torch.cat(chunks)
+
+    def transposed(self) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the weights as a target-major CSR tensor of shape ``[target.n, source.n]``.
+        """
+        return torch.sparse_csr_tensor(
+            self.t_crow,
+            self.t_col,
+            self.w.values()[self.perm],
+            (self.target.n, self.source.n),
+        )
+
     def compute(self, s: torch.Tensor) -> torch.Tensor:
         # language=rst
         """
-        Compute convolutional pre-activations given spikes using layer weights.
+        Compute pre-activations given spikes using layer weights.
 
-        :param s: Incoming spikes.
+        :param s: Incoming spikes of shape ``[batch_size, *source.shape]``.
         :return: Incoming spikes multiplied by synaptic weights (with or without decaying spike activation).
         """
-        return torch.mm(self.w, s.unsqueeze(-1).float()).squeeze(-1)
+        spikes = s.float().view(s.size(0), -1)
+        post = (self.transposed() @ spikes.t()).t()
+        return post.reshape(s.size(0), *self.target.shape)
+
+    def outer(self, pre: torch.Tensor, post: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Per-synapse products of pre- and post-synaptic quantities (spikes or traces), the sparse counterpart of
+        ``torch.bmm(pre, post)`` in the learning rules of ``Connection``.
+
+        :param pre: Tensor of shape ``[batch_size, source.n]``.
+        :param post: Tensor of shape ``[batch_size, target.n]``.
+        :return: Tensor of shape ``[batch_size, nnz]`` in the order of ``w.values()``.
+        """
+        return pre[:, self.row] * post[:, self.w.col_indices()]
 
     def update(self, **kwargs) -> None:
         # language=rst
         """
         Compute connection's update rule.
         """
-        pass
+        learning = kwargs.get("learning", True)
+
+        if learning:
+            self.update_rule.update(**kwargs)
+
+        mask = kwargs.get("mask", None)
+        if mask is not None:
+            self.w.values().masked_fill_(mask[self.row, self.w.col_indices()], 0)
 
     def normalize(self) -> None:
         # language=rst
         """
         Normalize weights along the first axis according to total weight per target neuron.
         """
-        pass
+        if self.norm is not None:
+            values = self.w.values()
+            col = self.w.col_indices()
+            w_abs_sum = values.new_zeros(self.target.n).index_add_(0, col, values.abs())
+            w_abs_sum[w_abs_sum == 0] = 1.0
+            values *= self.norm / w_abs_sum[col]
+
+    def to_dense(self) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the weights as a dense tensor of shape ``[source.n, target.n]``.
+        """
+        return self.w.to_dense()
 
     def reset_(self) -> None:
         # language=rst
@@ -0,0 +1,248 @@
+"""
+Author: Jiajun Wu, HUST, China
+Main Library: Pytorch
+Description: It is a library with spiking neural network. We would like to implement this NN in hardware.
+File Information: This file includes a benchmark of the simulation throughput of the architectures.
+Log: 2020/1/20 Build firstly
+Reference: Bindsnet library https://bindsnet-docs.readthedocs.io/
+
+"""
+
+import os
+import csv
+import json
+import torch
+import argparse
+import platform
+import resource
+import itertools
+import subprocess
+import multiprocessing
+
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ULIIC.architectures.models import (
+    TwoLayerNetwork,
+    DiehlAndCook2015,
+    DiehlAndCook2015v2,
+    IncreasingInhibitionNetwork,
+    LocallyConnectedNetwork,
+)
+
+
+# Input of all models: synthetic 28 x 28 Bernoulli spike trains.
+n_input = 784
+input_shape = [28, 28]
+
+MODELS = {
+    "TwoLayerNetwork": lambda n, neederror: TwoLayerNetwork(
+        n_input=n_input, n_neurons=n, neederror=neederror
+    ),
+    "DiehlAndCook2015": lambda n, neederror: DiehlAndCook2015(
+        n_input=n_input, n_neurons=n, neederror=neederror
+    ),
+    "DiehlAndCook2015v2": lambda n, neederror: DiehlAndCook2015v2(
+        n_input=n_input, n_neurons=n
+    ),
+    "IncreasingInhibitionNetwork": lambda n, neederror: IncreasingInhibitionNetwork(
+        n_input=n_input, n_neurons=n
+    ),
+    # 25 receptive fields of 12 x 12 inputs with stride 4: ``n`` neurons are ``n / 25`` filters.
+    "LocallyConnectedNetwork": lambda n, neederror: LocallyConnectedNetwork(
+        n_input=n_input,
+        input_shape=input_shape,
+        kernel_size=12,
+        stride=4,
+        n_filters=max(1, round(n / 25)),
+    ),
+}
+
+# Models with an error model switch; the others are benchmarked once per configuration.
+ERROR_MODELS = ("TwoLayerNetwork", "DiehlAndCook2015")
+
+KEYS = ("model", "n_neurons", "batch_size", "density", "neederror")
+
+parser = argparse.ArgumentParser(
+    description="Measures the simulation throughput of the architectures on synthetic data."
+)
+parser.add_argument("--models", type=str, nargs="+", default=list(MODELS), choices=list(MODELS))
+parser.add_argument("--n_neurons", type=int, nargs="+", default=[100, 400])
+parser.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 16])
+parser.add_argument("--densities", type=float, nargs="+", default=[0.02, 0.1])
+parser.add_argument("--neederror", type=int, nargs="+", default=[0, 1], choices=[0, 1])
+parser.add_argument("--time", type=int, default=100)
+parser.add_argument("--repeats", type=int, default=3)
+parser.add_argument("--warmup", type=int, default=1)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--output", type=str, default="benchmark.json")
+parser.add_argument("--csv", type=str, default=None)
+parser.add_argument("--baseline", type=str, default=None)
+parser.add_argument("--gpu", dest="gpu", action="store_true")
+parser.add_argument("--compiled", dest="compiled", action="store_true")
+parser.add_argument("--no_learning", dest="learning", action="store_false")
+parser.set_defaults(gpu=False, compiled=False, learning=True)
+
+
+def peak_memory(device: torch.device) -> int:
+    # Peak bytes allocated on the GPU since the last reset, or peak resident memory of the process so far on the CPU.
+    if device.type == "cuda":
+        return torch.cuda.max_memory_allocated(device)
+
+    # ``ru_maxrss`` is in kilobytes on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if platform.system() == "Darwin" else rss * 1024
+
+
+def benchmark(model, n_neurons, batch_size, density, neederror, args, device):
+    torch.manual_seed(args.seed)
+
+    # On the CPU, the peak resident memory grown beyond that of the fresh process (see ``isolated``).
+    baseline = peak_memory(device) if device.type == "cpu" else 0
+
+    network = MODELS[model](n_neurons, bool(neederror))
+    network.to(device)
+    network.train(args.learning)
+    network.compile_run(args.compiled)
+
+    inputs = torch.bernoulli(
+        density * torch.ones(args.time, batch_size, n_input, device=device)
+    ).byte()
+
+    for _ in range(args.warmup):
+        network.run(inputs={"X": inputs.clone()}, time=args.time)
+        network.reset_()
+
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        torch.cuda.reset_peak_memory_stats(device)
+
+    start = perf_counter()
+    for _ in range(args.repeats):
+        network.run(inputs={"X": inputs.clone()}, time=args.time)
+        network.reset_()
+
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+    elapsed = perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "steps_per_sec": args.repeats * args.time / elapsed,
+        "samples_per_sec": args.repeats * batch_size / elapsed,
+        "peak_memory": peak_memory(device) - baseline,
+        "n_output": sum(l.n for name, l in network.layers.items() if name != "X"),
+    }
+
+
+def isolated(config, args, device):
+    # The peak resident memory of a process never decreases: on the CPU, every configuration runs in a fresh process.
+    if device.type == "cuda":
+        return benchmark(*config, args, device)
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return pool.submit(benchmark, *config, args, device).result()
+
+
+def configurations(args):
+    for model, n_neurons, batch_size, density in itertools.product(
+        args.models, args.n_neurons, args.batch_sizes, args.densities
+    ):
+        if model in ERROR_MODELS:
+            for neederror in args.neederror:
+                yield model, n_neurons, batch_size, density, neederror
+        else:
+            yield model, n_neurons, batch_size, density, None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parser.parse_args()
+
+    device = torch.device("cuda" if args.gpu and torch.cuda.is_available() else "cpu")
+
+    results = []
+    for config in configurations(args):
+        result = dict(zip(KEYS, config))
+        try:
+            result.update(isolated(config, args, device))
+        except Exception as e:
+            # Unsupported configurations are recorded and skipped.
+            result["error"] = "%s: %s" % (type(e).__name__, e)
+
+        results.append(result)
+        if "error" in result:
+            print("%s  failed: %s" % (config, result["error"]))
+        else:
+            print(
+                "%s  %.1f steps/s  %.2f samples/s  peak %.1f MB"
+                % (
+                    config,
+                    result["steps_per_sec"],
+                    result["samples_per_sec"],
+                    result["peak_memory"] / 2 ** 20,
+                )
+            )
+
+    report = {
+        "meta": {
+            "torch": torch.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "device": str(device),
+            "threads": torch.get_num_threads(),
+            "commit": git_commit(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.csv is not None:
+        fields = list(KEYS) + [
+            "steps_per_sec", "samples_per_sec", "peak_memory", "seconds", "n_output", "error"
+        ]
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(results)
+
+    # Regression comparison against an earlier report.
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = {
+                tuple(r[k] for k in KEYS): r
+                for r in json.load(f)["results"]
+                if "error" not in r
+            }
+
+        print("\nSpeedup of steps/s over %s:" % args.baseline)
+        for result in results:
+            old = baseline.get(tuple(result[k] for k in KEYS), None)
+            if old is not None and "error" not in result:
+                print(
+                    "%s  %.2fx"
+                    % (
+                        tuple(result[k] for k in KEYS),
+                        result["steps_per_sec"] / old["steps_per_sec"],
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
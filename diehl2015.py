@@ -19,11 +19,12 @@ from tqdm import tqdm
 
 from time import time as t
 
-from ULIIC.datasets import MNIST
-from ULIIC.encoding import PoissonEncoder
+from ULIIC.datasets import MNIST, SpikeCache
+from ULIIC.encoding import PoissonEncoder, PoissonSource
 from ULIIC.architectures.models import DiehlAndCook2015
 from ULIIC.network.monitors import Monitor
 from ULIIC.auxiliary.snn_utils import get_square_weights, get_square_assignments
+from ULIIC.auxiliary.spike_packing import pack_spikes
 from ULIIC.analysis.evaluation import all_activity, proportion_weighting, assign_labels
 from ULIIC.analysis.plotting import (
     plot_input,
@@ -39,6 +40,10 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--seed", type=int, default=0)
 parser.add_argument("--n_neurons", type=int, default=100)
 parser.add_argument("--n_epochs", type=int, default=1)
+parser.add_argument("--batch_size", type=int, default=1)
+parser.add_argument(
+    "--batch_update", type=str, default=None, choices=["sequential", "mean", "sum"]
+)
 parser.add_argument("--n_test", type=int, default=10000)
 parser.add_argument("--n_workers", type=int, default=-1)
 parser.add_argument("--exc", type=float, default=22.5)
@@ -53,13 +58,18 @@ parser.add_argument("--train", dest="train", action="store_true")
 parser.add_argument("--test", dest="train", action="store_false")
 parser.add_argument("--plot", dest="plot", action="store_true")
 parser.add_argument("--gpu", dest="gpu", action="store_true")
-parser.set_defaults(plot=False, gpu=False, train=True)
+parser.add_argument("--packed", dest="packed", action="store_true")
+parser.add_argument("--streaming", dest="streaming", action="store_true")
+parser.add_argument("--cache_dir", type=str, default=None)
+parser.set_defaults(plot=False, gpu=False, train=True, packed=False, streaming=False)
 
 args = parser.parse_args()
 
 seed = args.seed
 n_neurons = args.n_neurons
 n_epochs = args.n_epochs
+batch_size = args.batch_size
+batch_update = args.batch_update
 n_test = args.n_test
 n_workers = args.n_workers
 exc = args.exc
@@ -73,6 +83,9 @@ update_interval = args.update_interval
 train = args.train
 plot = args.plot
 gpu = args.gpu
+packed = args.packed
+streaming = args.streaming
+cache_dir = args.cache_dir
 
 # Sets up Gpu use
 if gpu:
@@ -87,6 +100,10 @@ if n_workers == -1:
 if not train:
     update_interval = n_test
 
+assert (
+    update_interval % batch_size == 0
+), "Update interval must be a multiple of the batch size."
+
 n_sqrt = int(np.ceil(np.sqrt(n_neurons)))
 start_intensity = intensity
 
@@ -101,15 +118,16 @@ network = DiehlAndCook2015(
     theta_plus=theta_plus,
     input_shape=(1, 28, 28),
     neederror=True,
+    batch_update=batch_update,
 )
 
 # Directs network to GPU
 if gpu:
     network.to("cuda")
 
-# Load MNIST data.
+# Load MNIST data. With --streaming, Poisson spikes are generated inside the simulation loop instead.
 dataset = MNIST(
-    PoissonEncoder(time=time, dt=dt),
+    None if streaming else PoissonEncoder(time=time, dt=dt),
     None,
     root=os.path.join("..", "..", "data", "MNIST"),
     download=True,
@@ -118,8 +136,19 @@ dataset = MNIST(
     ),
 )
 
-# Record spikes during the simulation.
-spike_record = torch.zeros(update_interval, time, n_neurons)
+# Encode once into a memory-mapped spike store, reused by later epochs and runs.
+if cache_dir is not None and not streaming:
+    dataset = SpikeCache(
+        dataset, root=cache_dir, seed=seed, key={"intensity": intensity}, unpack=True
+    )
+
+# Record spikes during the simulation (1 bit per spike with --packed).
+if packed:
+    spike_record = pack_spikes(
+        torch.zeros(update_interval, time, n_neurons, dtype=torch.uint8)
+    )
+else:
+    spike_record = torch.zeros(update_interval, time, n_neurons)
 
 # Neuron assignments and spike proportions.
 n_classes = 10
@@ -140,7 +169,9 @@ network.add_monitor(inh_voltage_monitor, name="inh_voltage")
 # Set up monitors for spikes and voltages
 spikes = {}
 for layer in set(network.layers):
-    spikes[layer] = Monitor(network.layers[layer], state_vars=["s"], time=time)
+    spikes[layer] = Monitor(
+        network.layers[layer], state_vars=["s"], time=time, packed=packed
+    )
     network.add_monitor(spikes[layer], name="%s_spikes" % layer)
 
 voltages = {}
@@ -168,16 +199,35 @@ for epoch in range(n_epochs):
 
     # Create a dataloader to iterate and batch data
     dataloader = torch.utils.data.DataLoader(
-        dataset, batch_size=1, shuffle=True, num_workers=n_workers, pin_memory=gpu
+        dataset,
+        batch_size=batch_size,
+        shuffle=True,
+        num_workers=n_workers,
+        pin_memory=gpu,
     )
 
     for step, batch in enumerate(tqdm(dataloader)):
-        # Get next input sample.
-        inputs = {"X": batch["encoded_image"].view(time, 1, 1, 28, 28)}
-        if gpu:
-            inputs = {k: v.cuda() for k, v in inputs.items()}
+        # Get next input samples, shaped [time, batch, 1, 28, 28].
+        if streaming:
+            image = batch["image"].cuda() if gpu else batch["image"]
+            inputs = {
+                "X": PoissonSource(
+                    image,
+                    time=time,
+                    dt=dt,
+                    seeds=seed * len(dataset) * n_epochs
+                    + epoch * len(dataset)
+                    + step * batch_size,
+                )
+            }
+        else:
+            inputs = {"X": batch["encoded_image"].transpose(0, 1)}
+            if gpu:
+                inputs = {k: v.cuda() for k, v in inputs.items()}
+
+        n_batch = inputs["X"].size(1)
 
-        if step % update_interval == 0 and step > 0:
+        if step % (update_interval // batch_size) == 0 and step > 0:
             # Convert the array of labels into a tensor
             label_tensor = torch.tensor(labels)
 
@@ -231,7 +281,7 @@ for epoch in range(n_epochs):
 
             labels = []
 
-        labels.append(batch["label"])
+        labels.extend(batch["label"].tolist())
 
         # Run the network on the input.
         network.run(inputs=inputs, time=time, input_time_dim=1)
@@ -241,7 +291,11 @@ for epoch in range(n_epochs):
         inh_voltages = inh_voltage_monitor.get("v")
 
         # Add to spikes recording.
-        spike_record[step % update_interval] = spikes["Ae"].get("s").squeeze()
+        index = (step % (update_interval // batch_size)) * batch_size
+        exc_spikes = spikes["Ae"].get("s")
+        if not packed:
+            exc_spikes = exc_spikes.view(time, n_batch, n_neurons)
+        spike_record[index : index + n_batch] = exc_spikes.transpose(0, 1)
 
         # Optionally plot various simulation information.
         if plot:
@@ -125,11 +125,11 @@ spikes = {
 voltages = {"accuracy": target_monitor.get("v"), "cordic": target_monitor_with_cordic.get("v"),
             "differences": target_monitor.get("v") - target_monitor_with_cordic.get("v")}
 
-ster = np.mean(spike_timing_error(target_monitor.get("s"), target_monitor_with_cordic.get("s"), time))
+ster = spike_timing_error(target_monitor.get("s"), target_monitor_with_cordic.get("s"), time).mean()
 print("The Spike Timing Error(STER) is")
 print(ster)
 
-nrmsd = np.mean(nrmsd_error(target_monitor.get("v"), target_monitor_with_cordic.get("v"), time))
+nrmsd = nrmsd_error(target_monitor.get("v"), target_monitor_with_cordic.get("v"), time).mean()
 print("The NRMSD Error is")
 print(nrmsd)
 